@@ -5,6 +5,7 @@ Uses the factory pattern for better testing and modularity.
 """
 
 import os
+import click
 from flask import Flask, jsonify, request
 from flask_wtf.csrf import CSRFError
 from config import get_config
@@ -50,6 +51,10 @@ def create_app(config_name=None):
     # Create upload directory if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
+    # Start the background booking lifecycle sweeper (if enabled)
+    from services.booking_lifecycle_service import init_booking_sweeper
+    init_booking_sweeper(app)
+    
     return app
 
 
@@ -68,6 +73,7 @@ def register_blueprints(app):
     from routes.messages import messages_bp
     from routes.reviews import reviews_bp
     from routes.admin import admin_bp
+    from routes.events import events_bp
     
     # Register blueprints
     app.register_blueprint(health_bp)
@@ -77,6 +83,7 @@ def register_blueprints(app):
     app.register_blueprint(messages_bp, url_prefix='/api/messages')
     app.register_blueprint(reviews_bp, url_prefix='/api/reviews')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
 
 
 def register_error_handlers(app):
@@ -188,6 +195,45 @@ def register_cli_commands(app):
         from extensions import db
         # TODO: Implement seeding logic
         print('✓ Database seeded with sample data')
+    
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index():
+        """Rebuild the resource and message full-text indexes from their tables."""
+        from data_access.message_search import MessageSearch
+        from data_access.resource_search import ResourceSearch
+        ResourceSearch.rebuild()
+        MessageSearch.rebuild()
+        print('✓ Resource and message search indexes rebuilt')
+    
+    @app.cli.command('repair-ratings')
+    def repair_ratings():
+        """Recompute resource rating aggregates from visible reviews."""
+        from data_access.review_repository import ReviewRepository
+        repaired = ReviewRepository.rebuild_rating_aggregates()
+        print(f'✓ Rating aggregates repaired for {repaired} resources')
+    
+    @app.cli.command('rebuild-threads')
+    def rebuild_threads():
+        """Attach unthreaded messages and recompute thread summaries and unread counts."""
+        from data_access.message_repository import MessageRepository
+        rebuilt = MessageRepository.rebuild_thread_summaries()
+        print(f'✓ Thread summaries rebuilt for {rebuilt} threads')
+    
+    @app.cli.command('sweep-bookings')
+    @click.option('--batch-size', type=int, default=None, help='Rows updated per statement')
+    @click.option('--max-batches', type=int, default=None, help='Maximum batches per status')
+    def sweep_bookings(batch_size, max_batches):
+        """Complete ended bookings and expire stale pending ones."""
+        from services.booking_lifecycle_service import BookingLifecycleService
+        result = BookingLifecycleService.sweep(
+            batch_size=batch_size or app.config.get('BOOKING_SWEEP_BATCH_SIZE'),
+            max_batches=max_batches,
+            pending_grace_minutes=app.config.get('BOOKING_PENDING_EXPIRY_MINUTES', 0)
+        )
+        print(f"✓ Bookings swept: {result['completed']} completed, {result['expired']} expired "
+              f"({result['batches']} batches, {result['duration_ms']} ms)")
+        if result['remaining']:
+            print('  More bookings are due; run the command again to continue')
 
 
 # Create app instance for CLI and development
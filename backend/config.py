@@ -67,6 +67,46 @@ class Config:
     # Pagination
     ITEMS_PER_PAGE = 20
     
+    # Booking conflict index (in-memory, per worker process)
+    BOOKING_INDEX_ENABLED = os.environ.get('BOOKING_INDEX_ENABLED', 'true').lower() == 'true'
+    BOOKING_INDEX_TTL_SECONDS = int(os.environ.get('BOOKING_INDEX_TTL_SECONDS', 60))
+    
+    # Resource search: 'database' (full-text index), 'engine' (in-process index with
+    # typo tolerance) or 'auto' (engine only when the database lacks full-text search)
+    RESOURCE_SEARCH_BACKEND = os.environ.get('RESOURCE_SEARCH_BACKEND', 'auto').lower()
+    RESOURCE_SEARCH_ENGINE_TTL_SECONDS = int(os.environ.get('RESOURCE_SEARCH_ENGINE_TTL_SECONDS', 300))
+    
+    # Seconds before the typeahead index is rebuilt (refreshes popularity weights)
+    RESOURCE_SUGGEST_TTL_SECONDS = int(os.environ.get('RESOURCE_SUGGEST_TTL_SECONDS', 300))
+    
+    # Seconds facet counts are cached per filter set (0 disables the cache)
+    RESOURCE_FACET_CACHE_SECONDS = int(os.environ.get('RESOURCE_FACET_CACHE_SECONDS', 60))
+    
+    # Per-resource lock stripes serializing booking conflict checks and writes
+    BOOKING_LOCK_STRIPES = int(os.environ.get('BOOKING_LOCK_STRIPES', 64))
+    
+    # Booking lifecycle sweeper (completes ended bookings, expires stale pending ones)
+    BOOKING_SWEEPER_ENABLED = os.environ.get('BOOKING_SWEEPER_ENABLED', 'false').lower() == 'true'
+    BOOKING_SWEEP_INTERVAL_SECONDS = int(os.environ.get('BOOKING_SWEEP_INTERVAL_SECONDS', 300))
+    BOOKING_SWEEP_BATCH_SIZE = int(os.environ.get('BOOKING_SWEEP_BATCH_SIZE', 500))
+    BOOKING_PENDING_EXPIRY_MINUTES = int(os.environ.get('BOOKING_PENDING_EXPIRY_MINUTES', 0))
+    
+    # Server-sent events: 'local' (this process only), 'database' (outbox table
+    # tailed by every worker) or the import path of a custom backend class
+    EVENT_BACKEND = os.environ.get('EVENT_BACKEND', 'local')
+    EVENT_REPLAY_SIZE = int(os.environ.get('EVENT_REPLAY_SIZE', 100))
+    EVENT_STREAM_HEARTBEAT_SECONDS = int(os.environ.get('EVENT_STREAM_HEARTBEAT_SECONDS', 15))
+    EVENT_STREAM_MAX_SECONDS = int(os.environ.get('EVENT_STREAM_MAX_SECONDS', 300))
+    EVENT_POLL_INTERVAL_SECONDS = float(os.environ.get('EVENT_POLL_INTERVAL_SECONDS', 1.0))
+    EVENT_RETENTION_MINUTES = int(os.environ.get('EVENT_RETENTION_MINUTES', 60))
+    EVENT_GAP_GRACE_SECONDS = float(os.environ.get('EVENT_GAP_GRACE_SECONDS', 10.0))
+    
+    # Per-user unread message counters: 'local' (this process), 'sqlite' (file
+    # shared by the workers on a host) or the import path of a custom store
+    UNREAD_COUNTER_BACKEND = os.environ.get('UNREAD_COUNTER_BACKEND', 'local')
+    UNREAD_COUNTER_PATH = os.environ.get('UNREAD_COUNTER_PATH')
+    UNREAD_COUNTER_TTL_SECONDS = int(os.environ.get('UNREAD_COUNTER_TTL_SECONDS', 300))
+    
     # AI Features (optional)
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
     ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY')
@@ -0,0 +1,311 @@
+"""
+Booking Interval Index
+In-memory, per-resource index of active (pending/approved) booking intervals.
+Lets conflict detection answer overlap queries without a database round-trip.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from flask import current_app
+from extensions import db
+from models.booking import Booking
+from data_access.slot_bitmap import DAY, SlotBitmap, days_spanned, window_masks
+
+
+# Booking statuses that occupy a resource's time slot
+ACTIVE_STATUSES = ('pending', 'approved')
+
+
+class ResourceIntervals:
+    """
+    Sorted interval set for a single resource.
+
+    Intervals are kept ordered by start time. Because every interval is at most
+    ``max_duration`` long, an overlap query only has to inspect the intervals that
+    start inside ``[start - max_duration, end)``, which two binary searches locate.
+    A ``SlotBitmap`` of the same intervals is maintained alongside for fast
+    free-window tests.
+    """
+
+    def __init__(self, loaded_from: datetime):
+        """
+        Initialize an empty interval set.
+
+        Args:
+            loaded_from: Intervals ending before this instant were not loaded
+        """
+        self.loaded_from = loaded_from
+        self.loaded_at = time.monotonic()
+        self.max_duration = timedelta(0)
+        self._entries: List[Tuple[datetime, datetime, int]] = []
+        self._ranges: Dict[int, Tuple[datetime, datetime]] = {}
+        self.slots = SlotBitmap()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, booking_id: int, start: datetime, end: datetime) -> None:
+        """
+        Insert or move an interval.
+
+        Args:
+            booking_id: Booking ID
+            start: Interval start
+            end: Interval end
+        """
+        self.remove(booking_id)
+        insort(self._entries, (start, end, booking_id))
+        self._ranges[booking_id] = (start, end)
+        self.slots.mark(start, end)
+        if end - start > self.max_duration:
+            self.max_duration = end - start
+
+    def remove(self, booking_id: int) -> None:
+        """
+        Remove an interval if present.
+
+        Args:
+            booking_id: Booking ID
+        """
+        current = self._ranges.pop(booking_id, None)
+        if current is None:
+            return
+
+        entry = (current[0], current[1], booking_id)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+        # Other intervals may share the boundary slots, so rebuild affected days
+        for day in days_spanned(current[0], current[1]):
+            self.slots.rebuild_day(day, [
+                self._ranges[other_id] for other_id in self.overlapping(day, day + DAY)
+            ])
+
+    def overlapping(self, start: datetime, end: datetime,
+                    exclude_booking_id: Optional[int] = None) -> List[int]:
+        """
+        Find intervals overlapping the half-open range ``[start, end)``.
+
+        Args:
+            start: Range start
+            end: Range end
+            exclude_booking_id: Booking ID to ignore
+
+        Returns:
+            List[int]: IDs of overlapping bookings
+        """
+        lower = bisect_right(self._entries, (start - self.max_duration,))
+        upper = bisect_left(self._entries, (end,))
+
+        return [
+            booking_id
+            for entry_start, entry_end, booking_id in self._entries[lower:upper]
+            if entry_end > start and booking_id != exclude_booking_id
+        ]
+
+    def is_free(self, start: datetime, end: datetime, window: Dict[datetime, int]) -> bool:
+        """
+        Check whether no interval overlaps ``[start, end)``.
+
+        The bitmap answers most queries; because slots are coarse, a bitmap hit
+        is confirmed against the exact intervals.
+
+        Args:
+            start: Range start
+            end: Range end
+            window: Per-day slot masks of the range
+
+        Returns:
+            bool: True if the range is free
+        """
+        return self.slots.is_free(window) or not self.overlapping(start, end)
+
+
+class BookingIndex:
+    """
+    Process-local conflict index keyed by resource ID.
+
+    Each resource's intervals are loaded lazily with one query and refreshed after
+    ``ttl_seconds`` so that writes made by other worker processes are eventually
+    picked up. Writes made through ``BookingRepository`` are applied immediately.
+    """
+
+    # Resource IDs per query when loading many resources at once
+    LOAD_CHUNK_SIZE = 500
+
+    def __init__(self, ttl_seconds: int = 60):
+        """
+        Initialize the index.
+
+        Args:
+            ttl_seconds: Seconds before a resource's intervals are reloaded
+        """
+        self.ttl_seconds = ttl_seconds
+        self._resources: Dict[int, ResourceIntervals] = {}
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, intervals: ResourceIntervals) -> bool:
+        return time.monotonic() - intervals.loaded_at < self.ttl_seconds
+
+    def _load(self, resource_id: int) -> ResourceIntervals:
+        """Load active intervals that have not yet ended for a resource."""
+        loaded_from = datetime.utcnow()
+        rows = db.session.query(
+            Booking.id, Booking.start_datetime, Booking.end_datetime
+        ).filter(
+            Booking.resource_id == resource_id,
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.end_datetime > loaded_from
+        ).all()
+
+        intervals = ResourceIntervals(loaded_from)
+        for booking_id, start, end in rows:
+            intervals.add(booking_id, start, end)
+        return intervals
+
+    def _load_many(self, resource_ids: List[int]) -> Dict[int, ResourceIntervals]:
+        """Load active intervals for many resources with chunked IN queries."""
+        loaded_from = datetime.utcnow()
+        loaded = {resource_id: ResourceIntervals(loaded_from) for resource_id in resource_ids}
+
+        for offset in range(0, len(resource_ids), self.LOAD_CHUNK_SIZE):
+            rows = db.session.query(
+                Booking.id, Booking.resource_id, Booking.start_datetime, Booking.end_datetime
+            ).filter(
+                Booking.resource_id.in_(resource_ids[offset:offset + self.LOAD_CHUNK_SIZE]),
+                Booking.status.in_(ACTIVE_STATUSES),
+                Booking.end_datetime > loaded_from
+            ).all()
+
+            for booking_id, resource_id, start, end in rows:
+                loaded[resource_id].add(booking_id, start, end)
+
+        return loaded
+
+    def overlapping(self, resource_id: int, start: datetime, end: datetime,
+                    exclude_booking_id: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Find active bookings of a resource that overlap a time range.
+
+        Args:
+            resource_id: Resource ID
+            start: Range start
+            end: Range end
+            exclude_booking_id: Booking ID to ignore
+
+        Returns:
+            Optional[List[int]]: Overlapping booking IDs, or None when the range
+            reaches before the indexed window and the caller must query the database
+        """
+        with self._lock:
+            intervals = self._resources.get(resource_id)
+            if intervals is None or not self._is_fresh(intervals):
+                intervals = self._load(resource_id)
+                self._resources[resource_id] = intervals
+
+            if start < intervals.loaded_from:
+                return None
+
+            return intervals.overlapping(start, end, exclude_booking_id)
+
+    def free_resources(self, resource_ids: List[int], start: datetime,
+                       end: datetime) -> Optional[List[int]]:
+        """
+        Find which resources have no active booking overlapping a time range.
+
+        Args:
+            resource_ids: Candidate resource IDs
+            start: Range start
+            end: Range end
+
+        Returns:
+            Optional[List[int]]: Free resource IDs in input order, or None when the
+            range reaches before the indexed window and the caller must query the database
+        """
+        window = window_masks(start, end)
+
+        with self._lock:
+            stale = [
+                resource_id for resource_id in resource_ids
+                if resource_id not in self._resources
+                or not self._is_fresh(self._resources[resource_id])
+            ]
+            if stale:
+                self._resources.update(self._load_many(stale))
+
+            free = []
+            for resource_id in resource_ids:
+                intervals = self._resources[resource_id]
+                if start < intervals.loaded_from:
+                    return None
+                if intervals.is_free(start, end, window):
+                    free.append(resource_id)
+
+            return free
+
+    def sync(self, booking: Booking) -> None:
+        """
+        Apply a committed booking change to the index.
+
+        Args:
+            booking: Booking whose status or time range changed
+        """
+        with self._lock:
+            intervals = self._resources.get(booking.resource_id)
+            if intervals is None:
+                return
+
+            if booking.status in ACTIVE_STATUSES:
+                intervals.add(booking.id, booking.start_datetime, booking.end_datetime)
+            else:
+                intervals.remove(booking.id)
+
+    def discard(self, resource_id: int, booking_ids: List[int]) -> None:
+        """
+        Drop bookings from a resource's intervals.
+
+        Args:
+            resource_id: Resource ID
+            booking_ids: Booking IDs to remove
+        """
+        with self._lock:
+            intervals = self._resources.get(resource_id)
+            if intervals is None:
+                return
+
+            for booking_id in booking_ids:
+                intervals.remove(booking_id)
+
+    def invalidate(self, resource_id: Optional[int] = None) -> None:
+        """
+        Forget cached intervals so they are reloaded on next use.
+
+        Args:
+            resource_id: Resource to invalidate, or None for all resources
+        """
+        with self._lock:
+            if resource_id is None:
+                self._resources.clear()
+            else:
+                self._resources.pop(resource_id, None)
+
+
+def get_booking_index() -> Optional[BookingIndex]:
+    """
+    Get the booking index for the current application.
+
+    Returns:
+        Optional[BookingIndex]: The index, or None if disabled in configuration
+    """
+    if not current_app.config.get('BOOKING_INDEX_ENABLED', True):
+        return None
+
+    index = current_app.extensions.get('booking_index')
+    if index is None:
+        index = BookingIndex(ttl_seconds=current_app.config.get('BOOKING_INDEX_TTL_SECONDS', 60))
+        current_app.extensions['booking_index'] = index
+    return index
@@ -4,13 +4,18 @@ Data access layer for Booking model CRUD operations.
 Handles all database queries and operations for bookings.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple, Dict
 from datetime import datetime
 from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
 from extensions import db
+from data_access.booking_index import ACTIVE_STATUSES, ResourceIntervals, get_booking_index
+from data_access.booking_locks import resource_lock, resources_lock
+from data_access.load_options import load_options
 from models.booking import Booking
 from models.resource import Resource
 from models.user import User
+from utils.pagination import Cursor, keyset_filter
 
 
 class BookingRepository:
@@ -47,25 +52,120 @@ class BookingRepository:
         
         db.session.add(booking)
         db.session.commit()
+        BookingRepository._sync_index(booking)
         return booking
     
     @staticmethod
-    def get_by_id(booking_id: int) -> Optional[Booking]:
+    def create_many(resource_id: int, requester_id: int,
+                    windows: List[Tuple[datetime, datetime]],
+                    notes: Optional[str] = None,
+                    series_id: Optional[str] = None) -> List[Booking]:
+        """
+        Create several bookings for one resource in a single transaction.
+        
+        Args:
+            resource_id: ID of the resource being booked
+            requester_id: ID of the user making the bookings
+            windows: List of (start_datetime, end_datetime) tuples
+            notes: Optional notes applied to every booking
+            series_id: Optional recurring series identifier
+        
+        Returns:
+            List[Booking]: Created booking objects, in input order
+        """
+        bookings = []
+        for start_datetime, end_datetime in windows:
+            booking = Booking(
+                resource_id=resource_id,
+                requester_id=requester_id,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                notes=notes
+            )
+            booking.series_id = series_id
+            bookings.append(booking)
+        
+        db.session.add_all(bookings)
+        db.session.flush()
+        booking_ids = [booking.id for booking in bookings]
+        db.session.commit()
+        
+        # Refresh the expired rows with one query rather than one per booking
+        if booking_ids:
+            Booking.query.filter(Booking.id.in_(booking_ids)).all()
+        
+        for booking in bookings:
+            BookingRepository._sync_index(booking)
+        return bookings
+    
+    @staticmethod
+    def lock_resource(resource_id: int):
+        """
+        Lock a resource for a conflict check followed by a booking write.
+        
+        Usage:
+            with BookingRepository.lock_resource(resource_id):
+                conflicts = BookingRepository.check_conflicts(..., use_index=False)
+                ...
+        
+        Args:
+            resource_id: Resource ID
+        
+        Returns:
+            Context manager holding the resource's stripe and database locks
+        """
+        return resource_lock(resource_id)
+    
+    @staticmethod
+    def lock_resources(resource_ids: List[int]):
+        """
+        Lock several resources at once (see ``lock_resource``).
+        
+        Args:
+            resource_ids: Resource IDs
+        
+        Returns:
+            Context manager holding the resources' stripe and database locks
+        """
+        return resources_lock(resource_ids)
+    
+    @staticmethod
+    def get_by_id(booking_id: int, include: Sequence[str] = ()) -> Optional[Booking]:
         """
         Retrieve a booking by ID.
         
         Args:
             booking_id: Booking ID
+            include: Relationships to load with the booking (see ``load_options``)
         
         Returns:
             Booking: Booking object or None if not found
         """
-        return Booking.query.get(booking_id)
+        return Booking.query.options(*load_options(Booking, include)).get(booking_id)
+    
+    @staticmethod
+    def get_by_ids(booking_ids: List[int]) -> List[Booking]:
+        """
+        Retrieve several bookings with their resources in one query.
+        
+        Args:
+            booking_ids: Booking IDs
+        
+        Returns:
+            List[Booking]: Found bookings (missing IDs are skipped)
+        """
+        if not booking_ids:
+            return []
+        
+        return Booking.query.options(
+            joinedload(Booking.resource)
+        ).filter(Booking.id.in_(booking_ids)).all()
     
     @staticmethod
     def get_all(status: Optional[str] = None, requester_id: Optional[int] = None,
                 resource_id: Optional[int] = None, limit: Optional[int] = None,
-                offset: int = 0) -> List[Booking]:
+                offset: int = 0, after: Optional[Cursor] = None,
+                include: Sequence[str] = ()) -> List[Booking]:
         """
         Retrieve all bookings with optional filtering.
         
@@ -75,11 +175,13 @@ class BookingRepository:
             resource_id: Filter by resource
             limit: Maximum number of bookings to return
             offset: Number of bookings to skip
+            after: Keyset cursor (start_datetime, id); returns rows after it instead of using offset
+            include: Relationships to eager-load (see ``load_options``)
         
         Returns:
             List[Booking]: List of booking objects
         """
-        query = Booking.query
+        query = Booking.query.options(*load_options(Booking, include))
         
         if status:
             query = query.filter_by(status=status)
@@ -90,8 +192,11 @@ class BookingRepository:
         if resource_id:
             query = query.filter_by(resource_id=resource_id)
         
-        # Order by start date (newest first)
-        query = query.order_by(Booking.start_datetime.desc())
+        if after:
+            query = query.filter(keyset_filter(Booking.start_datetime, Booking.id, after))
+        
+        # Order by start date (newest first), ID breaks ties so cursors are stable
+        query = query.order_by(Booking.start_datetime.desc(), Booking.id.desc())
         
         if offset:
             query = query.offset(offset)
@@ -141,39 +246,217 @@ class BookingRepository:
     
     @staticmethod
     def check_conflicts(resource_id: int, start_datetime: datetime,
-                       end_datetime: datetime, exclude_booking_id: Optional[int] = None) -> List[Booking]:
+                       end_datetime: datetime, exclude_booking_id: Optional[int] = None,
+                       use_index: bool = True) -> List[Booking]:
         """
         Check for conflicting bookings for a resource in a time range.
         
+        Answered from the in-memory booking index when possible; the database
+        is only queried to load the conflicting rows themselves.
+        
         Args:
             resource_id: Resource ID to check
             start_datetime: Start of time range
             end_datetime: End of time range
             exclude_booking_id: Booking ID to exclude from check (for updates)
+            use_index: Set to False to always query the database, e.g. under
+                a resource lock where bookings from other workers must be seen
         
         Returns:
             List[Booking]: List of conflicting bookings
         """
-        query = Booking.query.filter(
-            Booking.resource_id == resource_id,
-            Booking.status.in_(['pending', 'approved']),  # Only check active bookings
-            or_(
-                # New booking starts during existing booking
-                and_(
-                    Booking.start_datetime <= start_datetime,
-                    Booking.end_datetime > start_datetime
-                ),
-                # New booking ends during existing booking
-                and_(
-                    Booking.start_datetime < end_datetime,
-                    Booking.end_datetime >= end_datetime
-                ),
-                # New booking completely contains existing booking
+        index = get_booking_index() if use_index else None
+        conflict_ids = None
+        if index is not None:
+            conflict_ids = index.overlapping(
+                resource_id, start_datetime, end_datetime, exclude_booking_id
+            )
+        
+        if conflict_ids is None:
+            return BookingRepository._query_conflicts(
+                resource_id, start_datetime, end_datetime, exclude_booking_id
+            )
+        
+        if not conflict_ids:
+            return []
+        
+        # Re-read the candidates so entries made stale by other workers are dropped
+        conflicts = Booking.query.filter(
+            Booking.id.in_(conflict_ids),
+            Booking.status.in_(ACTIVE_STATUSES)
+        ).all()
+        
+        stale_ids = set(conflict_ids) - {b.id for b in conflicts}
+        if stale_ids:
+            index.discard(resource_id, list(stale_ids))
+        
+        return conflicts
+    
+    @staticmethod
+    def check_conflicts_batch(windows: List[Tuple[int, datetime, datetime]]) -> List[List[int]]:
+        """
+        Check many (resource_id, start, end) windows for conflicts at once.
+        
+        All windows are resolved with a single query that fetches, per resource,
+        the active bookings overlapping the span of that resource's windows.
+        
+        Args:
+            windows: List of (resource_id, start_datetime, end_datetime) tuples
+        
+        Returns:
+            List[List[int]]: Conflicting booking IDs for each window, in input order
+        """
+        if not windows:
+            return []
+        
+        spans = {}
+        for resource_id, start_datetime, end_datetime in windows:
+            span_start, span_end = spans.get(resource_id, (start_datetime, end_datetime))
+            spans[resource_id] = (min(span_start, start_datetime), max(span_end, end_datetime))
+        
+        rows = db.session.query(
+            Booking.id, Booking.resource_id, Booking.start_datetime, Booking.end_datetime
+        ).filter(
+            Booking.status.in_(ACTIVE_STATUSES),
+            or_(*[
                 and_(
-                    Booking.start_datetime >= start_datetime,
-                    Booking.end_datetime <= end_datetime
+                    Booking.resource_id == resource_id,
+                    Booking.start_datetime < span_end,
+                    Booking.end_datetime > span_start
                 )
-            )
+                for resource_id, (span_start, span_end) in spans.items()
+            ])
+        ).all()
+        
+        intervals = {
+            resource_id: ResourceIntervals(span_start)
+            for resource_id, (span_start, _) in spans.items()
+        }
+        for booking_id, resource_id, start_datetime, end_datetime in rows:
+            intervals[resource_id].add(booking_id, start_datetime, end_datetime)
+        
+        return [
+            intervals[resource_id].overlapping(start_datetime, end_datetime)
+            for resource_id, start_datetime, end_datetime in windows
+        ]
+    
+    @staticmethod
+    def get_free_resource_ids(resource_ids: List[int], start_datetime: datetime,
+                              end_datetime: datetime) -> List[int]:
+        """
+        Filter resources down to those with no active booking in a time range.
+        
+        The database decides: the booking index is per process, so within
+        its TTL it can miss bookings made or removed by other workers. All
+        candidates are checked with one query, and index entries whose slot
+        bitmaps disagree with it are dropped so they reload on next use.
+        
+        Args:
+            resource_ids: Candidate resource IDs
+            start_datetime: Start of time range
+            end_datetime: End of time range
+        
+        Returns:
+            List[int]: Free resource IDs, in input order
+        """
+        if not resource_ids:
+            return []
+        
+        busy = {
+            resource_id for resource_id, intervals
+            in BookingRepository.get_active_intervals(resource_ids, start_datetime, end_datetime).items()
+            if intervals
+        }
+        
+        index = get_booking_index()
+        if index is not None:
+            free = index.free_resources(resource_ids, start_datetime, end_datetime)
+            if free is not None:
+                # Free in the index but busy in the database, or the reverse
+                for resource_id in set(free).symmetric_difference(set(resource_ids) - busy):
+                    index.invalidate(resource_id)
+        
+        return [resource_id for resource_id in resource_ids if resource_id not in busy]
+    
+    @staticmethod
+    def get_active_in_range(resource_id: int, start_datetime: datetime,
+                            end_datetime: datetime) -> List[Tuple[int, datetime, datetime]]:
+        """
+        Get active bookings of one resource overlapping a time range.
+        
+        Args:
+            resource_id: Resource ID
+            start_datetime: Start of time range
+            end_datetime: End of time range
+        
+        Returns:
+            List[Tuple[int, datetime, datetime]]: (booking_id, start, end) ordered by start
+        """
+        return [
+            tuple(row) for row in db.session.query(
+                Booking.id, Booking.start_datetime, Booking.end_datetime
+            ).filter(
+                Booking.resource_id == resource_id,
+                Booking.status.in_(ACTIVE_STATUSES),
+                Booking.start_datetime < end_datetime,
+                Booking.end_datetime > start_datetime
+            ).order_by(Booking.start_datetime).all()
+        ]
+    
+    @staticmethod
+    def get_active_intervals(resource_ids: List[int], start_datetime: datetime,
+                             end_datetime: datetime) -> Dict[int, List[Tuple[datetime, datetime]]]:
+        """
+        Get active booking intervals overlapping a range for many resources.
+        
+        Args:
+            resource_ids: Resource IDs to fetch
+            start_datetime: Start of time range
+            end_datetime: End of time range
+        
+        Returns:
+            Dict[int, List[Tuple[datetime, datetime]]]: Resource ID -> (start, end)
+            intervals ordered by start time
+        """
+        intervals = {resource_id: [] for resource_id in resource_ids}
+        if not resource_ids:
+            return intervals
+        
+        rows = db.session.query(
+            Booking.resource_id, Booking.start_datetime, Booking.end_datetime
+        ).filter(
+            Booking.resource_id.in_(resource_ids),
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.start_datetime < end_datetime,
+            Booking.end_datetime > start_datetime
+        ).order_by(Booking.resource_id, Booking.start_datetime).all()
+        
+        for resource_id, booking_start, booking_end in rows:
+            intervals[resource_id].append((booking_start, booking_end))
+        
+        return intervals
+    
+    @staticmethod
+    def _query_conflicts(resource_id: int, start_datetime: datetime,
+                         end_datetime: datetime,
+                         exclude_booking_id: Optional[int] = None) -> List[Booking]:
+        """
+        Query the database for bookings overlapping a time range.
+        
+        Args:
+            resource_id: Resource ID to check
+            start_datetime: Start of time range
+            end_datetime: End of time range
+            exclude_booking_id: Booking ID to exclude from check
+        
+        Returns:
+            List[Booking]: List of conflicting bookings
+        """
+        query = Booking.query.filter(
+            Booking.resource_id == resource_id,
+            Booking.status.in_(ACTIVE_STATUSES),  # Only check active bookings
+            Booking.start_datetime < end_datetime,
+            Booking.end_datetime > start_datetime
         )
         
         if exclude_booking_id:
@@ -181,6 +464,18 @@ class BookingRepository:
         
         return query.all()
     
+    @staticmethod
+    def _sync_index(booking: Booking) -> None:
+        """
+        Propagate a committed booking change to the booking index.
+        
+        Args:
+            booking: Booking that was created or changed
+        """
+        index = get_booking_index()
+        if index is not None:
+            index.sync(booking)
+    
     @staticmethod
     def update(booking: Booking, **kwargs) -> Booking:
         """
@@ -193,12 +488,19 @@ class BookingRepository:
         Returns:
             Booking: Updated booking object
         """
+        previous_resource_id = booking.resource_id
+        
         for key, value in kwargs.items():
             if hasattr(booking, key):
                 setattr(booking, key, value)
         
         booking.updated_at = datetime.utcnow()
         db.session.commit()
+        
+        index = get_booking_index()
+        if index is not None and previous_resource_id != booking.resource_id:
+            index.discard(previous_resource_id, [booking.id])
+        BookingRepository._sync_index(booking)
         return booking
     
     @staticmethod
@@ -221,6 +523,7 @@ class BookingRepository:
         booking.updated_at = datetime.utcnow()
         
         db.session.commit()
+        BookingRepository._sync_index(booking)
         return booking
     
     @staticmethod
@@ -243,8 +546,56 @@ class BookingRepository:
         booking.updated_at = datetime.utcnow()
         
         db.session.commit()
+        BookingRepository._sync_index(booking)
         return booking
     
+    @staticmethod
+    def bulk_respond(approver_id: int,
+                     approvals: Dict[Optional[str], List[int]],
+                     rejections: Dict[str, List[int]]) -> List[Booking]:
+        """
+        Approve and reject many pending bookings in one transaction.
+        
+        Each group of bookings sharing the same notes is updated with a single
+        set-based UPDATE. Only bookings that are still pending are changed.
+        
+        Args:
+            approver_id: ID of user responding
+            approvals: Approval notes -> booking IDs to approve
+            rejections: Rejection reason -> booking IDs to reject
+        
+        Returns:
+            List[Booking]: All referenced bookings, reloaded after the commit
+        """
+        now = datetime.utcnow()
+        groups = [
+            (booking_ids, {'status': 'approved', 'approval_notes': notes})
+            for notes, booking_ids in approvals.items()
+        ] + [
+            (booking_ids, {'status': 'rejected', 'rejection_reason': reason})
+            for reason, booking_ids in rejections.items()
+        ]
+        
+        booking_ids = []
+        for group_ids, values in groups:
+            if not group_ids:
+                continue
+            Booking.query.filter(
+                Booking.id.in_(group_ids),
+                Booking.status == 'pending'
+            ).update(
+                {**values, 'approved_by': approver_id, 'updated_at': now},
+                synchronize_session=False
+            )
+            booking_ids.extend(group_ids)
+        
+        db.session.commit()
+        
+        bookings = BookingRepository.get_by_ids(booking_ids)
+        for booking in bookings:
+            BookingRepository._sync_index(booking)
+        return bookings
+    
     @staticmethod
     def cancel(booking: Booking, cancellation_reason: Optional[str] = None) -> Booking:
         """
@@ -263,6 +614,7 @@ class BookingRepository:
         booking.updated_at = datetime.utcnow()
         
         db.session.commit()
+        BookingRepository._sync_index(booking)
         return booking
     
     @staticmethod
@@ -280,8 +632,57 @@ class BookingRepository:
         booking.updated_at = datetime.utcnow()
         
         db.session.commit()
+        BookingRepository._sync_index(booking)
         return booking
     
+    @staticmethod
+    def transition_batch(from_status: str, to_status: str, cutoff_column,
+                         cutoff: datetime, batch_size: int) -> int:
+        """
+        Move one bounded batch of bookings to a new status.
+        
+        Selects up to ``batch_size`` bookings in ``from_status`` whose
+        ``cutoff_column`` is before ``cutoff`` and updates them with a single
+        set-based UPDATE, then commits.
+        
+        Args:
+            from_status: Current status to match
+            to_status: Status to set
+            cutoff_column: Booking column compared with the cutoff
+            cutoff: Bookings strictly before this instant are transitioned
+            batch_size: Maximum number of rows to update
+        
+        Returns:
+            int: Number of bookings transitioned
+        """
+        rows = db.session.query(Booking.id, Booking.resource_id).filter(
+            Booking.status == from_status,
+            cutoff_column < cutoff
+        ).order_by(Booking.id).limit(batch_size).all()
+        
+        if not rows:
+            return 0
+        
+        count = Booking.query.filter(
+            Booking.id.in_([booking_id for booking_id, _ in rows]),
+            Booking.status == from_status
+        ).update(
+            {'status': to_status, 'updated_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        
+        if to_status not in ACTIVE_STATUSES:
+            index = get_booking_index()
+            if index is not None:
+                by_resource = {}
+                for booking_id, resource_id in rows:
+                    by_resource.setdefault(resource_id, []).append(booking_id)
+                for resource_id, booking_ids in by_resource.items():
+                    index.discard(resource_id, booking_ids)
+        
+        return count
+    
     @staticmethod
     def delete(booking: Booking) -> bool:
         """
@@ -293,9 +694,13 @@ class BookingRepository:
         Returns:
             bool: True if successful
         """
+        resource_id, booking_id = booking.resource_id, booking.id
         try:
             db.session.delete(booking)
             db.session.commit()
+            index = get_booking_index()
+            if index is not None:
+                index.discard(resource_id, [booking_id])
             return True
         except Exception:
             db.session.rollback()
@@ -329,17 +734,18 @@ class BookingRepository:
         return query.count()
     
     @staticmethod
-    def get_pending_for_resource_owner(owner_id: int) -> List[Booking]:
+    def get_pending_for_resource_owner(owner_id: int, include: Sequence[str] = ()) -> List[Booking]:
         """
         Get all pending bookings for resources owned by a user.
         
         Args:
             owner_id: Resource owner's user ID
+            include: Relationships to eager-load (see ``load_options``)
         
         Returns:
             List[Booking]: List of pending bookings
         """
-        return Booking.query.join(Resource).filter(
+        return Booking.query.options(*load_options(Booking, include)).join(Resource).filter(
             Resource.owner_id == owner_id,
             Booking.status == 'pending'
         ).order_by(Booking.created_at.desc()).all()
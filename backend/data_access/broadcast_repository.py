@@ -0,0 +1,211 @@
+"""
+Broadcast Repository
+Data access layer for admin broadcasts.
+Handles all database queries for broadcasts and their read receipts.
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+from sqlalchemy import and_, exists, func, insert, literal, or_, select
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from data_access.unread_counter import get_unread_counter
+from models.broadcast import Broadcast, BroadcastReceipt
+from models.user import User
+from utils.pagination import Cursor, keyset_filter
+
+
+class BroadcastRepository:
+    """
+    Repository for broadcast data access operations.
+    A broadcast is one row however many users it reaches; which broadcasts a
+    user sees is derived from their role and sign-up date when read.
+    """
+    
+    @staticmethod
+    def create(sender_id: int, content: str, audience_role: Optional[str] = None) -> Broadcast:
+        """
+        Create a broadcast.
+        
+        Every recipient's unread count changes, so cached counters are marked
+        unknown and reloaded on each user's next read rather than adjusted one
+        by one. Marking happens after the commit; a count loaded before it
+        can't be stored afterwards.
+        
+        Args:
+            sender_id: ID of the sending admin
+            content: Broadcast content
+            audience_role: Role the broadcast is addressed to (None for everyone)
+        
+        Returns:
+            Broadcast: Created broadcast
+        """
+        broadcast = Broadcast(sender_id=sender_id, content=content, audience_role=audience_role)
+        db.session.add(broadcast)
+        db.session.commit()
+        get_unread_counter().invalidate_all()
+        return broadcast
+    
+    @staticmethod
+    def _visible_to(user_id: int):
+        """
+        Build the filter selecting broadcasts a user can see.
+        
+        A user sees broadcasts addressed to everyone or to their role, sent
+        since they signed up. Queries using it must select from ``User``.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            SQLAlchemy boolean expression
+        """
+        return and_(
+            User.id == user_id,
+            or_(Broadcast.audience_role.is_(None), Broadcast.audience_role == User.role),
+            Broadcast.timestamp >= User.created_at
+        )
+    
+    @staticmethod
+    def _unread_by(user_id: int):
+        """
+        Build the filter selecting broadcasts a user has no receipt for.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            SQLAlchemy boolean expression
+        """
+        return ~exists().where(
+            BroadcastReceipt.user_id == user_id,
+            BroadcastReceipt.broadcast_id == Broadcast.id
+        )
+    
+    @staticmethod
+    def get_for_user(user_id: int, limit: int = 50, offset: int = 0,
+                     after: Optional[Cursor] = None) -> List[Tuple[Broadcast, Optional[datetime]]]:
+        """
+        Get the broadcasts a user can see, oldest first like a thread.
+        
+        Args:
+            user_id: User ID
+            limit: Maximum number of broadcasts
+            offset: Offset for pagination
+            after: Keyset cursor (timestamp, id); returns rows after it instead of using offset
+        
+        Returns:
+            List[Tuple[Broadcast, Optional[datetime]]]: Broadcasts with the user's read time
+        """
+        query = db.session.query(Broadcast, BroadcastReceipt.read_at).join(
+            User, BroadcastRepository._visible_to(user_id)
+        ).outerjoin(
+            BroadcastReceipt, and_(
+                BroadcastReceipt.broadcast_id == Broadcast.id,
+                BroadcastReceipt.user_id == user_id
+            )
+        )
+        
+        if after:
+            query = query.filter(keyset_filter(Broadcast.timestamp, Broadcast.id, after, descending=False))
+        
+        return query.order_by(
+            Broadcast.timestamp.asc(), Broadcast.id.asc()
+        ).limit(limit).offset(offset).all()
+    
+    @staticmethod
+    def count_for_user(user_id: int) -> int:
+        """
+        Count the broadcasts a user can see.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            int: Number of broadcasts
+        """
+        return db.session.query(func.count(Broadcast.id)).join(
+            User, BroadcastRepository._visible_to(user_id)
+        ).scalar()
+    
+    @staticmethod
+    def get_unread_count(user_id: int) -> int:
+        """
+        Count the broadcasts a user can see but hasn't read.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            int: Number of unread broadcasts
+        """
+        return db.session.query(func.count(Broadcast.id)).join(
+            User, BroadcastRepository._visible_to(user_id)
+        ).filter(BroadcastRepository._unread_by(user_id)).scalar()
+    
+    @staticmethod
+    def get_thread_summary(user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Summarize a user's broadcasts as one inbox thread.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            Optional[Dict]: Thread metadata shaped like ``MessageRepository.get_user_threads``
+            entries, or None if the user has no broadcasts
+        """
+        latest = Broadcast.query.join(
+            User, BroadcastRepository._visible_to(user_id)
+        ).order_by(Broadcast.timestamp.desc(), Broadcast.id.desc()).first()
+        
+        if latest is None:
+            return None
+        
+        return {
+            'thread_id': Broadcast.THREAD_ID,
+            'other_user_id': latest.sender_id,
+            'latest_message': latest.content,
+            'latest_timestamp': latest.timestamp,
+            'unread_count': BroadcastRepository.get_unread_count(user_id),
+            'booking_id': None,
+            'resource_id': None,
+            'is_broadcast': True
+        }
+    
+    @staticmethod
+    def mark_all_as_read(user_id: int) -> int:
+        """
+        Record receipts for every broadcast a user hasn't read yet.
+        
+        One INSERT ... SELECT, so reading many broadcasts is a single statement.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            int: Number of broadcasts marked as read
+        """
+        unread = select(
+            literal(user_id), Broadcast.id, literal(datetime.utcnow())
+        ).join(
+            User, BroadcastRepository._visible_to(user_id)
+        ).where(BroadcastRepository._unread_by(user_id))
+        
+        counter = get_unread_counter()
+        try:
+            result = db.session.execute(
+                insert(BroadcastReceipt).from_select(
+                    ['user_id', 'broadcast_id', 'read_at'], unread
+                )
+            )
+            updated_count = max(result.rowcount or 0, 0)
+            generation = counter.begin(user_id) if updated_count else None
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request recorded the same receipts first
+            db.session.rollback()
+            return 0
+        
+        counter.adjust(user_id, -updated_count, generation)
+        return updated_count
@@ -0,0 +1,104 @@
+"""
+Event Repository
+Data access layer for the stream event outbox.
+Used by the database fan-out backend of the event broker.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime
+from sqlalchemy import delete, func, select
+from extensions import db
+from models.stream_event import StreamEvent
+
+
+class EventRepository:
+    """
+    Repository for stream event data access operations.
+    """
+    
+    @staticmethod
+    def append(user_ids: Iterable[int], event_type: str, payload: Dict[str, Any]) -> List[StreamEvent]:
+        """
+        Store one event per recipient and commit.
+        
+        Args:
+            user_ids: Recipient user IDs
+            event_type: Event name
+            payload: JSON-serializable event data
+        
+        Returns:
+            List[StreamEvent]: Stored events
+        """
+        events = [
+            StreamEvent(user_id=user_id, event_type=event_type, payload=payload)
+            for user_id in user_ids
+        ]
+        db.session.add_all(events)
+        db.session.commit()
+        
+        return events
+    
+    @staticmethod
+    def get_after(after_id: int, user_id: Optional[int] = None, limit: int = 500) -> List[StreamEvent]:
+        """
+        Get events with an ID greater than ``after_id``, oldest first.
+        
+        Args:
+            after_id: Last event ID already seen
+            user_id: Only return this recipient's events (default: all)
+            limit: Maximum number of events
+        
+        Returns:
+            List[StreamEvent]: Events in ID order
+        """
+        query = StreamEvent.query.filter(StreamEvent.id > after_id)
+        
+        if user_id is not None:
+            query = query.filter(StreamEvent.user_id == user_id)
+        
+        return query.order_by(StreamEvent.id).limit(limit).all()
+    
+    @staticmethod
+    def get_by_ids(event_ids: Iterable[int]) -> List[StreamEvent]:
+        """
+        Get the events with the given IDs that exist, oldest first.
+        
+        Args:
+            event_ids: Event IDs
+        
+        Returns:
+            List[StreamEvent]: Events in ID order
+        """
+        return StreamEvent.query.filter(
+            StreamEvent.id.in_(list(event_ids))
+        ).order_by(StreamEvent.id).all()
+    
+    @staticmethod
+    def get_id_range() -> tuple:
+        """
+        Get the lowest and highest stored event IDs.
+        
+        Returns:
+            tuple: (oldest_id, latest_id), both None when the table is empty
+        """
+        return tuple(db.session.execute(
+            select(func.min(StreamEvent.id), func.max(StreamEvent.id))
+        ).one())
+    
+    @staticmethod
+    def prune(before: datetime) -> int:
+        """
+        Delete events created before a cutoff.
+        
+        Args:
+            before: Cutoff timestamp
+        
+        Returns:
+            int: Number of events deleted
+        """
+        result = db.session.execute(
+            delete(StreamEvent).where(StreamEvent.created_at < before)
+        )
+        db.session.commit()
+        
+        return result.rowcount
@@ -0,0 +1,72 @@
+"""
+Load Options
+Eager-loading presets for repository queries, keyed by the related objects a
+caller is going to serialize. Loading them up front keeps list endpoints at a
+fixed number of queries instead of one lazy load per row.
+"""
+
+from typing import Dict, Iterable, List
+from sqlalchemy.orm import joinedload, selectinload
+from models.booking import Booking
+from models.message import Message
+from models.resource import Resource
+from models.review import Review
+
+# Relationships each model's to_dict() can embed, with the loader for each.
+# Resources are joined (permission checks read them on every booking); users
+# are fetched with one IN query per relationship so the main row stays narrow.
+LOAD_PRESETS = {
+    Booking: {
+        'resource': joinedload(Booking.resource),
+        'requester': selectinload(Booking.requester),
+    },
+    Message: {
+        'sender': selectinload(Message.sender),
+        'receiver': selectinload(Message.receiver),
+    },
+    Review: {
+        'reviewer': selectinload(Review.reviewer),
+        'resource': joinedload(Review.resource),
+    },
+    Resource: {
+        'owner': selectinload(Resource.owner),
+    },
+}
+
+
+def load_options(model, include: Iterable[str]) -> List:
+    """
+    Get the loader options for the relationships a caller will serialize.
+
+    Args:
+        model: Model class being queried
+        include: Relationship names (e.g. ``('resource', 'requester')``)
+
+    Returns:
+        List: Options to pass to ``query.options()``
+
+    Raises:
+        ValueError: If a name is not an expandable relationship of the model
+    """
+    presets = LOAD_PRESETS.get(model, {})
+    options = []
+    for name in include:
+        if name not in presets:
+            raise ValueError(
+                f"Cannot expand '{name}'. Must be one of: {', '.join(presets)}"
+            )
+        options.append(presets[name])
+    return options
+
+
+def serialize_flags(include: Iterable[str]) -> Dict[str, bool]:
+    """
+    Map relationship names to the matching ``to_dict`` keyword arguments.
+
+    Args:
+        include: Relationship names
+
+    Returns:
+        Dict[str, bool]: e.g. ``{'include_resource': True}``
+    """
+    return {f'include_{name}': True for name in include}
@@ -4,11 +4,18 @@ Data access layer for message management.
 Handles all database queries for messages and threads.
 """
 
-from typing import Optional, List, Dict, Any
+import secrets
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from datetime import datetime
-from sqlalchemy import or_, and_, func
+from sqlalchemy import case, delete, exists, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from extensions import db
+from data_access.load_options import load_options
+from data_access.message_search import MessageSearch
+from data_access.unread_counter import get_unread_counter
 from models.message import Message
+from models.message_thread import MessageThread, ThreadAlias, ThreadParticipant
+from utils.pagination import Cursor, keyset_filter
 
 
 class MessageRepository:
@@ -24,6 +31,9 @@ class MessageRepository:
         """
         Create a new message.
         
+        The message joins the thread for its two users and booking or resource
+        (see ``_resolve_thread``) and carries that thread's ID.
+        
         Args:
             sender_id: ID of message sender
             receiver_id: ID of message receiver
@@ -35,31 +45,32 @@ class MessageRepository:
         Returns:
             Message: Created message object
         """
-        # Generate thread_id if not provided
-        if not thread_id:
-            # Sort user IDs to ensure consistent thread_id
-            user_ids = sorted([sender_id, receiver_id])
-            thread_id = f"thread_{user_ids[0]}_{user_ids[1]}"
-            
-            # If booking or resource is involved, append to thread_id
-            if booking_id:
-                thread_id += f"_booking_{booking_id}"
-            elif resource_id:
-                thread_id += f"_resource_{resource_id}"
+        try:
+            thread = MessageRepository._resolve_thread(sender_id, receiver_id, thread_id, booking_id, resource_id)
+        except IntegrityError:
+            # Another request created the same thread first
+            db.session.rollback()
+            thread = MessageRepository._resolve_thread(sender_id, receiver_id, thread_id, booking_id, resource_id)
         
         message = Message(
             sender_id=sender_id,
             receiver_id=receiver_id,
             content=content,
-            thread_id=thread_id,
-            booking_id=booking_id,
-            resource_id=resource_id
+            thread_id=thread.thread_id,
+            booking_id=booking_id if booking_id is not None else thread.booking_id,
+            resource_id=resource_id if resource_id is not None else thread.resource_id
         )
+        message.thread_pk = thread.id
         # is_read defaults to False in the model
         # timestamp defaults to datetime.utcnow() in the model
         
         db.session.add(message)
+        db.session.flush()
+        MessageRepository._record_message(message)
+        counter = get_unread_counter()
+        generation = counter.begin(receiver_id)
         db.session.commit()
+        counter.adjust(receiver_id, 1, generation)
         
         return message
     
@@ -76,11 +87,32 @@ class MessageRepository:
         """
         return Message.query.get(message_id)
     
+    @staticmethod
+    def get_thread(thread_id: str) -> Optional[MessageThread]:
+        """
+        Get a thread by its ID or by the ID of a thread merged into it.
+        
+        Args:
+            thread_id: Thread ID
+        
+        Returns:
+            Optional[MessageThread]: Thread or None
+        """
+        thread = MessageThread.query.filter(MessageThread.thread_id == thread_id).first()
+        if thread is None:
+            thread = MessageThread.query.join(
+                ThreadAlias, ThreadAlias.thread_pk == MessageThread.id
+            ).filter(ThreadAlias.alias == thread_id).first()
+        return thread
+    
     @staticmethod
     def get_user_threads(user_id: int, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """
         Get all message threads for a user with latest message info.
         
+        Reads the user's ``thread_participants`` rows newest first, so this is
+        one index range scan regardless of how many messages the threads hold.
+        
         Args:
             user_id: User ID
             limit: Maximum number of threads
@@ -89,50 +121,68 @@ class MessageRepository:
         Returns:
             List[Dict]: List of threads with metadata
         """
-        # Subquery to get the latest message timestamp for each thread
-        latest_msg_subquery = db.session.query(
-            Message.thread_id,
-            func.max(Message.timestamp).label('latest_timestamp')
+        rows = db.session.query(ThreadParticipant, MessageThread, Message).join(
+            MessageThread, MessageThread.id == ThreadParticipant.thread_pk
+        ).outerjoin(
+            Message, Message.id == ThreadParticipant.last_message_id
         ).filter(
-            or_(Message.sender_id == user_id, Message.receiver_id == user_id)
-        ).group_by(Message.thread_id).subquery()
-        
-        # Get threads with their latest messages
-        threads = db.session.query(Message).join(
-            latest_msg_subquery,
-            and_(
-                Message.thread_id == latest_msg_subquery.c.thread_id,
-                Message.timestamp == latest_msg_subquery.c.latest_timestamp
-            )
-        ).order_by(Message.timestamp.desc()).limit(limit).offset(offset).all()
+            ThreadParticipant.user_id == user_id
+        ).order_by(
+            ThreadParticipant.last_timestamp.desc(), ThreadParticipant.thread_pk.desc()
+        ).limit(limit).offset(offset).all()
         
         result = []
-        for msg in threads:
-            # Get unread count for this thread
-            unread_count = Message.query.filter(
-                Message.thread_id == msg.thread_id,
-                Message.receiver_id == user_id,
-                Message.is_read == False
-            ).count()
-            
-            # Determine other participant
-            other_user_id = msg.receiver_id if msg.sender_id == user_id else msg.sender_id
-            
+        for participant, thread, msg in rows:
             result.append({
-                'thread_id': msg.thread_id,
-                'other_user_id': other_user_id,
-                'latest_message': msg.content,
-                'latest_timestamp': msg.timestamp,
-                'unread_count': unread_count,
-                'booking_id': msg.booking_id,
-                'resource_id': msg.resource_id
+                'thread_id': thread.thread_id,
+                'other_user_id': thread.user_high_id if thread.user_low_id == user_id else thread.user_low_id,
+                'latest_message': msg.content if msg else None,
+                'latest_timestamp': participant.last_timestamp,
+                'unread_count': participant.unread_count,
+                'booking_id': thread.booking_id,
+                'resource_id': thread.resource_id
             })
         
         return result
     
+    @staticmethod
+    def count_user_threads(user_id: int, newer_than: Optional[datetime] = None) -> int:
+        """
+        Count the threads a user takes part in.
+        
+        Args:
+            user_id: User ID
+            newer_than: Only count threads with a later latest message
+        
+        Returns:
+            int: Number of threads
+        """
+        query = ThreadParticipant.query.filter(ThreadParticipant.user_id == user_id)
+        if newer_than is not None:
+            query = query.filter(ThreadParticipant.last_timestamp > newer_than)
+        return query.count()
+    
+    @staticmethod
+    def get_thread_participant_ids(thread_id: str) -> List[int]:
+        """
+        Get the IDs of every user taking part in a thread.
+        
+        Args:
+            thread_id: Thread ID
+        
+        Returns:
+            List[int]: Participant user IDs
+        """
+        thread = MessageRepository.get_thread(thread_id)
+        if thread is None:
+            return []
+        return sorted({thread.user_low_id, thread.user_high_id})
+    
     @staticmethod
     def get_thread_messages(thread_id: str, user_id: int,
-                           limit: int = 100, offset: int = 0) -> List[Message]:
+                           limit: int = 100, offset: int = 0,
+                           after: Optional[Cursor] = None,
+                           include: Sequence[str] = ()) -> List[Message]:
         """
         Get all messages in a thread.
         
@@ -141,14 +191,23 @@ class MessageRepository:
             user_id: User ID (for permission check)
             limit: Maximum number of messages
             offset: Offset for pagination
+            after: Keyset cursor (timestamp, id); returns rows after it instead of using offset
+            include: Relationships to eager-load (see ``load_options``)
         
         Returns:
             List[Message]: List of messages in thread
         """
-        messages = Message.query.filter(
-            Message.thread_id == thread_id,
+        query = Message.query.options(*load_options(Message, include)).filter(
+            MessageRepository._in_thread(thread_id),
             or_(Message.sender_id == user_id, Message.receiver_id == user_id)
-        ).order_by(Message.timestamp.asc()).limit(limit).offset(offset).all()
+        )
+        
+        if after:
+            query = query.filter(keyset_filter(Message.timestamp, Message.id, after, descending=False))
+        
+        messages = query.order_by(
+            Message.timestamp.asc(), Message.id.asc()
+        ).limit(limit).offset(offset).all()
         
         return messages
     
@@ -172,10 +231,18 @@ class MessageRepository:
         if not message:
             return None
         
-        if not message.is_read:
-            message.is_read = True
-            message.read_at = datetime.utcnow()
+        # Checked in the UPDATE rather than on the loaded message, so of several
+        # concurrent calls only one takes the message off the unread counts
+        if MessageRepository._set_read(message, datetime.utcnow()):
+            db.session.execute(
+                MessageRepository._participant_update(message.thread_pk, user_id)
+                .where(ThreadParticipant.unread_count > 0)
+                .values(unread_count=ThreadParticipant.unread_count - 1)
+            )
+            counter = get_unread_counter()
+            generation = counter.begin(user_id)
             db.session.commit()
+            counter.adjust(user_id, -1, generation)
         
         return message
     
@@ -191,8 +258,9 @@ class MessageRepository:
         Returns:
             int: Number of messages marked as read
         """
+        thread = MessageRepository.get_thread(thread_id)
         updated_count = Message.query.filter(
-            Message.thread_id == thread_id,
+            MessageRepository._in_thread(thread_id, thread),
             Message.receiver_id == user_id,
             Message.is_read == False
         ).update({
@@ -200,7 +268,15 @@ class MessageRepository:
             'read_at': datetime.utcnow()
         })
         
+        if updated_count and thread is not None:
+            db.session.execute(
+                MessageRepository._participant_update(thread.id, user_id).values(unread_count=0)
+            )
+        
+        counter = get_unread_counter()
+        generation = counter.begin(user_id) if updated_count else None
         db.session.commit()
+        counter.adjust(user_id, -updated_count, generation)
         
         return updated_count
     
@@ -224,7 +300,7 @@ class MessageRepository:
     def search_messages(user_id: int, search_term: str,
                        limit: int = 50) -> List[Message]:
         """
-        Search messages by content.
+        Search a user's messages by content, best match first.
         
         Args:
             user_id: User ID
@@ -234,14 +310,7 @@ class MessageRepository:
         Returns:
             List[Message]: Matching messages
         """
-        search_pattern = f"%{search_term}%"
-        
-        messages = Message.query.filter(
-            or_(Message.sender_id == user_id, Message.receiver_id == user_id),
-            Message.content.ilike(search_pattern)
-        ).order_by(Message.timestamp.desc()).limit(limit).all()
-        
-        return messages
+        return MessageSearch.search(user_id, search_term, limit=limit)
     
     @staticmethod
     def get_messages_by_booking(booking_id: int, user_id: int) -> List[Message]:
@@ -301,8 +370,26 @@ class MessageRepository:
         if not message:
             return False
         
-        db.session.delete(message)
+        # Whether the message was still unread is decided by which DELETE
+        # matches, so a concurrent mark-as-read or delete isn't counted twice
+        receiver_id = message.receiver_id
+        was_unread = MessageRepository._delete_row(message, unread_only=True)
+        if not was_unread and not MessageRepository._delete_row(message):
+            db.session.rollback()
+            return False
+        
+        if was_unread:
+            db.session.execute(
+                MessageRepository._participant_update(message.thread_pk, receiver_id)
+                .where(ThreadParticipant.unread_count > 0)
+                .values(unread_count=ThreadParticipant.unread_count - 1)
+            )
+        
+        MessageRepository._forget_message(message)
+        counter = get_unread_counter()
+        generation = counter.begin(receiver_id) if was_unread else None
         db.session.commit()
+        counter.adjust(receiver_id, -1 if was_unread else 0, generation)
         
         return True
     
@@ -319,7 +406,7 @@ class MessageRepository:
             int: Number of messages
         """
         return Message.query.filter(
-            Message.thread_id == thread_id,
+            MessageRepository._in_thread(thread_id),
             or_(Message.sender_id == user_id, Message.receiver_id == user_id)
         ).count()
     
@@ -340,3 +427,309 @@ class MessageRepository:
         ).order_by(Message.timestamp.desc()).limit(limit).all()
         
         return messages
+    
+    @staticmethod
+    def rebuild_thread_summaries() -> int:
+        """
+        Recompute every thread and participant summary from ``messages``.
+        
+        Messages written without going through this repository are first
+        attached to their thread (created if needed); an unknown thread ID they
+        carry is kept as an alias. Thread rows keep their IDs and threads left
+        without messages are dropped; participant rows are derived data and are
+        replaced wholesale.
+        
+        Returns:
+            int: Number of threads
+        """
+        unthreaded = Message.query.filter(Message.thread_pk.is_(None)).order_by(Message.timestamp, Message.id)
+        for message in unthreaded.all():
+            thread = MessageRepository._resolve_thread(
+                message.sender_id, message.receiver_id, message.thread_id, message.booking_id, message.resource_id
+            )
+            if message.thread_id and not MessageRepository._is_thread_id_taken(message.thread_id):
+                db.session.add(ThreadAlias(alias=message.thread_id, thread_pk=thread.id))
+            message.thread_pk = thread.id
+            message.thread_id = thread.thread_id
+        db.session.flush()
+        
+        threads: Dict[int, Tuple[int, datetime]] = {}
+        participants: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        
+        rows = db.session.execute(
+            select(Message.id, Message.thread_pk, Message.sender_id, Message.receiver_id,
+                   Message.is_read, Message.timestamp)
+            .order_by(Message.timestamp, Message.id)
+            .execution_options(yield_per=1000)
+        )
+        for message_id, thread_pk, sender_id, receiver_id, is_read, timestamp in rows:
+            # Rows arrive oldest first, so the last write per key is the latest message
+            threads[thread_pk] = (message_id, timestamp)
+            for user_id in (sender_id, receiver_id):
+                entry = participants.setdefault((thread_pk, user_id), {'unread_count': 0})
+                entry['last_message_id'] = message_id
+                entry['last_timestamp'] = timestamp
+                if user_id == receiver_id and not is_read:
+                    entry['unread_count'] += 1
+        
+        db.session.execute(delete(ThreadParticipant))
+        has_messages = exists().where(Message.thread_pk == MessageThread.id)
+        db.session.execute(delete(ThreadAlias).where(
+            ThreadAlias.thread_pk.in_(select(MessageThread.id).where(~has_messages))
+        ))
+        db.session.execute(delete(MessageThread).where(~has_messages))
+        
+        if threads:
+            db.session.execute(update(MessageThread), [
+                {'id': thread_pk, 'last_message_id': message_id, 'last_timestamp': timestamp}
+                for thread_pk, (message_id, timestamp) in threads.items()
+            ])
+        if participants:
+            db.session.execute(insert(ThreadParticipant), [
+                {'thread_pk': thread_pk, 'user_id': user_id, **entry}
+                for (thread_pk, user_id), entry in participants.items()
+            ])
+        db.session.commit()
+        
+        return len(threads)
+    
+    @staticmethod
+    def _resolve_thread(sender_id: int, receiver_id: int, thread_id: Optional[str] = None,
+                        booking_id: Optional[int] = None,
+                        resource_id: Optional[int] = None) -> MessageThread:
+        """
+        Find or create the thread for a message.
+        
+        A ``thread_id`` naming a thread between the same two users is followed
+        unless the booking or resource contradicts it, so a reply that only
+        passes the thread ID stays in that thread. Otherwise the thread is
+        looked up by its key (users, booking, resource) and created if missing,
+        named ``thread_id`` when that is still free.
+        
+        Args:
+            sender_id: ID of message sender
+            receiver_id: ID of message receiver
+            thread_id: Optional thread ID
+            booking_id: Optional associated booking ID
+            resource_id: Optional associated resource ID
+        
+        Returns:
+            MessageThread: Existing or newly flushed thread
+        
+        Raises:
+            IntegrityError: If another transaction created the thread concurrently
+        """
+        low, high = sorted([sender_id, receiver_id])
+        
+        if thread_id:
+            thread = MessageRepository.get_thread(thread_id)
+            if (thread is not None
+                    and (thread.user_low_id, thread.user_high_id) == (low, high)
+                    and booking_id in (None, thread.booking_id)
+                    and resource_id in (None, thread.resource_id)):
+                return thread
+        
+        key = {'user_low_id': low, 'user_high_id': high, 'booking_id': booking_id, 'resource_id': resource_id}
+        thread = MessageThread.query.filter_by(**key).first()
+        if thread is not None:
+            return thread
+        
+        name = thread_id
+        if not name or MessageRepository._is_thread_id_taken(name):
+            name = MessageThread.default_thread_id(low, high, booking_id, resource_id)
+        while MessageRepository._is_thread_id_taken(name):
+            # Taken by a differently keyed thread that was given this name
+            name = f'{MessageThread.default_thread_id(low, high, booking_id, resource_id)}_{secrets.token_hex(3)}'
+        
+        thread = MessageThread(thread_id=name, **key)
+        db.session.add(thread)
+        db.session.flush()
+        return thread
+    
+    @staticmethod
+    def _is_thread_id_taken(thread_id: str) -> bool:
+        """
+        Check whether a thread ID or alias is already in use.
+        
+        Args:
+            thread_id: Thread ID
+        
+        Returns:
+            bool: True if a thread or alias has this ID
+        """
+        return db.session.execute(select(
+            exists().where(MessageThread.thread_id == thread_id)
+            | exists().where(ThreadAlias.alias == thread_id)
+        )).scalar()
+    
+    @staticmethod
+    def _in_thread(thread_id: str, thread: Optional[MessageThread] = None):
+        """
+        Build a filter for the messages of a thread.
+        
+        Args:
+            thread_id: Thread ID (or alias)
+            thread: The thread, if already loaded
+        
+        Returns:
+            SQLAlchemy clause on ``messages``
+        """
+        thread = thread or MessageRepository.get_thread(thread_id)
+        if thread is None:
+            # Messages written directly and not yet attached by rebuild-threads
+            return Message.thread_id == thread_id
+        return Message.thread_pk == thread.id
+    
+    @staticmethod
+    def _set_read(message: Message, read_at: datetime) -> bool:
+        """
+        Mark a message as read in the database if it isn't already.
+        
+        The check and the change are one conditional UPDATE, so of several
+        concurrent calls only one sees the message as unread, whatever state
+        the in-memory message shows.
+        
+        Args:
+            message: Message to mark
+            read_at: Read time to record
+        
+        Returns:
+            bool: True if this call marked the message as read
+        """
+        result = db.session.execute(
+            update(Message)
+            .where(Message.id == message.id, Message.is_read == False)
+            .values(is_read=True, read_at=read_at)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        
+        message.is_read = True
+        message.read_at = read_at
+        return True
+    
+    @staticmethod
+    def _delete_row(message: Message, unread_only: bool = False) -> bool:
+        """
+        Delete a message's row if it still exists.
+        
+        Args:
+            message: Message to delete
+            unread_only: Only delete it if it is still unread
+        
+        Returns:
+            bool: True if this call deleted the row
+        """
+        statement = delete(Message).where(Message.id == message.id)
+        if unread_only:
+            statement = statement.where(Message.is_read == False)
+        result = db.session.execute(statement.execution_options(synchronize_session=False))
+        if result.rowcount != 1:
+            return False
+        
+        db.session.expunge(message)
+        return True
+    
+    @staticmethod
+    def _participant_update(thread_pk: Optional[int], user_id: int):
+        """
+        Build an UPDATE of one user's summary row for a thread.
+        
+        Args:
+            thread_pk: Thread primary key
+            user_id: User ID
+        
+        Returns:
+            SQLAlchemy UPDATE statement (add ``values`` before executing)
+        """
+        return update(ThreadParticipant).where(
+            ThreadParticipant.thread_pk == thread_pk,
+            ThreadParticipant.user_id == user_id
+        ).execution_options(synchronize_session=False)
+    
+    @staticmethod
+    def _record_message(message: Message) -> None:
+        """
+        Fold a new message into its thread and participant summaries.
+        
+        Runs in the caller's transaction after the message is flushed. Counters
+        are adjusted in SQL and the latest-message pointers only move forward,
+        so concurrent sends to the same thread don't overwrite each other.
+        
+        Args:
+            message: Flushed message with ``thread_pk`` set
+        """
+        thread_pk = message.thread_pk
+        
+        db.session.execute(
+            update(MessageThread)
+            .where(
+                MessageThread.id == thread_pk,
+                or_(MessageThread.last_timestamp.is_(None), MessageThread.last_timestamp <= message.timestamp)
+            )
+            .values(last_message_id=message.id, last_timestamp=message.timestamp)
+            .execution_options(synchronize_session=False)
+        )
+        
+        for user_id, unread in ((message.sender_id, 0), (message.receiver_id, 1)):
+            is_latest = ThreadParticipant.last_timestamp <= message.timestamp
+            result = db.session.execute(
+                update(ThreadParticipant)
+                .where(ThreadParticipant.thread_pk == thread_pk, ThreadParticipant.user_id == user_id)
+                .values(
+                    unread_count=ThreadParticipant.unread_count + unread,
+                    last_message_id=case((is_latest, message.id), else_=ThreadParticipant.last_message_id),
+                    last_timestamp=case((is_latest, message.timestamp), else_=ThreadParticipant.last_timestamp)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                db.session.add(ThreadParticipant(
+                    thread_pk=thread_pk,
+                    user_id=user_id,
+                    last_message_id=message.id,
+                    last_timestamp=message.timestamp,
+                    unread_count=unread
+                ))
+                db.session.flush()
+    
+    @staticmethod
+    def _forget_message(message: Message) -> None:
+        """
+        Repoint or drop summaries whose latest message was just deleted.
+        
+        Runs in the caller's transaction after the delete is flushed.
+        
+        Args:
+            message: Deleted message
+        """
+        thread = db.session.get(MessageThread, message.thread_pk) if message.thread_pk else None
+        if thread is None:
+            return
+        
+        remaining = Message.query.filter(Message.thread_pk == thread.id)
+        latest = remaining.order_by(Message.timestamp.desc(), Message.id.desc()).first()
+        if latest is None:
+            # Not left to the database: SQLite doesn't enforce ON DELETE CASCADE here
+            db.session.execute(delete(ThreadParticipant).where(ThreadParticipant.thread_pk == thread.id))
+            db.session.execute(delete(ThreadAlias).where(ThreadAlias.thread_pk == thread.id))
+            db.session.delete(thread)
+            return
+        if thread.last_message_id in (message.id, None):
+            thread.last_message_id = latest.id
+            thread.last_timestamp = latest.timestamp
+        
+        for participant in ThreadParticipant.query.filter(
+            ThreadParticipant.thread_pk == thread.id,
+            ThreadParticipant.user_id.in_({message.sender_id, message.receiver_id}),
+            or_(ThreadParticipant.last_message_id == message.id, ThreadParticipant.last_message_id.is_(None))
+        ):
+            latest = remaining.filter(
+                or_(Message.sender_id == participant.user_id, Message.receiver_id == participant.user_id)
+            ).order_by(Message.timestamp.desc(), Message.id.desc()).first()
+            if latest is None:
+                db.session.delete(participant)
+            else:
+                participant.last_message_id = latest.id
+                participant.last_timestamp = latest.timestamp
@@ -0,0 +1,224 @@
+"""
+Message Search
+Dialect-aware full-text search over message content, scoped to the messages
+a user sent or received.
+
+The participant filter lives in the index itself, so a search only visits
+the user's matching messages instead of every message containing the term.
+Each message is indexed with its content plus one ``u<id>`` token for the
+sender and one for the receiver:
+
+- SQLite: an FTS5 table (``messages_fts``) with ``content`` and
+  ``participants`` columns, external content from the ``messages_fts_source``
+  view and kept in sync by triggers. Ranked with BM25 on ``content`` only.
+  Two- and three-character prefixes are indexed too, since short prefix
+  queries would otherwise expand to most of the vocabulary.
+- PostgreSQL: a stored ``tsvector`` column (``messages.search_vector``) with
+  content at weight A and participant tokens at weight D, with a GIN index.
+  Ranked with ``ts_rank`` on weight A only.
+
+Other databases, or SQLite builds without FTS5, fall back to ILIKE matching.
+
+Snippets are cut from the message content in Python and returned as plain
+text with the character ranges of the matched words, so clients can
+highlight them without rendering user-supplied HTML.
+
+The schema objects are created with the ``messages`` table (``db.create_all``)
+and by the ``f6b3d9e1a7c4`` migration for existing databases.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import event, func, literal_column, or_, select, text
+from extensions import db
+from data_access.resource_search import backend_for, tokenize
+from models.message import Message
+
+FTS_TABLE = 'messages_fts'
+FTS_SOURCE = 'messages_fts_source'
+
+# BM25 weights in (content, participants) order; participants never affect rank
+SQLITE_BM25_WEIGHTS = (1.0, 0.0)
+# ts_rank weights in {D, C, B, A} order; only content (A) counts
+POSTGRES_RANK_WEIGHTS = '{0, 0, 0, 1}'
+
+# Words of context in a snippet
+SNIPPET_WORDS = 24
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_DDL = [
+    f"""CREATE VIEW IF NOT EXISTS {FTS_SOURCE} AS
+    SELECT id, content, 'u' || sender_id || ' u' || receiver_id AS participants FROM messages""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        content, participants,
+        content='{FTS_SOURCE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content, participants)
+        VALUES (new.id, new.content, 'u' || new.sender_id || ' u' || new.receiver_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, participants)
+        VALUES ('delete', old.id, old.content, 'u' || old.sender_id || ' u' || old.receiver_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS messages_fts_update
+    AFTER UPDATE OF content, sender_id, receiver_id ON messages BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, participants)
+        VALUES ('delete', old.id, old.content, 'u' || old.sender_id || ' u' || old.receiver_id);
+        INSERT INTO {FTS_TABLE}(rowid, content, participants)
+        VALUES (new.id, new.content, 'u' || new.sender_id || ' u' || new.receiver_id);
+    END""",
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(content, '')), 'A') ||
+        setweight(to_tsvector('simple', 'u' || sender_id::text || ' u' || receiver_id::text), 'D')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_messages_search_vector ON messages USING GIN (search_vector)",
+]
+
+
+def _fold(word: str) -> str:
+    """Lowercase a word and strip diacritics, as the FTS5 tokenizer does."""
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def highlight(content: str, tokens: Sequence[str], max_words: int = SNIPPET_WORDS) -> Dict[str, Any]:
+    """
+    Cut a snippet around the first matched word of a message.
+
+    Words match like the index does: every token exactly, the last one also
+    as a prefix.
+
+    Args:
+        content: Message content
+        tokens: Search tokens from ``tokenize``
+        max_words: Words of context in the snippet
+
+    Returns:
+        Dict: ``text`` (plain text, '…' marks cut content) and ``highlights``
+        ([start, end) character ranges of matched words within ``text``)
+    """
+    content = content or ''
+    words = list(_WORD_RE.finditer(content))
+    folded = [_fold(token) for token in tokens]
+
+    def matches(word: str) -> bool:
+        word = _fold(word)
+        return word in folded or bool(folded) and word.startswith(folded[-1])
+
+    hits = [index for index, word in enumerate(words) if matches(word.group())]
+
+    if len(words) <= max_words:
+        first, last = 0, len(words)
+    else:
+        first = max(0, min((hits[0] if hits else 0) - max_words // 4, len(words) - max_words))
+        last = first + max_words
+
+    start = words[first].start() if first > 0 else 0
+    end = words[last - 1].end() if last < len(words) else len(content)
+    prefix = '…' if start > 0 else ''
+    snippet = prefix + content[start:end] + ('…' if end < len(content) else '')
+
+    offset = len(prefix) - start
+    highlights = [
+        [words[index].start() + offset, words[index].end() + offset]
+        for index in hits if first <= index < last
+    ]
+    return {'text': snippet, 'highlights': highlights}
+
+
+class MessageSearch:
+    """
+    Full-text search over one user's messages.
+    Every token must match (AND); the last token also matches as a prefix so
+    results update while a user is still typing.
+    """
+
+    @staticmethod
+    def _backend() -> Optional[str]:
+        return backend_for(db.engine.dialect.name)
+
+    @staticmethod
+    def _fts5_query(tokens: Sequence[str], user_id: int) -> str:
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += '*'
+        return f'content : ({" ".join(terms)}) AND participants : "u{int(user_id)}"'
+
+    @staticmethod
+    def _tsquery(tokens: Sequence[str], user_id: int) -> str:
+        terms = [f'{token}:A' for token in tokens]
+        terms[-1] = f'{tokens[-1]}:*A'
+        return ' & '.join(terms + [f'u{int(user_id)}:D'])
+
+    @staticmethod
+    def search(user_id: int, search_term: str, limit: int = 50) -> List[Message]:
+        """
+        Find a user's messages matching a search term, best match first.
+
+        Args:
+            user_id: User whose sent and received messages are searched
+            search_term: Raw user input
+            limit: Maximum results
+
+        Returns:
+            List[Message]: Matching messages, by relevance then newest first
+        """
+        tokens = tokenize(search_term)
+        backend = MessageSearch._backend()
+        query = Message.query
+
+        if not tokens or backend is None:
+            return query.filter(
+                or_(Message.sender_id == user_id, Message.receiver_id == user_id),
+                Message.content.ilike(f'%{search_term}%')
+            ).order_by(Message.timestamp.desc()).limit(limit).all()
+
+        if backend == 'fts5':
+            match = literal_column(FTS_TABLE).op('MATCH')(MessageSearch._fts5_query(tokens, user_id))
+            # bm25() is only valid in the MATCH query itself, so rank there and join
+            matches = select(
+                literal_column('rowid').label('id'),
+                func.bm25(literal_column(FTS_TABLE), *SQLITE_BM25_WEIGHTS).label('rank')
+            ).select_from(text(FTS_TABLE)).where(match).subquery('search_matches')
+            query = query.join(matches, matches.c.id == Message.id).order_by(matches.c.rank.asc())
+        else:
+            vector = literal_column('messages.search_vector')
+            tsquery = func.to_tsquery('simple', MessageSearch._tsquery(tokens, user_id))
+            weights = literal_column(f"'{POSTGRES_RANK_WEIGHTS}'::float4[]")
+            query = query.filter(vector.op('@@')(tsquery)).order_by(
+                func.ts_rank(weights, vector, tsquery).desc()
+            )
+
+        return query.order_by(Message.timestamp.desc()).limit(limit).all()
+
+    @staticmethod
+    def rebuild() -> None:
+        """Rebuild the SQLite FTS index from the messages table."""
+        if MessageSearch._backend() == 'fts5':
+            db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            db.session.commit()
+
+
+@event.listens_for(Message.__table__, 'after_create')
+def _create_search_index(target, connection, **kw):
+    """Create the full-text schema objects alongside the messages table."""
+    backend = backend_for(connection.dialect.name)
+    statements = SQLITE_DDL if backend == 'fts5' else POSTGRES_DDL if backend == 'tsvector' else []
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+@event.listens_for(Message.__table__, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    """Drop the FTS5 table and its source view with the messages table (triggers go with the table)."""
+    if backend_for(connection.dialect.name) == 'fts5':
+        connection.execute(text(f'DROP TABLE IF EXISTS {FTS_TABLE}'))
+        connection.execute(text(f'DROP VIEW IF EXISTS {FTS_SOURCE}'))
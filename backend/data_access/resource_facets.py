@@ -0,0 +1,172 @@
+"""
+Resource Facets
+Per-category, per-location and per-capacity-bucket counts for a filtered
+resource listing, computed in one grouped statement: GROUPING SETS on
+PostgreSQL, a UNION ALL of grouped selects over one filtered CTE elsewhere.
+Results are cached per filter signature for a short TTL.
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+from flask import current_app
+from sqlalchemy import case, func, literal, select, union_all
+from extensions import db
+from models.resource import Resource
+
+# Capacity buckets as (label, lowest, highest); None means unbounded
+CAPACITY_BUCKETS = (
+    ('1-4', 1, 4),
+    ('5-10', 5, 10),
+    ('11-25', 11, 25),
+    ('26+', 26, None),
+)
+
+FACETS = ('category', 'location', 'capacity')
+
+Facets = Dict[str, Dict[str, int]]
+
+
+def capacity_bucket(column):
+    """
+    Build a CASE expression mapping a capacity column to its bucket label.
+
+    Args:
+        column: Capacity column
+
+    Returns:
+        SQLAlchemy expression (NULL for resources without a capacity)
+    """
+    whens = []
+    for label, lowest, highest in CAPACITY_BUCKETS:
+        condition = column >= lowest if highest is None else column.between(lowest, highest)
+        whens.append((condition, label))
+    return case(*whens, else_=None)
+
+
+def count_facets(query) -> Facets:
+    """
+    Count the rows of a filtered resource query per facet value.
+
+    Args:
+        query: Filtered query over ``resources`` (unordered, unpaginated)
+
+    Returns:
+        Facets: ``{'category': {...}, 'location': {...}, 'capacity': {...}}``
+        with resources lacking a value left out of that facet
+    """
+    base = query.with_entities(
+        Resource.category.label('category'),
+        Resource.location.label('location'),
+        capacity_bucket(Resource.capacity).label('capacity')
+    ).order_by(None).cte('facet_rows')
+
+    facets: Facets = {facet: {} for facet in FACETS}
+
+    if db.engine.dialect.name == 'postgresql':
+        statement = select(
+            base.c.category, base.c.location, base.c.capacity,
+            func.grouping(base.c.category).label('by_location_or_capacity'),
+            func.grouping(base.c.location).label('by_category_or_capacity'),
+            func.count().label('total')
+        ).group_by(func.grouping_sets(base.c.category, base.c.location, base.c.capacity))
+
+        for row in db.session.execute(statement):
+            if not row.by_location_or_capacity:
+                facet, value = 'category', row.category
+            elif not row.by_category_or_capacity:
+                facet, value = 'location', row.location
+            else:
+                facet, value = 'capacity', row.capacity
+            if value is not None:
+                facets[facet][value] = row.total
+        return facets
+
+    # Each branch reads the same CTE, so the filter (and any full-text match) is written once
+    statement = union_all(*[
+        select(
+            literal(facet).label('facet'),
+            base.c[facet].label('value'),
+            func.count().label('total')
+        ).where(base.c[facet].isnot(None)).group_by(base.c[facet])
+        for facet in FACETS
+    ])
+
+    for facet, value, total in db.session.execute(statement):
+        facets[facet][value] = total
+    return facets
+
+
+class FacetCache:
+    """
+    Short-lived cache of facet counts keyed by filter signature.
+
+    Resource writes through ``ResourceRepository`` clear it; writes made by
+    other worker processes are picked up once entries expire.
+    """
+
+    # Most filter signatures kept before the oldest is evicted
+    MAX_ENTRIES = 256
+
+    def __init__(self, ttl_seconds: int = 60):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid (0 disables caching)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Facets]] = {}
+
+    def get(self, signature: Hashable) -> Optional[Facets]:
+        """
+        Get cached facets for a filter signature.
+
+        Args:
+            signature: Hashable description of the filters
+
+        Returns:
+            Optional[Facets]: Cached counts, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                return None
+            return entry[1]
+
+    def put(self, signature: Hashable, facets: Facets) -> None:
+        """
+        Cache facets for a filter signature.
+
+        Args:
+            signature: Hashable description of the filters
+            facets: Counts to cache
+        """
+        if self.ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            if signature not in self._entries and len(self._entries) >= self.MAX_ENTRIES:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[signature] = (time.monotonic(), facets)
+
+    def invalidate(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_facet_cache() -> FacetCache:
+    """
+    Get the facet cache for the current application.
+
+    Returns:
+        FacetCache: The cache
+    """
+    cache = current_app.extensions.get('resource_facet_cache')
+    if cache is None:
+        cache = FacetCache(ttl_seconds=current_app.config.get('RESOURCE_FACET_CACHE_SECONDS', 60))
+        current_app.extensions['resource_facet_cache'] = cache
+    return cache
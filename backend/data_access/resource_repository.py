@@ -6,8 +6,13 @@ Handles all database queries and operations for resources.
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from sqlalchemy import or_, and_
+from sqlalchemy import and_, inspect
 from extensions import db
+from data_access.resource_facets import Facets, count_facets, get_facet_cache
+from data_access.resource_search import ResourceSearch
+from data_access.search_engine import get_search_engine
+from data_access.versioned_cache import bump_generation, get_versioned_cache
+from data_access.resource_suggest import get_suggest_index
 from models.resource import Resource
 from models.user import User
 
@@ -18,6 +23,12 @@ class ResourceRepository:
     Handles all database queries and operations for resources.
     """
     
+    # Generation counter for the cached category and location lists
+    DICTIONARY_GENERATION = 'resource_dictionaries'
+    
+    # Columns those lists are built from
+    DICTIONARY_FIELDS = ('category', 'location', 'status')
+    
     @staticmethod
     def create(owner_id: int, title: str, description: Optional[str] = None,
                category: Optional[str] = None, location: Optional[str] = None,
@@ -59,12 +70,50 @@ class ResourceRepository:
             resource.set_images(images)
         
         if availability_rules:
-            resource.availability_rules = availability_rules
+            resource.set_availability_rules(availability_rules)
         
         db.session.add(resource)
+        ResourceRepository._bump_dictionaries(resource)
         db.session.commit()
+        ResourceRepository._sync_indexes(resource)
         return resource
     
+    @staticmethod
+    def _bump_dictionaries(resource: Resource, deleting: bool = False) -> None:
+        """
+        Bump the category/location generation if a pending write can change them.
+        
+        Must run before commit so the bump is part of the same transaction.
+        
+        Args:
+            resource: Resource being created, updated or deleted
+            deleting: Whether the resource is being deleted
+        """
+        state = inspect(resource)
+        if state.persistent and not deleting:
+            fields = ResourceRepository.DICTIONARY_FIELDS
+            if not any(state.attrs[field].history.has_changes() for field in fields):
+                return
+        elif resource.status != 'published':
+            return
+        
+        bump_generation(ResourceRepository.DICTIONARY_GENERATION)
+    
+    @staticmethod
+    def _sync_indexes(resource: Resource) -> None:
+        """
+        Propagate a committed resource change to the in-process search engine,
+        suggestion index and facet cache.
+        
+        Args:
+            resource: Resource that was created or changed
+        """
+        engine = get_search_engine()
+        if engine is not None:
+            engine.sync(resource)
+        get_suggest_index().sync(resource)
+        get_facet_cache().invalidate()
+    
     @staticmethod
     def get_by_id(resource_id: int) -> Optional[Resource]:
         """
@@ -81,7 +130,8 @@ class ResourceRepository:
     @staticmethod
     def _apply_filters(query, status: Optional[str] = None, category: Optional[str] = None,
                        owner_id: Optional[int] = None, search: Optional[str] = None,
-                       location: Optional[str] = None):
+                       location: Optional[str] = None, min_capacity: Optional[int] = None,
+                       resource_ids: Optional[List[int]] = None):
         """Apply common filters to a SQLAlchemy query."""
         if status:
             query = query.filter_by(status=status)
@@ -95,12 +145,14 @@ class ResourceRepository:
         if location:
             query = query.filter(Resource.location.ilike(f'%{location}%'))
         
+        if min_capacity:
+            query = query.filter(Resource.capacity >= min_capacity)
+        
+        if resource_ids is not None:
+            query = query.filter(Resource.id.in_(resource_ids))
+        
         if search:
-            search_filter = or_(
-                Resource.title.ilike(f'%{search}%'),
-                Resource.description.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
+            query = ResourceSearch.apply(query, search, columns=('title', 'description'))
         
         return query
     
@@ -108,7 +160,8 @@ class ResourceRepository:
     def get_all(status: Optional[str] = None, category: Optional[str] = None,
                 owner_id: Optional[int] = None, limit: Optional[int] = None,
                 offset: int = 0, search: Optional[str] = None,
-                location: Optional[str] = None) -> List[Resource]:
+                location: Optional[str] = None, min_capacity: Optional[int] = None,
+                resource_ids: Optional[List[int]] = None) -> List[Resource]:
         """
         Retrieve all resources with optional filtering.
         """
@@ -118,7 +171,9 @@ class ResourceRepository:
             category=category,
             owner_id=owner_id,
             search=search,
-            location=location
+            location=location,
+            min_capacity=min_capacity,
+            resource_ids=resource_ids
         )
         
         query = query.order_by(Resource.created_at.desc())
@@ -131,12 +186,67 @@ class ResourceRepository:
         
         return query.all()
     
+    @staticmethod
+    def get_by_ids(resource_ids: List[int]) -> List[Resource]:
+        """
+        Retrieve resources by ID, keeping the order of the input.
+        
+        Args:
+            resource_ids: Resource IDs
+        
+        Returns:
+            List[Resource]: Found resources (missing IDs are skipped)
+        """
+        if not resource_ids:
+            return []
+        
+        found = {r.id: r for r in Resource.query.filter(Resource.id.in_(resource_ids)).all()}
+        return [found[resource_id] for resource_id in resource_ids if resource_id in found]
+    
+    @staticmethod
+    def get_ids(status: Optional[str] = None, category: Optional[str] = None,
+                owner_id: Optional[int] = None, search: Optional[str] = None,
+                location: Optional[str] = None, limit: Optional[int] = None,
+                min_capacity: Optional[int] = None) -> List[int]:
+        """
+        Retrieve only the IDs of resources matching the filters.
+        
+        Args:
+            status: Filter by status
+            category: Filter by category
+            owner_id: Filter by owner
+            search: Search term
+            location: Filter by location
+            limit: Maximum number of IDs to return
+            min_capacity: Minimum capacity
+        
+        Returns:
+            List[int]: Matching resource IDs ordered by ID
+        """
+        query = ResourceRepository._apply_filters(
+            db.session.query(Resource.id),
+            status=status,
+            category=category,
+            owner_id=owner_id,
+            search=search,
+            location=location,
+            min_capacity=min_capacity
+        ).order_by(Resource.id.asc())
+        
+        if limit:
+            query = query.limit(limit)
+        
+        return [row[0] for row in query.all()]
+    
     @staticmethod
     def search(search_term: str, category: Optional[str] = None,
                location: Optional[str] = None, limit: int = 20) -> List[Resource]:
         """
         Search resources by title, description, location.
         
+        Uses the full-text index (see ``ResourceSearch``), so results are
+        ordered by relevance first.
+        
         Args:
             search_term: Search term
             category: Optional category filter
@@ -148,21 +258,14 @@ class ResourceRepository:
         """
         query = Resource.query.filter_by(status='published')
         
-        # Build search filter
-        search_filter = or_(
-            Resource.title.ilike(f'%{search_term}%'),
-            Resource.description.ilike(f'%{search_term}%'),
-            Resource.location.ilike(f'%{search_term}%')
-        )
-        query = query.filter(search_filter)
-        
         if category:
             query = query.filter_by(category=category)
         
         if location:
             query = query.filter(Resource.location.ilike(f'%{location}%'))
         
-        # Order by average rating (best first), then created date
+        # Best matches first, then by average rating and created date
+        query = ResourceSearch.apply(query, search_term, ranked=True)
         query = query.order_by(
             Resource.average_rating.desc().nullslast(),
             Resource.created_at.desc()
@@ -188,7 +291,7 @@ class ResourceRepository:
         
         # Handle availability_rules separately
         if 'availability_rules' in kwargs:
-            resource.availability_rules = kwargs.pop('availability_rules')
+            resource.set_availability_rules(kwargs.pop('availability_rules'))
         
         # Update other fields
         for key, value in kwargs.items():
@@ -196,7 +299,9 @@ class ResourceRepository:
                 setattr(resource, key, value)
         
         resource.updated_at = datetime.utcnow()
+        ResourceRepository._bump_dictionaries(resource)
         db.session.commit()
+        ResourceRepository._sync_indexes(resource)
         return resource
     
     @staticmethod
@@ -213,7 +318,9 @@ class ResourceRepository:
         """
         resource.status = status
         resource.updated_at = datetime.utcnow()
+        ResourceRepository._bump_dictionaries(resource)
         db.session.commit()
+        ResourceRepository._sync_indexes(resource)
         return resource
     
     @staticmethod
@@ -232,8 +339,15 @@ class ResourceRepository:
             for production use.
         """
         try:
+            resource_id = resource.id
+            ResourceRepository._bump_dictionaries(resource, deleting=True)
             db.session.delete(resource)
             db.session.commit()
+            engine = get_search_engine()
+            if engine is not None:
+                engine.discard([resource_id])
+            get_suggest_index().discard([resource_id])
+            get_facet_cache().invalidate()
             return True
         except Exception:
             db.session.rollback()
@@ -242,7 +356,8 @@ class ResourceRepository:
     @staticmethod
     def count(status: Optional[str] = None, category: Optional[str] = None,
               owner_id: Optional[int] = None, search: Optional[str] = None,
-              location: Optional[str] = None) -> int:
+              location: Optional[str] = None, min_capacity: Optional[int] = None,
+              resource_ids: Optional[List[int]] = None) -> int:
         """
         Count resources with optional filtering.
         """
@@ -252,40 +367,83 @@ class ResourceRepository:
             category=category,
             owner_id=owner_id,
             search=search,
-            location=location
+            location=location,
+            min_capacity=min_capacity,
+            resource_ids=resource_ids
         )
         
         return query.count()
     
+    @staticmethod
+    def get_facet_counts(status: Optional[str] = None, category: Optional[str] = None,
+                         owner_id: Optional[int] = None, search: Optional[str] = None,
+                         location: Optional[str] = None, min_capacity: Optional[int] = None,
+                         resource_ids: Optional[List[int]] = None) -> Facets:
+        """
+        Count matching resources per category, location and capacity bucket.
+        
+        Takes the same filters as ``count``; all three facets are computed in
+        a single grouped query.
+        
+        Returns:
+            Facets: ``{'category': {...}, 'location': {...}, 'capacity': {...}}``
+        """
+        query = ResourceRepository._apply_filters(
+            Resource.query,
+            status=status,
+            category=category,
+            owner_id=owner_id,
+            search=search,
+            location=location,
+            min_capacity=min_capacity,
+            resource_ids=resource_ids
+        )
+        
+        return count_facets(query)
+    
     @staticmethod
     def get_categories() -> List[str]:
         """
-        Get all unique categories from resources.
+        Get all unique categories from published resources.
+        
+        Cached per process until a resource write bumps the dictionary
+        generation.
         
         Returns:
             List[str]: List of unique categories
         """
-        categories = db.session.query(Resource.category).distinct().filter(
-            Resource.category.isnot(None),
-            Resource.status == 'published'
-        ).all()
-        
-        return [cat[0] for cat in categories if cat[0]]
+        def load():
+            categories = db.session.query(Resource.category).distinct().filter(
+                Resource.category.isnot(None),
+                Resource.status == 'published'
+            ).all()
+            return sorted(cat[0] for cat in categories if cat[0])
+        
+        return list(get_versioned_cache().get(
+            'resource_categories', ResourceRepository.DICTIONARY_GENERATION, load
+        ))
     
     @staticmethod
     def get_locations() -> List[str]:
         """
-        Get all unique locations from resources.
+        Get all unique locations from published resources.
+        
+        Cached per process until a resource write bumps the dictionary
+        generation.
         
         Returns:
             List[str]: List of unique locations
         """
-        locations = db.session.query(Resource.location).distinct().filter(
-            Resource.location.isnot(None),
-            Resource.status == 'published'
-        ).all()
-        
-        return [loc[0] for loc in locations if loc[0]]
+        def load():
+            locations = db.session.query(Resource.location).distinct().filter(
+                Resource.location.isnot(None),
+                Resource.status == 'published'
+            ).all()
+            return sorted(loc[0] for loc in locations if loc[0])
+        
+        return list(get_versioned_cache().get(
+            'resource_locations', ResourceRepository.DICTIONARY_GENERATION, load
+        ))
     
     @staticmethod
     def get_by_owner(owner_id: int, status: Optional[str] = None) -> List[Resource]:
@@ -0,0 +1,211 @@
+"""
+Resource Search
+Dialect-aware full-text search over resource title, description and location.
+
+SQLite uses an external-content FTS5 table (``resources_fts``) kept in sync by
+triggers and ranked with BM25. PostgreSQL uses a stored, weighted ``tsvector``
+column (``resources.search_vector``) with a GIN index, ranked with ``ts_rank``.
+Other databases, or SQLite builds without FTS5, fall back to ILIKE matching.
+
+The schema objects are created with the ``resources`` table (``db.create_all``)
+and by the ``d8b2e4f6a1c3`` migration for existing databases.
+"""
+
+import re
+import sqlite3
+from typing import List, Optional, Sequence
+from sqlalchemy import event, func, literal_column, or_, select, text
+from extensions import db
+from models.resource import Resource
+
+FTS_TABLE = 'resources_fts'
+
+# Column weights, in (title, description, location) order
+SQLITE_BM25_WEIGHTS = (10.0, 3.0, 1.0)
+POSTGRES_WEIGHTS = {'title': 'A', 'description': 'B', 'location': 'C'}
+
+# Most tokens taken from one search term; the rest of the input is ignored
+MAX_SEARCH_TOKENS = 8
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, location,
+        content='resources', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS resources_fts_insert AFTER INSERT ON resources BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS resources_fts_delete AFTER DELETE ON resources BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS resources_fts_update
+    AFTER UPDATE OF title, description, location ON resources BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE resources ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_resources_search_vector ON resources USING GIN (search_vector)",
+]
+
+
+def _sqlite_has_fts5() -> bool:
+    """Check whether the linked SQLite library was built with FTS5."""
+    try:
+        connection = sqlite3.connect(':memory:')
+        try:
+            connection.execute('CREATE VIRTUAL TABLE probe USING fts5(body)')
+        finally:
+            connection.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+SQLITE_FTS5 = _sqlite_has_fts5()
+
+
+def backend_for(dialect_name: str) -> Optional[str]:
+    """
+    Get the full-text backend for a database dialect.
+
+    Args:
+        dialect_name: SQLAlchemy dialect name
+
+    Returns:
+        Optional[str]: 'fts5', 'tsvector', or None for the ILIKE fallback
+    """
+    if dialect_name == 'sqlite' and SQLITE_FTS5:
+        return 'fts5'
+    if dialect_name == 'postgresql':
+        return 'tsvector'
+    return None
+
+
+def tokenize(search_term: str) -> List[str]:
+    """
+    Split a search term into lowercase word tokens.
+
+    Only word characters survive, so tokens are safe to embed in FTS5 and
+    tsquery syntax.
+
+    Args:
+        search_term: Raw user input
+
+    Returns:
+        List[str]: Tokens (at most MAX_SEARCH_TOKENS)
+    """
+    return [token.lower() for token in _TOKEN_RE.findall(search_term)][:MAX_SEARCH_TOKENS]
+
+
+class ResourceSearch:
+    """
+    Builds full-text filter and ranking expressions for resource queries.
+    Every token must match (AND); the last token also matches as a prefix so
+    results update while a user is still typing.
+    """
+
+    @staticmethod
+    def _backend() -> Optional[str]:
+        return backend_for(db.engine.dialect.name)
+
+    @staticmethod
+    def _fts5_query(tokens: Sequence[str], columns: Sequence[str]) -> str:
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += '*'
+        return '{' + ' '.join(columns) + '} : (' + ' '.join(terms) + ')'
+
+    @staticmethod
+    def _tsquery(tokens: Sequence[str], columns: Sequence[str]) -> str:
+        weights = ''.join(POSTGRES_WEIGHTS[column] for column in columns)
+        terms = [f'{token}:{weights}' for token in tokens]
+        terms[-1] = f'{tokens[-1]}:*{weights}'
+        return ' & '.join(terms)
+
+    @staticmethod
+    def _ilike(search_term: str, columns: Sequence[str]):
+        return or_(*[getattr(Resource, column).ilike(f'%{search_term}%') for column in columns])
+
+    @staticmethod
+    def apply(query, search_term: str,
+              columns: Sequence[str] = ('title', 'description', 'location'),
+              ranked: bool = False):
+        """
+        Restrict a resource query to rows matching a search term.
+
+        Args:
+            query: Query selecting from ``resources``
+            search_term: Raw user input
+            columns: Columns to search
+            ranked: Also order by relevance (best first); callers may add
+                further ORDER BY clauses as tie-breakers
+
+        Returns:
+            The filtered (and optionally ordered) query
+        """
+        tokens = tokenize(search_term)
+        backend = ResourceSearch._backend()
+
+        if not tokens or backend is None:
+            return query.filter(ResourceSearch._ilike(search_term, columns))
+
+        if backend == 'fts5':
+            match = literal_column(FTS_TABLE).op('MATCH')(ResourceSearch._fts5_query(tokens, columns))
+
+            if not ranked:
+                return query.filter(Resource.id.in_(
+                    select(literal_column('rowid')).select_from(text(FTS_TABLE)).where(match)
+                ))
+
+            # bm25() is only valid in the MATCH query itself, so rank there and join
+            matches = select(
+                literal_column('rowid').label('id'),
+                func.bm25(literal_column(FTS_TABLE), *SQLITE_BM25_WEIGHTS).label('rank')
+            ).select_from(text(FTS_TABLE)).where(match).subquery('search_matches')
+            return query.join(matches, matches.c.id == Resource.id).order_by(matches.c.rank.asc())
+
+        vector = literal_column('resources.search_vector')
+        tsquery = func.to_tsquery('simple', ResourceSearch._tsquery(tokens, columns))
+        query = query.filter(vector.op('@@')(tsquery))
+
+        if ranked:
+            query = query.order_by(func.ts_rank(vector, tsquery).desc())
+
+        return query
+
+    @staticmethod
+    def rebuild() -> None:
+        """Rebuild the SQLite FTS index from the resources table."""
+        if ResourceSearch._backend() == 'fts5':
+            db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            db.session.commit()
+
+
+@event.listens_for(Resource.__table__, 'after_create')
+def _create_search_index(target, connection, **kw):
+    """Create the full-text schema objects alongside the resources table."""
+    backend = backend_for(connection.dialect.name)
+    statements = SQLITE_DDL if backend == 'fts5' else POSTGRES_DDL if backend == 'tsvector' else []
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+@event.listens_for(Resource.__table__, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    """Drop the FTS5 table with the resources table (triggers go with the table)."""
+    if backend_for(connection.dialect.name) == 'fts5':
+        connection.execute(text(f'DROP TABLE IF EXISTS {FTS_TABLE}'))
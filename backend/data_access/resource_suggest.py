@@ -0,0 +1,254 @@
+"""
+Resource Suggestions
+In-process typeahead index over published resource titles, categories and
+locations. Completions are looked up by binary search in a sorted array of
+phrase keys and ranked by popularity (reviews plus approved/completed
+bookings), so a keystroke never reaches the database once the index is built.
+"""
+
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import func
+from extensions import db
+from data_access.search_engine import words
+from models.booking import Booking
+from models.resource import Resource
+
+# Booking statuses that count towards a resource's popularity
+POPULAR_BOOKING_STATUSES = ('approved', 'completed')
+
+# Phrase identity: ('title', resource_id), ('category', name) or ('location', name)
+PhraseKey = Tuple[str, object]
+
+
+class SuggestedResource:
+    """Suggestion-relevant snapshot of one published resource."""
+
+    __slots__ = ('id', 'title', 'category', 'location', 'review_count', 'bookings')
+
+    def __init__(self, resource_id: int, title: Optional[str], category: Optional[str],
+                 location: Optional[str], review_count: Optional[int], bookings: int = 0):
+        self.id = resource_id
+        self.title = title
+        self.category = category
+        self.location = location
+        self.review_count = review_count or 0
+        self.bookings = bookings
+
+    @property
+    def popularity(self) -> int:
+        """Completion weight; every resource counts at least once."""
+        return 1 + self.review_count + self.bookings
+
+    def phrases(self) -> List[Tuple[PhraseKey, str]]:
+        """Get the (phrase key, display text) pairs this resource contributes."""
+        phrases = []
+        if self.title:
+            phrases.append((('title', self.id), self.title))
+        if self.category:
+            phrases.append((('category', self.category), self.category))
+        if self.location:
+            phrases.append((('location', self.location), self.location))
+        return phrases
+
+
+class _Phrase:
+    """A completion and the weight accumulated from the resources using it."""
+
+    __slots__ = ('text', 'weight', 'count')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.weight = 0
+        self.count = 0
+
+
+class ResourceSuggestIndex:
+    """
+    Process-local typeahead index.
+
+    Each phrase is stored under every word-boundary suffix of its normalized
+    form ('library study room', 'study room', 'room'), so typing any word of
+    a title finds it. Category and location phrases are shared by all the
+    resources using them and weighted by their summed popularity. Resource
+    writes made through ``ResourceRepository`` are applied immediately; review
+    counts and booking totals changed elsewhere are picked up when the index
+    is rebuilt after ``ttl_seconds``.
+    """
+
+    # Rows fetched per round trip while building
+    BUILD_BATCH_SIZE = 1000
+
+    def __init__(self, ttl_seconds: int = 300):
+        """
+        Initialize an empty index.
+
+        Args:
+            ttl_seconds: Seconds before the index is rebuilt from the database
+        """
+        self.ttl_seconds = ttl_seconds
+        self.built_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def _reset(self) -> None:
+        self._docs: Dict[int, SuggestedResource] = {}
+        self._phrases: Dict[PhraseKey, _Phrase] = {}
+        self._keys: List[Tuple[str, PhraseKey]] = []
+
+    def _is_fresh(self) -> bool:
+        return self.built_at is not None and time.monotonic() - self.built_at < self.ttl_seconds
+
+    def _build(self) -> None:
+        """Load every published resource and its booking total from the database."""
+        self._reset()
+        bookings = dict(
+            db.session.query(Booking.resource_id, func.count(Booking.id))
+            .filter(Booking.status.in_(POPULAR_BOOKING_STATUSES))
+            .group_by(Booking.resource_id)
+            .all()
+        )
+        rows = db.session.query(
+            Resource.id, Resource.title, Resource.category, Resource.location, Resource.review_count
+        ).filter(Resource.status == 'published').yield_per(self.BUILD_BATCH_SIZE)
+
+        for row in rows:
+            self._add(SuggestedResource(*row, bookings=bookings.get(row.id, 0)), keep_sorted=False)
+        self._keys.sort()
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def _suffixes(text: str) -> List[str]:
+        tokens = words(text)
+        return [' '.join(tokens[i:]) for i in range(len(tokens))]
+
+    def _add(self, doc: SuggestedResource, keep_sorted: bool = True) -> None:
+        self._docs[doc.id] = doc
+        for key, text in doc.phrases():
+            phrase = self._phrases.get(key)
+            if phrase is None:
+                phrase = self._phrases[key] = _Phrase(text)
+                for suffix in self._suffixes(text):
+                    if keep_sorted:
+                        insort(self._keys, (suffix, key))
+                    else:
+                        self._keys.append((suffix, key))
+            phrase.weight += doc.popularity
+            phrase.count += 1
+
+    def _remove(self, resource_id: int) -> Optional[SuggestedResource]:
+        doc = self._docs.pop(resource_id, None)
+        if doc is None:
+            return None
+
+        for key, text in doc.phrases():
+            phrase = self._phrases[key]
+            phrase.weight -= doc.popularity
+            phrase.count -= 1
+            if phrase.count == 0:
+                # Last resource using the phrase; drop its keys
+                del self._phrases[key]
+                for suffix in self._suffixes(text):
+                    position = bisect_left(self._keys, (suffix, key))
+                    if position < len(self._keys) and self._keys[position] == (suffix, key):
+                        del self._keys[position]
+        return doc
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, object]]:
+        """
+        Complete a partially typed search term.
+
+        Args:
+            prefix: Raw user input; matched against the start of any word
+            limit: Maximum number of completions
+
+        Returns:
+            List[Dict]: Completions, most popular first, each with ``text``,
+            ``type`` ('title', 'category' or 'location') and, for titles,
+            ``resource_id``
+        """
+        needle = ' '.join(words(prefix))
+        if not needle:
+            return []
+
+        with self._lock:
+            if not self._is_fresh():
+                self._build()
+
+            # A phrase may match through several of its suffixes; count it once
+            matches = set()
+            position = bisect_left(self._keys, (needle,))
+            while position < len(self._keys) and self._keys[position][0].startswith(needle):
+                matches.add(self._keys[position][1])
+                position += 1
+
+            best = heapq.nsmallest(
+                limit, matches,
+                key=lambda key: (-self._phrases[key].weight, len(self._phrases[key].text), self._phrases[key].text)
+            )
+
+            suggestions = []
+            for kind, value in best:
+                suggestion = {'text': self._phrases[(kind, value)].text, 'type': kind}
+                if kind == 'title':
+                    suggestion['resource_id'] = value
+                suggestions.append(suggestion)
+            return suggestions
+
+    def sync(self, resource: Resource) -> None:
+        """
+        Apply a committed resource change to the index.
+
+        Args:
+            resource: Resource that was created or changed
+        """
+        with self._lock:
+            if self.built_at is None:
+                return
+
+            previous = self._remove(resource.id)
+            if resource.status == 'published':
+                self._add(SuggestedResource(
+                    resource.id, resource.title, resource.category, resource.location,
+                    resource.review_count, bookings=previous.bookings if previous else 0
+                ))
+
+    def discard(self, resource_ids: Iterable[int]) -> None:
+        """
+        Drop deleted resources from the index.
+
+        Args:
+            resource_ids: Resource IDs to remove
+        """
+        with self._lock:
+            for resource_id in resource_ids:
+                self._remove(resource_id)
+
+    def invalidate(self) -> None:
+        """Forget the index so it is rebuilt on next use."""
+        with self._lock:
+            self._reset()
+            self.built_at = None
+
+
+def get_suggest_index() -> ResourceSuggestIndex:
+    """
+    Get the resource suggestion index for the current application.
+
+    Returns:
+        ResourceSuggestIndex: The index (built on first use)
+    """
+    index = current_app.extensions.get('resource_suggest_index')
+    if index is None:
+        index = ResourceSuggestIndex(
+            ttl_seconds=current_app.config.get('RESOURCE_SUGGEST_TTL_SECONDS', 300)
+        )
+        current_app.extensions['resource_suggest_index'] = index
+    return index
@@ -4,11 +4,14 @@ Data access layer for review management.
 Handles all database queries for reviews and ratings.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import case, func, or_, select, update
 from extensions import db
+from data_access.load_options import load_options
+from models.resource import Resource
 from models.review import Review
+from utils.pagination import Cursor, keyset_filter
 
 
 class ReviewRepository:
@@ -17,6 +20,15 @@ class ReviewRepository:
     Provides methods for CRUD operations and rating calculations.
     """
     
+    # Histogram column for each star rating
+    RATING_COLUMNS = {
+        1: Resource.rating_count_1,
+        2: Resource.rating_count_2,
+        3: Resource.rating_count_3,
+        4: Resource.rating_count_4,
+        5: Resource.rating_count_5,
+    }
+    
     @staticmethod
     def create(resource_id: int, reviewer_id: int, rating: int,
               comment: Optional[str] = None, booking_id: Optional[int] = None) -> Review:
@@ -38,19 +50,17 @@ class ReviewRepository:
             reviewer_id=reviewer_id,
             rating=rating,
             comment=comment,
-            booking_id=booking_id,
-            is_flagged=False,
-            is_hidden=False,
-            timestamp=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            booking_id=booking_id
         )
+        review.is_flagged = False
+        review.is_hidden = False
+        review.timestamp = datetime.utcnow()
+        review.updated_at = datetime.utcnow()
         
         db.session.add(review)
+        ReviewRepository._apply_rating_change(resource_id, added=review.rating)
         db.session.commit()
         
-        # Update resource average rating
-        ReviewRepository._update_resource_rating(resource_id)
-        
         return review
     
     @staticmethod
@@ -68,7 +78,9 @@ class ReviewRepository:
     
     @staticmethod
     def get_by_resource(resource_id: int, include_hidden: bool = False,
-                       limit: int = 100, offset: int = 0) -> List[Review]:
+                       limit: int = 100, offset: int = 0,
+                       after: Optional[Cursor] = None,
+                       include: Sequence[str] = ()) -> List[Review]:
         """
         Get all reviews for a resource.
         
@@ -77,16 +89,25 @@ class ReviewRepository:
             include_hidden: Whether to include hidden reviews
             limit: Maximum number of reviews
             offset: Offset for pagination
+            after: Keyset cursor (timestamp, id); returns rows after it instead of using offset
+            include: Relationships to eager-load (see ``load_options``)
         
         Returns:
             List[Review]: List of reviews
         """
-        query = Review.query.filter(Review.resource_id == resource_id)
+        query = Review.query.options(*load_options(Review, include)).filter(
+            Review.resource_id == resource_id
+        )
         
         if not include_hidden:
             query = query.filter(Review.is_hidden == False)
         
-        reviews = query.order_by(Review.timestamp.desc()).limit(limit).offset(offset).all()
+        if after:
+            query = query.filter(keyset_filter(Review.timestamp, Review.id, after))
+        
+        reviews = query.order_by(
+            Review.timestamp.desc(), Review.id.desc()
+        ).limit(limit).offset(offset).all()
         
         return reviews
     
@@ -137,7 +158,10 @@ class ReviewRepository:
             Review: Updated review
         """
         if rating is not None:
+            previous = review.rating
             review.rating = rating
+            if not review.is_hidden and review.rating != previous:
+                ReviewRepository._apply_rating_change(review.resource_id, removed=previous, added=review.rating)
         
         if comment is not None:
             review.comment = comment
@@ -146,9 +170,6 @@ class ReviewRepository:
         
         db.session.commit()
         
-        # Update resource average rating
-        ReviewRepository._update_resource_rating(review.resource_id)
-        
         return review
     
     @staticmethod
@@ -159,13 +180,13 @@ class ReviewRepository:
         Args:
             review: Review to delete
         """
-        resource_id = review.resource_id
+        # Hiding first takes the review out of the aggregates exactly once,
+        # even if it is being hidden or deleted concurrently
+        if ReviewRepository._set_hidden(review, True):
+            ReviewRepository._apply_rating_change(review.resource_id, removed=review.rating)
         
         db.session.delete(review)
         db.session.commit()
-        
-        # Update resource average rating
-        ReviewRepository._update_resource_rating(resource_id)
     
     @staticmethod
     def flag_review(review: Review, user_id: int) -> Review:
@@ -198,15 +219,16 @@ class ReviewRepository:
         Returns:
             Review: Hidden review
         """
+        if ReviewRepository._set_hidden(review, True):
+            # Hidden reviews don't count towards the resource's rating
+            ReviewRepository._apply_rating_change(review.resource_id, removed=review.rating)
+        
         review.is_hidden = True
         review.moderation_notes = moderation_notes
         review.updated_at = datetime.utcnow()
         
         db.session.commit()
         
-        # Update resource average rating (excluding hidden reviews)
-        ReviewRepository._update_resource_rating(review.resource_id)
-        
         return review
     
     @staticmethod
@@ -220,6 +242,9 @@ class ReviewRepository:
         Returns:
             Review: Unhidden review
         """
+        if ReviewRepository._set_hidden(review, False):
+            ReviewRepository._apply_rating_change(review.resource_id, added=review.rating)
+        
         review.is_hidden = False
         review.is_flagged = False
         review.moderation_notes = None
@@ -227,9 +252,6 @@ class ReviewRepository:
         
         db.session.commit()
         
-        # Update resource average rating
-        ReviewRepository._update_resource_rating(review.resource_id)
-        
         return review
     
     @staticmethod
@@ -288,30 +310,102 @@ class ReviewRepository:
         return float(result) if result else None
     
     @staticmethod
-    def _update_resource_rating(resource_id: int) -> None:
+    def _set_hidden(review: Review, hidden: bool) -> bool:
         """
-        Update resource's average rating and review count.
+        Switch a review's visibility in the database if it isn't already.
+        
+        The check and the change are one conditional UPDATE, so of several
+        concurrent hides (or a hide and a delete) only one sees the switch,
+        whatever state the in-memory review shows.
         
         Args:
-            resource_id: Resource ID
-        """
-        from models.resource import Resource
+            review: Review to change
+            hidden: Whether the review should be hidden
         
-        resource = Resource.query.get(resource_id)
-        if not resource:
-            return
+        Returns:
+            bool: True if this call changed the visibility
+        """
+        result = db.session.execute(
+            update(Review)
+            .where(Review.id == review.id, Review.is_hidden == (not hidden))
+            .values(is_hidden=hidden)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    @staticmethod
+    def _apply_rating_change(resource_id: int, removed: Optional[int] = None,
+                             added: Optional[int] = None) -> None:
+        """
+        Adjust a resource's rating aggregates and histogram for one review.
         
-        # Calculate average rating (excluding hidden reviews)
-        avg_rating = ReviewRepository.get_average_rating(resource_id)
+        Runs as a single UPDATE in the caller's transaction (committed with
+        the review write itself). Deltas are added in SQL, so concurrent
+        review writes to the same resource cannot lose each other's changes.
         
-        # Count reviews (excluding hidden)
-        review_count = ReviewRepository.count_by_resource(resource_id, include_hidden=False)
+        Args:
+            resource_id: Resource ID
+            removed: Rating that stops counting (deleted, hidden or changed)
+            added: Rating that starts counting (created, unhidden or changed)
+        """
+        count_delta = (added is not None) - (removed is not None)
+        new_count = Resource.review_count + count_delta
+        new_sum = Resource.rating_sum + (added or 0) - (removed or 0)
+        
+        values = {
+            'review_count': new_count,
+            'rating_sum': new_sum,
+            'average_rating': case((new_count > 0, new_sum * 1.0 / new_count), else_=0.0)
+        }
+        for stars, delta in ((removed, -1), (added, 1)):
+            if stars is not None:
+                column = ReviewRepository.RATING_COLUMNS[stars]
+                values[column.key] = values.get(column.key, column) + delta
+        
+        db.session.execute(
+            update(Resource)
+            .where(Resource.id == resource_id)
+            .values(**values)
+            .execution_options(synchronize_session='fetch')
+        )
+    
+    @staticmethod
+    def rebuild_rating_aggregates() -> int:
+        """
+        Recompute every resource's rating aggregates from its visible reviews.
         
-        # Update resource
-        resource.average_rating = avg_rating
-        resource.review_count = review_count
+        One set-based UPDATE with correlated subqueries; only resources whose
+        stored count, sum or histogram has drifted (or whose average is
+        missing) are written. Resources without visible reviews average 0.0.
         
+        Returns:
+            int: Number of resources repaired
+        """
+        visible = (Review.resource_id == Resource.id) & (Review.is_hidden == False)
+        actual = {
+            'review_count': select(func.count(Review.id)).where(visible).scalar_subquery(),
+            'rating_sum': select(func.coalesce(func.sum(Review.rating), 0)).where(visible).scalar_subquery(),
+        }
+        for stars, column in ReviewRepository.RATING_COLUMNS.items():
+            actual[column.key] = select(func.count(Review.id)).where(
+                visible, Review.rating == stars
+            ).scalar_subquery()
+        
+        result = db.session.execute(
+            update(Resource)
+            .where(or_(
+                Resource.average_rating.is_(None),
+                *[getattr(Resource, column) != value for column, value in actual.items()]
+            ))
+            .values(
+                average_rating=select(func.coalesce(func.avg(Review.rating), 0.0)).where(visible).scalar_subquery(),
+                **actual
+            )
+            .execution_options(synchronize_session=False)
+        )
         db.session.commit()
+        
+        return result.rowcount
     
     @staticmethod
     def user_has_reviewed_resource(user_id: int, resource_id: int) -> bool:
@@ -0,0 +1,366 @@
+"""
+Resource Search Engine
+In-process inverted index over resources with trigram fuzzy matching.
+Serves resource search when the database has no full-text support, or when
+typo tolerance is wanted, without touching the resources table per query.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from flask import current_app
+from extensions import db
+from data_access.resource_search import backend_for
+from models.resource import Resource
+
+
+# Relative weight of a term occurrence in each field
+FIELD_BOOSTS = {'title': 3.0, 'location': 2.0, 'description': 1.0}
+
+# Match quality multipliers by how a query token reached an indexed term
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.9
+FUZZY_MATCH = 0.8
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def words(value: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase, accent-folded word tokens.
+
+    Args:
+        value: Text to tokenize
+
+    Returns:
+        List[str]: Tokens in order of appearance
+    """
+    if not value:
+        return []
+    if value.isascii():
+        return _WORD_RE.findall(value.lower())
+    folded = unicodedata.normalize('NFKD', value.lower())
+    folded = ''.join(char for char in folded if not unicodedata.combining(char))
+    return _WORD_RE.findall(folded)
+
+
+def trigrams(term: str) -> Set[str]:
+    """
+    Get the padded character trigrams of a term.
+
+    Args:
+        term: Token
+
+    Returns:
+        Set[str]: Trigrams, e.g. ``' st', 'stu', ..., 'dy '`` for 'study'
+    """
+    padded = f' {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class IndexedResource:
+    """Search-relevant snapshot of one resource."""
+
+    __slots__ = ('id', 'status', 'category', 'location', 'rating', 'created', 'weights')
+
+    def __init__(self, resource_id: int, title: Optional[str], description: Optional[str],
+                 location: Optional[str], category: Optional[str], status: Optional[str],
+                 average_rating: Optional[float], created_at: Optional[datetime]):
+        self.id = resource_id
+        self.status = status
+        self.category = category
+        self.location = (location or '').lower()
+        self.rating = average_rating if average_rating is not None else -1.0
+        self.created = created_at.timestamp() if created_at else 0.0
+
+        # term -> boosted weight across fields, damped for repeated occurrences
+        counts: Dict[str, float] = defaultdict(float)
+        for field, text in (('title', title), ('description', description), ('location', location)):
+            for term, count in Counter(words(text)).items():
+                counts[term] += FIELD_BOOSTS[field] * (1.0 + math.log(count))
+        self.weights = dict(counts)
+
+    def sort_key(self, score: float) -> Tuple[float, float, float]:
+        """Rank by score, then average rating, then newest first."""
+        return (score, self.rating, self.created)
+
+
+class ResourceSearchEngine:
+    """
+    Process-local resource search index.
+
+    Holds postings (term -> {resource_id: weight}), a sorted vocabulary for
+    prefix lookups, a trigram map for fuzzy lookups, and status/category sets
+    used to restrict candidates before scoring. The whole index is built from
+    the database on first use and rebuilt after ``ttl_seconds`` so that writes
+    made by other worker processes are eventually picked up; writes made through
+    ``ResourceRepository`` are applied immediately.
+    """
+
+    # Rows fetched per round trip while building
+    BUILD_BATCH_SIZE = 1000
+
+    # Minimum trigram (Dice) similarity for a fuzzy match
+    FUZZY_THRESHOLD = 0.4
+
+    # Most vocabulary terms a single query token may expand to
+    MAX_EXPANSIONS = 20
+
+    def __init__(self, ttl_seconds: int = 300):
+        """
+        Initialize an empty engine.
+
+        Args:
+            ttl_seconds: Seconds before the index is rebuilt from the database
+        """
+        self.ttl_seconds = ttl_seconds
+        self.built_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _reset(self) -> None:
+        self._docs: Dict[int, IndexedResource] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._by_status: Dict[Optional[str], Set[int]] = defaultdict(set)
+        self._by_category: Dict[Optional[str], Set[int]] = defaultdict(set)
+
+    def _is_fresh(self) -> bool:
+        return self.built_at is not None and time.monotonic() - self.built_at < self.ttl_seconds
+
+    def _build(self) -> None:
+        """Load every resource from the database."""
+        self._reset()
+        rows = db.session.query(
+            Resource.id, Resource.title, Resource.description, Resource.location,
+            Resource.category, Resource.status, Resource.average_rating, Resource.created_at
+        ).yield_per(self.BUILD_BATCH_SIZE)
+
+        for row in rows:
+            self._add(IndexedResource(*row), keep_sorted=False)
+        self._vocabulary = sorted(self._postings)
+        self.built_at = time.monotonic()
+
+    def _add(self, doc: IndexedResource, keep_sorted: bool = True) -> None:
+        self._docs[doc.id] = doc
+        self._by_status[doc.status].add(doc.id)
+        self._by_category[doc.category].add(doc.id)
+
+        for term, weight in doc.weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if keep_sorted:
+                    insort(self._vocabulary, term)
+                for gram in trigrams(term):
+                    self._trigrams[gram].add(term)
+            postings[doc.id] = weight
+
+    def _remove(self, resource_id: int) -> None:
+        doc = self._docs.pop(resource_id, None)
+        if doc is None:
+            return
+
+        self._by_status[doc.status].discard(resource_id)
+        self._by_category[doc.category].discard(resource_id)
+
+        for term in doc.weights:
+            postings = self._postings[term]
+            postings.pop(resource_id, None)
+            if not postings:
+                # Last document using the term; drop it from the vocabulary
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+                for gram in trigrams(term):
+                    self._trigrams[gram].discard(term)
+
+    def _expand(self, token: str, prefix: bool) -> Dict[str, float]:
+        """
+        Map a query token to indexed terms with a match quality for each.
+
+        Exact and (for the last token) prefix matches are used when present;
+        otherwise the token is treated as a possible typo and matched by
+        trigram similarity.
+        """
+        expansions: Dict[str, float] = {}
+
+        if token in self._postings:
+            expansions[token] = EXACT_MATCH
+
+        if prefix:
+            position = bisect_left(self._vocabulary, token)
+            while (position < len(self._vocabulary)
+                   and self._vocabulary[position].startswith(token)
+                   and len(expansions) < self.MAX_EXPANSIONS):
+                expansions.setdefault(self._vocabulary[position], PREFIX_MATCH)
+                position += 1
+
+        if expansions or len(token) < 3:
+            return expansions
+
+        grams = trigrams(token)
+        shared = Counter(term for gram in grams for term in self._trigrams.get(gram, ()))
+        similar = []
+        for term, overlap in shared.items():
+            similarity = 2.0 * overlap / (len(grams) + len(trigrams(term)))
+            if similarity >= self.FUZZY_THRESHOLD:
+                similar.append((similarity, term))
+
+        for similarity, term in heapq.nlargest(self.MAX_EXPANSIONS, similar):
+            expansions[term] = FUZZY_MATCH * similarity
+        return expansions
+
+    def search(self, search_term: str, category: Optional[str] = None,
+               location: Optional[str] = None, status: Optional[str] = 'published',
+               limit: int = 20) -> Optional[List[int]]:
+        """
+        Find resources matching every word of a search term.
+
+        Args:
+            search_term: Raw user input; the last word also matches as a prefix
+            category: Only resources in this category
+            location: Only resources whose location contains this text
+            status: Only resources with this status (None for any)
+            limit: Maximum number of results
+
+        Returns:
+            Optional[List[int]]: Resource IDs, best match first, or None if the
+            term has no searchable words
+        """
+        tokens = words(search_term)
+        if not tokens:
+            return None
+
+        with self._lock:
+            if not self._is_fresh():
+                self._build()
+
+            # Filter pre-pass: the status/category sets a candidate must belong to
+            filters = [
+                groups.get(selected, set())
+                for selected, groups in ((status, self._by_status), (category, self._by_category))
+                if selected is not None
+            ]
+            if any(not members for members in filters):
+                return []
+            filters.sort(key=len)
+
+            total = len(self._docs)
+            scores: Optional[Dict[int, float]] = None
+
+            for position, token in enumerate(tokens):
+                token_scores: Dict[int, float] = {}
+                # Only the first word needs the filter check; later words narrow its survivors
+                checks = filters if scores is None else []
+
+                for term, quality in self._expand(token, prefix=position == len(tokens) - 1).items():
+                    postings = self._postings[term]
+                    idf = math.log(1.0 + total / len(postings))
+
+                    # Walk whichever is smaller: the candidates so far or the postings
+                    pool = scores if scores is not None else (filters[0] if filters else None)
+                    if pool is not None and len(pool) < len(postings):
+                        entries = ((rid, postings[rid]) for rid in pool if rid in postings)
+                    else:
+                        entries = postings.items()
+
+                    for resource_id, weight in entries:
+                        if scores is not None and resource_id not in scores:
+                            continue
+                        if checks and not all(resource_id in members for members in checks):
+                            continue
+                        score = quality * weight * idf
+                        if score > token_scores.get(resource_id, 0.0):
+                            token_scores[resource_id] = score
+
+                # Every word must match; keep the best-matching term per word
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {rid: scores[rid] + score for rid, score in token_scores.items()}
+                if not scores:
+                    return []
+
+            if location:
+                needle = location.lower()
+                scores = {rid: score for rid, score in scores.items() if needle in self._docs[rid].location}
+
+            if len(scores) > limit:
+                # Cut on raw scores first so tie-break keys are only built for the survivors
+                cutoff = heapq.nlargest(limit, scores.values())[-1]
+                scores = {rid: score for rid, score in scores.items() if score >= cutoff}
+
+            ranked = sorted(scores.items(), key=lambda item: self._docs[item[0]].sort_key(item[1]), reverse=True)
+            return [resource_id for resource_id, _ in ranked[:limit]]
+
+    def sync(self, resource: Resource) -> None:
+        """
+        Apply a committed resource change to the index.
+
+        Args:
+            resource: Resource that was created or changed
+        """
+        with self._lock:
+            if self.built_at is None:
+                return
+
+            self._remove(resource.id)
+            self._add(IndexedResource(
+                resource.id, resource.title, resource.description, resource.location,
+                resource.category, resource.status, resource.average_rating, resource.created_at
+            ))
+
+    def discard(self, resource_ids: Iterable[int]) -> None:
+        """
+        Drop deleted resources from the index.
+
+        Args:
+            resource_ids: Resource IDs to remove
+        """
+        with self._lock:
+            for resource_id in resource_ids:
+                self._remove(resource_id)
+
+    def invalidate(self) -> None:
+        """Forget the index so it is rebuilt on next use."""
+        with self._lock:
+            self._reset()
+            self.built_at = None
+
+
+def get_search_engine() -> Optional[ResourceSearchEngine]:
+    """
+    Get the resource search engine for the current application.
+
+    ``RESOURCE_SEARCH_BACKEND`` selects it: 'engine' always, 'database' never,
+    and 'auto' (default) only when the database has no full-text support.
+
+    Returns:
+        Optional[ResourceSearchEngine]: The engine, or None when search should
+        go to the database
+    """
+    backend = current_app.config.get('RESOURCE_SEARCH_BACKEND', 'auto')
+    if backend == 'database':
+        return None
+
+    if backend == 'auto' and backend_for(db.engine.dialect.name) is not None:
+        return None
+
+    engine = current_app.extensions.get('resource_search_engine')
+    if engine is None:
+        engine = ResourceSearchEngine(
+            ttl_seconds=current_app.config.get('RESOURCE_SEARCH_ENGINE_TTL_SECONDS', 300)
+        )
+        current_app.extensions['resource_search_engine'] = engine
+    return engine
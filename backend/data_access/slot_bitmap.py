@@ -0,0 +1,130 @@
+"""
+Slot Bitmap
+Per-day occupancy bitmaps with fixed 15-minute slots.
+Each day is a 96-bit integer, so testing a window against a resource's bookings
+is a handful of bitwise ANDs instead of an interval scan.
+"""
+
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+
+# Slot granularity
+SLOT_MINUTES = 15
+SLOT = timedelta(minutes=SLOT_MINUTES)
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY = timedelta(days=1)
+
+
+def midnight(value: datetime) -> datetime:
+    """Return midnight of the day containing ``value``."""
+    return datetime.combine(value.date(), time())
+
+
+def days_spanned(start: datetime, end: datetime) -> List[datetime]:
+    """
+    List the midnights of every day touched by ``[start, end)``.
+
+    Args:
+        start: Range start
+        end: Range end
+
+    Returns:
+        List[datetime]: Day starts in ascending order
+    """
+    days = []
+    day = midnight(start)
+    while day < end:
+        days.append(day)
+        day += DAY
+    return days
+
+
+def slot_mask(day: datetime, start: datetime, end: datetime) -> int:
+    """
+    Build the bitmask of ``day``'s slots touched by ``[start, end)``.
+
+    Partially covered slots are included, so two ranges that overlap always
+    share at least one set bit.
+
+    Args:
+        day: Midnight of the day
+        start: Range start
+        end: Range end
+
+    Returns:
+        int: Bitmask with bit ``i`` set for slot ``i`` of the day
+    """
+    lower = max(start, day)
+    upper = min(end, day + DAY)
+    if lower >= upper:
+        return 0
+
+    first = (lower - day) // SLOT
+    last = -((day - upper) // SLOT)  # ceiling division
+    return ((1 << (last - first)) - 1) << first
+
+
+def window_masks(start: datetime, end: datetime) -> Dict[datetime, int]:
+    """
+    Build per-day slot masks for a query window.
+
+    Args:
+        start: Window start
+        end: Window end
+
+    Returns:
+        Dict[datetime, int]: Day start -> slots the window touches
+    """
+    return {day: slot_mask(day, start, end) for day in days_spanned(start, end)}
+
+
+class SlotBitmap:
+    """
+    Occupied slots of one resource, keyed by day.
+    """
+
+    def __init__(self):
+        """Initialize an empty bitmap."""
+        self._days: Dict[datetime, int] = {}
+
+    def mark(self, start: datetime, end: datetime) -> None:
+        """
+        Mark the slots touched by a range as occupied.
+
+        Args:
+            start: Range start
+            end: Range end
+        """
+        for day in days_spanned(start, end):
+            self._days[day] = self._days.get(day, 0) | slot_mask(day, start, end)
+
+    def rebuild_day(self, day: datetime, intervals: Iterable[Tuple[datetime, datetime]]) -> None:
+        """
+        Recompute one day's bitmap from the intervals that touch it.
+
+        Args:
+            day: Midnight of the day
+            intervals: Every remaining (start, end) interval touching the day
+        """
+        mask = 0
+        for start, end in intervals:
+            mask |= slot_mask(day, start, end)
+
+        if mask:
+            self._days[day] = mask
+        else:
+            self._days.pop(day, None)
+
+    def is_free(self, window: Dict[datetime, int]) -> bool:
+        """
+        Check whether no occupied slot intersects a window.
+
+        Args:
+            window: Per-day masks from ``window_masks``
+
+        Returns:
+            bool: True if every slot of the window is unoccupied
+        """
+        days = self._days
+        return not any(days.get(day, 0) & mask for day, mask in window.items())
@@ -0,0 +1,360 @@
+"""
+Unread Counter
+Per-user cache of unread message counts, so ``/api/messages/unread-count``
+doesn't run a COUNT over ``messages`` on every poll.
+
+``MessageRepository`` adjusts a user's counter after each committed write
+that changes their unread total (write-through). Counters are reconciled
+with the database when first read and again once they are older than the
+TTL, which bounds the damage of any adjustment that was missed (a worker
+dying between its commit and its counter update, for example).
+
+Every change to an entry bumps its generation, and both sides check it:
+
+- A write calls ``begin`` before its commit and passes the generation it
+  got to ``adjust`` after the commit. If anything touched the entry in
+  between (a reload may have stored a count that already includes the
+  write), the count is marked unknown instead of having the delta added
+  a second time.
+- A reload only stores its count if the generation is unchanged since the
+  load started, so a write that began meanwhile discards it.
+
+A write therefore neither gets lost nor counts twice; at worst the next
+read goes to the database.
+
+Changes that reach every user at once (broadcasts) mark all counters
+unknown instead of adjusting each; they are reloaded lazily on the next
+read.
+
+Counters live in a pluggable store:
+
+- ``LocalCounterStore`` keeps them in this process (single-worker setups).
+- ``SQLiteCounterStore`` keeps them in a small SQLite file shared by every
+  worker on the host, so an adjustment made by one worker is seen by all.
+
+Any class with the same ``get``/``begin``/``adjust``/``put``/``clear`` methods can be
+configured by import path (``UNREAD_COUNTER_BACKEND``).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from flask import current_app
+from werkzeug.utils import import_string
+
+# (count or None if unknown, generation, wall-clock time of the last reconcile)
+Entry = Tuple[Optional[int], int, float]
+
+
+class LocalCounterStore:
+    """Counters held in this process."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Entry] = {}
+
+    def get(self, user_id: int) -> Optional[Entry]:
+        """
+        Get a user's entry.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Optional[Entry]: (count, generation, reconciled_at), or None
+        """
+        with self._lock:
+            return self._entries.get(user_id)
+
+    def begin(self, user_id: int) -> int:
+        """
+        Bump a user's generation, creating an entry with an unknown count if missing.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            int: The new generation
+        """
+        with self._lock:
+            count, generation, reconciled_at = self._entries.get(user_id, (None, 0, 0.0))
+            self._entries[user_id] = (count, generation + 1, reconciled_at)
+            return generation + 1
+
+    def adjust(self, user_id: int, delta: int, generation: Optional[int] = None) -> None:
+        """
+        Add to a user's count and bump its generation.
+
+        Args:
+            user_id: User ID
+            delta: Change in unread messages
+            generation: Generation returned by ``begin``; if the entry has
+                changed since, the count is marked unknown instead
+        """
+        with self._lock:
+            count, current, reconciled_at = self._entries.get(user_id, (None, 0, 0.0))
+            if generation is not None and current != generation:
+                count = None
+            elif count is not None:
+                count = max(count + delta, 0)
+            self._entries[user_id] = (count, current + 1, reconciled_at)
+
+    def put(self, user_id: int, count: int, generation: int) -> bool:
+        """
+        Store a reconciled count unless the entry changed since it was read.
+
+        Args:
+            user_id: User ID
+            count: Count loaded from the database
+            generation: Generation seen before loading
+
+        Returns:
+            bool: True if the count was stored (its generation is bumped)
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] != generation:
+                return False
+            self._entries[user_id] = (count, generation + 1, time.time())
+            return True
+
+    def clear(self) -> None:
+        """Mark every count unknown."""
+        with self._lock:
+            for user_id, (_, generation, reconciled_at) in self._entries.items():
+                self._entries[user_id] = (None, generation + 1, reconciled_at)
+
+
+class SQLiteCounterStore:
+    """
+    Counters held in a SQLite file shared by the workers on one host.
+
+    Each adjustment is a single UPDATE/INSERT statement, so concurrent
+    workers can't lose each other's changes. WAL mode lets readers proceed
+    while another worker writes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and if needed create) the counter file.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS unread_counters ('
+            'user_id INTEGER PRIMARY KEY, count INTEGER, '
+            'generation INTEGER NOT NULL, reconciled_at REAL NOT NULL)'
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection to the counter file.
+
+        Returns:
+            sqlite3.Connection: Autocommit connection
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def get(self, user_id: int) -> Optional[Entry]:
+        """
+        Get a user's entry.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Optional[Entry]: (count, generation, reconciled_at), or None
+        """
+        row = self._connection().execute(
+            'SELECT count, generation, reconciled_at FROM unread_counters WHERE user_id = ?',
+            (user_id,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def begin(self, user_id: int) -> int:
+        """
+        Bump a user's generation, creating an entry with an unknown count if missing.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            int: The new generation
+        """
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'INSERT INTO unread_counters (user_id, count, generation, reconciled_at) '
+                'VALUES (?, NULL, 1, 0) '
+                'ON CONFLICT (user_id) DO UPDATE SET generation = generation + 1',
+                (user_id,)
+            )
+            generation = connection.execute(
+                'SELECT generation FROM unread_counters WHERE user_id = ?', (user_id,)
+            ).fetchone()[0]
+        finally:
+            connection.execute('COMMIT')
+        return generation
+
+    def adjust(self, user_id: int, delta: int, generation: Optional[int] = None) -> None:
+        """
+        Add to a user's count and bump its generation.
+
+        Args:
+            user_id: User ID
+            delta: Change in unread messages
+            generation: Generation returned by ``begin``; if the entry has
+                changed since, the count is marked unknown instead
+        """
+        self._connection().execute(
+            'INSERT INTO unread_counters (user_id, count, generation, reconciled_at) '
+            'VALUES (?, NULL, 1, 0) '
+            'ON CONFLICT (user_id) DO UPDATE SET '
+            'count = CASE WHEN ? IS NULL OR generation = ? THEN MAX(count + ?, 0) END, '
+            'generation = generation + 1',
+            (user_id, generation, generation, delta)
+        )
+
+    def put(self, user_id: int, count: int, generation: int) -> bool:
+        """
+        Store a reconciled count unless the entry changed since it was read.
+
+        Args:
+            user_id: User ID
+            count: Count loaded from the database
+            generation: Generation seen before loading
+
+        Returns:
+            bool: True if the count was stored (its generation is bumped)
+        """
+        cursor = self._connection().execute(
+            'UPDATE unread_counters SET count = ?, reconciled_at = ?, generation = generation + 1 '
+            'WHERE user_id = ? AND generation = ?',
+            (count, time.time(), user_id, generation)
+        )
+        return cursor.rowcount == 1
+
+    def clear(self) -> None:
+        """Mark every count unknown."""
+        self._connection().execute(
+            'UPDATE unread_counters SET count = NULL, generation = generation + 1'
+        )
+
+
+class UnreadCounter:
+    """
+    Read-through, write-through unread count cache over a counter store.
+    """
+
+    def __init__(self, store, ttl_seconds: int = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            store: Counter store
+            ttl_seconds: Seconds before a count is reconciled with the database
+        """
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, user_id: int, loader: Callable[[int], int]) -> int:
+        """
+        Get a user's unread count, loading it if unknown or due for reconciliation.
+
+        Args:
+            user_id: User ID
+            loader: Counts the user's unread messages in the database
+
+        Returns:
+            int: Unread message count
+        """
+        entry = self.store.get(user_id)
+        if entry is not None:
+            count, generation, reconciled_at = entry
+            if count is not None and time.time() - reconciled_at < self.ttl_seconds:
+                return count
+        else:
+            # put() only updates an existing entry, so create one to load into
+            generation = self.store.begin(user_id)
+
+        count = loader(user_id)
+        self.store.put(user_id, count, generation)
+        return count
+
+    def begin(self, user_id: int) -> int:
+        """
+        Announce a change to a user's unread count, before committing it.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            int: Generation to pass to ``adjust`` after the commit
+        """
+        return self.store.begin(user_id)
+
+    def adjust(self, user_id: int, delta: int, generation: Optional[int] = None) -> None:
+        """
+        Apply a committed change to a user's unread count.
+
+        Args:
+            user_id: User ID
+            delta: Change in unread messages
+            generation: Generation returned by ``begin`` before the commit
+        """
+        if delta or generation is not None:
+            self.store.adjust(user_id, delta, generation)
+
+    def invalidate_all(self) -> None:
+        """
+        Mark every user's count unknown, so each is reloaded on its next read.
+
+        For changes that reach too many users to adjust one by one, such as
+        a broadcast. Call it after the commit: loads in flight at that point
+        can no longer store their counts.
+        """
+        self.store.clear()
+
+
+STORES = {
+    'local': LocalCounterStore,
+    'sqlite': SQLiteCounterStore,
+}
+
+
+def get_unread_counter() -> UnreadCounter:
+    """
+    Get the unread counter for the current application.
+
+    Returns:
+        UnreadCounter: The counter cache
+    """
+    counter = current_app.extensions.get('unread_counter')
+    if counter is None:
+        config = current_app.config
+        name = config.get('UNREAD_COUNTER_BACKEND', 'local')
+        store_class = STORES.get(name) or import_string(name)
+        if store_class is LocalCounterStore:
+            store = store_class()
+        else:
+            store = store_class(config.get('UNREAD_COUNTER_PATH') or
+                                os.path.join(current_app.instance_path, 'unread_counters.db'))
+        counter = UnreadCounter(store, ttl_seconds=config.get('UNREAD_COUNTER_TTL_SECONDS', 300))
+        current_app.extensions['unread_counter'] = counter
+    return counter
@@ -0,0 +1,118 @@
+"""
+Versioned Cache
+Process-local cache for small, rarely changing query results (such as the
+category and location dictionaries). Each entry is stamped with the generation
+of the data set it was loaded from; writers bump the generation row in
+``cache_generations`` inside their own transaction, and readers compare
+stamps with one primary-key lookup per request, so all worker processes see a
+write as soon as it commits.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+from flask import current_app, g, has_request_context
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.cache_generation import CacheGeneration
+
+
+def current_generation(name: str) -> int:
+    """
+    Read a data set's generation, at most once per request.
+
+    Args:
+        name: Generation counter name
+
+    Returns:
+        int: Current generation (0 if the counter row does not exist yet)
+    """
+    seen = g.setdefault('cache_generations', {}) if has_request_context() else {}
+    if name not in seen:
+        generation = db.session.execute(
+            select(CacheGeneration.generation).where(CacheGeneration.name == name)
+        ).scalar()
+        seen[name] = generation or 0
+    return seen[name]
+
+
+def bump_generation(name: str) -> None:
+    """
+    Mark a data set as changed.
+
+    Runs in the caller's transaction, so other workers see the new generation
+    exactly when the write it describes commits (and never if it rolls back).
+
+    A missing counter row is created in a savepoint; if a concurrent writer
+    creates it first, the increment is retried on their row instead of
+    failing the caller's write.
+
+    Args:
+        name: Generation counter name
+    """
+    increment = (
+        update(CacheGeneration)
+        .where(CacheGeneration.name == name)
+        .values(generation=CacheGeneration.generation + 1)
+    )
+    if db.session.execute(increment).rowcount == 0:
+        try:
+            with db.session.begin_nested():
+                db.session.add(CacheGeneration(name=name, generation=1))
+        except IntegrityError:
+            db.session.execute(increment)
+
+    # This request has to read its own write
+    if has_request_context():
+        g.setdefault('cache_generations', {}).pop(name, None)
+
+
+class VersionedCache:
+    """Generation-stamped values keyed by cache key."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[int, Any]] = {}
+
+    def get(self, key: Hashable, generation_name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, reloading it if its data set has changed.
+
+        Args:
+            key: Cache key
+            generation_name: Generation counter the value depends on
+            loader: Loads the value from the database
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        generation = current_generation(generation_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                return entry[1]
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (generation, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_versioned_cache() -> VersionedCache:
+    """
+    Get the versioned cache for the current application.
+
+    Returns:
+        VersionedCache: The cache
+    """
+    cache = current_app.extensions.get('versioned_cache')
+    if cache is None:
+        cache = VersionedCache()
+        current_app.extensions['versioned_cache'] = cache
+    return cache
@@ -11,6 +11,10 @@ from models.resource import Resource
 from models.booking import Booking
 from models.message import Message
 from models.review import Review
+from models.cache_generation import CacheGeneration
+from models.message_thread import MessageThread, ThreadAlias, ThreadParticipant
+from models.stream_event import StreamEvent
+from models.broadcast import Broadcast, BroadcastReceipt
 
 # Export all models
 __all__ = [
@@ -19,4 +23,11 @@ __all__ = [
     'Booking',
     'Message',
     'Review',
+    'CacheGeneration',
+    'MessageThread',
+    'ThreadAlias',
+    'ThreadParticipant',
+    'StreamEvent',
+    'Broadcast',
+    'BroadcastReceipt',
 ]
@@ -26,7 +26,7 @@ class Booking(db.Model):
     start_datetime = db.Column(db.DateTime, nullable=False, index=True)
     end_datetime = db.Column(db.DateTime, nullable=False, index=True)
     
-    # Status: 'pending', 'approved', 'rejected', 'cancelled', 'completed'
+    # Status: 'pending', 'approved', 'rejected', 'cancelled', 'completed', 'expired'
     status = db.Column(db.String(20), nullable=False, default='pending', index=True)
     
     # Approval/Rejection Details
@@ -41,6 +41,9 @@ class Booking(db.Model):
     # Additional Notes
     notes = db.Column(db.Text, nullable=True)  # Requester's notes
     
+    # Recurring series this booking belongs to (shared by all occurrences)
+    series_id = db.Column(db.String(36), nullable=True, index=True)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -181,6 +184,7 @@ class Booking(db.Model):
             'end_datetime': self.end_datetime.isoformat() if self.end_datetime else None,
             'status': self.status,
             'notes': self.notes,
+            'series_id': self.series_id,
             'duration_hours': self.get_duration_hours(),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
@@ -0,0 +1,87 @@
+"""
+Broadcast Models
+Admin announcements sent to every user, or every user with a role.
+
+A broadcast is stored once no matter how many users it reaches. Per-user
+state is materialized lazily: a ``BroadcastReceipt`` row is only written when
+a user reads the announcements, so an unread broadcast costs nothing per user.
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class Broadcast(db.Model):
+    """
+    Announcement from an admin to many users.
+    """
+
+    __tablename__ = 'broadcasts'
+
+    # Thread ID under which users see broadcasts in their inbox
+    THREAD_ID = 'announcements'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Foreign Keys
+    sender_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+
+    # Role the broadcast is addressed to; NULL for every user
+    audience_role = db.Column(db.String(20), nullable=True)
+
+    # Message Content
+    content = db.Column(db.Text, nullable=False)
+
+    # Timestamps
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    # Relationships
+    sender = db.relationship('User', foreign_keys=[sender_id])
+
+    def to_dict(self, is_read=False, read_at=None):
+        """
+        Convert broadcast to a message-shaped dictionary.
+
+        Args:
+            is_read (bool): Whether the viewing user has read it
+            read_at (datetime): When the viewing user read it
+
+        Returns:
+            dict: Broadcast data
+        """
+        return {
+            'id': self.id,
+            'thread_id': self.THREAD_ID,
+            'sender_id': self.sender_id,
+            'receiver_id': None,
+            'content': self.content,
+            'is_read': is_read,
+            'read_at': read_at.isoformat() if read_at else None,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'audience_role': self.audience_role,
+            'is_broadcast': True,
+        }
+
+    def __repr__(self):
+        """String representation of Broadcast."""
+        return f'<Broadcast {self.id} to {self.audience_role or "all"}>'
+
+
+class BroadcastReceipt(db.Model):
+    """
+    Record that a user has read a broadcast.
+    """
+
+    __tablename__ = 'broadcast_receipts'
+
+    # Composite Primary Key (user first: receipts are looked up per user)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    broadcast_id = db.Column(db.Integer, db.ForeignKey('broadcasts.id', ondelete='CASCADE'), primary_key=True)
+
+    # Timestamps
+    read_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        """String representation of BroadcastReceipt."""
+        return f'<BroadcastReceipt broadcast={self.broadcast_id} user={self.user_id}>'
@@ -0,0 +1,30 @@
+"""
+Cache Generation Model
+Named counters bumped whenever the data behind a process-local cache changes.
+Every worker compares its cached copy's generation against this table, so a
+write in one worker invalidates the caches of all of them.
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class CacheGeneration(db.Model):
+    """
+    Generation counter for one cached data set.
+    """
+    
+    __tablename__ = 'cache_generations'
+    
+    # Primary Key
+    name = db.Column(db.String(50), primary_key=True)
+    
+    # Incremented in the same transaction as the writes it describes
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        """String representation of CacheGeneration."""
+        return f'<CacheGeneration {self.name}={self.generation}>'
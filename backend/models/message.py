@@ -6,6 +6,7 @@ Supports threaded conversations related to bookings and resources.
 
 from datetime import datetime
 from extensions import db
+from models.message_thread import MessageThread
 
 
 class Message(db.Model):
@@ -18,8 +19,15 @@ class Message(db.Model):
     # Primary Key
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     
-    # Thread ID - groups related messages together
-    # Can be based on booking_id or resource_id to keep conversations organized
+    # Thread the message belongs to (one per user pair and booking or resource)
+    # use_alter: message_threads also references messages
+    thread_pk = db.Column(
+        db.Integer,
+        db.ForeignKey('message_threads.id', ondelete='SET NULL', use_alter=True, name='fk_messages_thread_pk'),
+        nullable=True
+    )
+    
+    # Thread ID - the thread's string identifier, kept on each message for clients
     thread_id = db.Column(db.String(100), nullable=True, index=True)
     
     # Foreign Keys
@@ -46,6 +54,12 @@ class Message(db.Model):
     booking = db.relationship('Booking', foreign_keys=[booking_id])
     resource = db.relationship('Resource', foreign_keys=[resource_id])
     
+    # Indexes
+    __table_args__ = (
+        # A thread's messages in order are a range scan of this index
+        db.Index('ix_messages_thread_pk_timestamp', 'thread_pk', 'timestamp', 'id'),
+    )
+    
     def __init__(self, sender_id, receiver_id, content, thread_id=None, 
                  booking_id=None, resource_id=None):
         """
@@ -66,16 +80,10 @@ class Message(db.Model):
         self.booking_id = booking_id
         self.resource_id = resource_id
         
-        # Auto-generate thread_id if not provided
+        # Auto-generate thread_id if not provided, in the same format as
+        # MessageRepository so one conversation doesn't split in two
         if not self.thread_id:
-            if booking_id:
-                self.thread_id = f'booking_{booking_id}'
-            elif resource_id:
-                self.thread_id = f'resource_{resource_id}'
-            else:
-                # Create thread based on user pair (smaller ID first for consistency)
-                user_ids = sorted([sender_id, receiver_id])
-                self.thread_id = f'users_{user_ids[0]}_{user_ids[1]}'
+            self.thread_id = MessageThread.default_thread_id(sender_id, receiver_id, booking_id, resource_id)
     
     def mark_as_read(self):
         """Mark message as read."""
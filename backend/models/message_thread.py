@@ -0,0 +1,149 @@
+"""
+Message Thread Models
+Conversation threads, keyed by their two participants and the booking or
+resource they are about, plus denormalized per-thread and per-participant
+summaries of the messages table. Kept current by ``MessageRepository`` in the
+same transaction as each message write, so a user's inbox is read from
+``thread_participants`` alone instead of being aggregated from ``messages``
+on every request.
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class MessageThread(db.Model):
+    """
+    One conversation thread and its summary.
+
+    A thread is identified by its participants and context: there is at most
+    one thread per pair of users and (booking, resource). Messages reference
+    it by ``id``; ``thread_id`` is the string identifier clients use.
+    """
+
+    __tablename__ = 'message_threads'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Thread identifier carried by every message in the thread; identifiers of
+    # threads merged into this one are kept in ``thread_aliases``
+    thread_id = db.Column(db.String(100), nullable=False, unique=True)
+
+    # Conversation key: both participants (lower user ID first) and context
+    user_low_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_high_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey('resources.id'), nullable=True)
+
+    # Latest message in the thread
+    last_message_id = db.Column(db.Integer, db.ForeignKey('messages.id', ondelete='SET NULL'), nullable=True)
+    last_timestamp = db.Column(db.DateTime, nullable=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Relationships
+    participants = db.relationship('ThreadParticipant', back_populates='thread',
+                                   cascade='all, delete-orphan', passive_deletes=True)
+
+    # Constraints
+    __table_args__ = (
+        db.CheckConstraint('user_low_id <= user_high_id', name='check_thread_users_ordered'),
+        # NULLs never collide in a unique index, so compare missing context as 0
+        db.Index('uq_message_threads_key', 'user_low_id', 'user_high_id',
+                 db.text('coalesce(booking_id, 0)'), db.text('coalesce(resource_id, 0)'), unique=True),
+    )
+
+    @staticmethod
+    def default_thread_id(user_a_id, user_b_id, booking_id=None, resource_id=None):
+        """
+        Build the identifier given to a new thread when the client names none.
+
+        Args:
+            user_a_id (int): One participant
+            user_b_id (int): The other participant
+            booking_id (int): Optional related booking ID
+            resource_id (int): Optional related resource ID
+
+        Returns:
+            str: e.g. 'thread_1_2' or 'thread_1_2_booking_5'
+        """
+        low, high = sorted([user_a_id, user_b_id])
+        thread_id = f'thread_{low}_{high}'
+        if booking_id:
+            thread_id += f'_booking_{booking_id}'
+        elif resource_id:
+            thread_id += f'_resource_{resource_id}'
+        return thread_id
+
+    def involves_user(self, user_id):
+        """
+        Check if a user is one of the thread's participants.
+
+        Args:
+            user_id (int): User ID to check
+
+        Returns:
+            bool: True if user is a participant
+        """
+        return user_id in (self.user_low_id, self.user_high_id)
+
+    def __repr__(self):
+        """String representation of MessageThread."""
+        return f'<MessageThread {self.id}: {self.thread_id}>'
+
+
+class ThreadAlias(db.Model):
+    """
+    Former identifier of a thread that was merged into another one.
+    Lets old links and clients holding the old identifier keep working.
+    """
+
+    __tablename__ = 'thread_aliases'
+
+    # Primary Key
+    alias = db.Column(db.String(100), primary_key=True)
+
+    # Thread the alias now points to
+    thread_pk = db.Column(db.Integer, db.ForeignKey('message_threads.id', ondelete='CASCADE'),
+                          nullable=False, index=True)
+
+    def __repr__(self):
+        """String representation of ThreadAlias."""
+        return f'<ThreadAlias {self.alias} -> {self.thread_pk}>'
+
+
+class ThreadParticipant(db.Model):
+    """
+    One user's view of a thread: their latest message in it and how many
+    messages they have not read yet.
+    """
+
+    __tablename__ = 'thread_participants'
+
+    # Composite Primary Key
+    thread_pk = db.Column(db.Integer, db.ForeignKey('message_threads.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+
+    # Latest message in the thread sent or received by this user
+    last_message_id = db.Column(db.Integer, db.ForeignKey('messages.id', ondelete='SET NULL'), nullable=True)
+    last_timestamp = db.Column(db.DateTime, nullable=False)
+
+    # Messages in the thread received by this user and not yet read
+    unread_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Relationships
+    thread = db.relationship('MessageThread', back_populates='participants')
+    last_message = db.relationship('Message', foreign_keys=[last_message_id])
+
+    # Constraints
+    __table_args__ = (
+        db.CheckConstraint('unread_count >= 0', name='check_unread_count_non_negative'),
+        # A user's inbox, newest thread first, is a range scan of this index
+        db.Index('ix_thread_participants_inbox', 'user_id', 'last_timestamp', 'thread_pk'),
+    )
+
+    def __repr__(self):
+        """String representation of ThreadParticipant."""
+        return f'<ThreadParticipant thread={self.thread_pk} user={self.user_id} unread={self.unread_count}>'
@@ -6,9 +6,15 @@ Examples: study rooms, labs, equipment, event spaces.
 
 from datetime import datetime
 import json
+from sqlalchemy.dialects.postgresql import JSONB
 from extensions import db
 
 
+# Native JSON column: JSONB on PostgreSQL, JSON (text storage) elsewhere.
+# Values are decoded once when the row is loaded, not on every serialization.
+JSONColumn = db.JSON().with_variant(JSONB(), 'postgresql')
+
+
 class Resource(db.Model):
     """
     Resource model for campus resources available for booking.
@@ -33,12 +39,12 @@ class Resource(db.Model):
     # Capacity & Details
     capacity = db.Column(db.Integer, nullable=True)  # Max number of people/users
     
-    # Images - stored as JSON array of image paths
-    images = db.Column(db.Text, nullable=True)  # JSON: ["path1.jpg", "path2.jpg"]
+    # Images - JSON array of image paths
+    images = db.Column(JSONColumn, nullable=True)  # ["path1.jpg", "path2.jpg"]
     
-    # Availability Rules - JSON blob for complex scheduling rules
+    # Availability Rules - JSON object for complex scheduling rules
     # Example: {"recurring": "weekly", "days": ["monday", "wednesday"], "hours": "9:00-17:00"}
-    availability_rules = db.Column(db.Text, nullable=True)
+    availability_rules = db.Column(JSONColumn, nullable=True)
     
     # Status: 'draft', 'published', 'archived'
     status = db.Column(db.String(20), nullable=False, default='draft', index=True)
@@ -46,9 +52,18 @@ class Resource(db.Model):
     # Approval Settings
     requires_approval = db.Column(db.Boolean, default=False)  # Does booking need owner/admin approval?
     
-    # Ratings & Reviews (calculated fields)
+    # Ratings & Reviews (calculated fields, over visible reviews)
+    # Maintained incrementally by ReviewRepository; rebuild with `flask repair-ratings`
     average_rating = db.Column(db.Float, nullable=True, default=0.0)
     review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Rating histogram: number of visible reviews with each star rating
+    rating_count_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Timestamps
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -87,70 +102,101 @@ class Resource(db.Model):
         self.requires_approval = requires_approval
         self.status = status
     
+    def _decoded(self, field):
+        """
+        Get the decoded value of a JSON column.
+        
+        Values are normally decoded already. A string is a legacy JSON-encoded
+        value (stored as text before the column became native JSON); it is
+        parsed once and memoized on the instance, keyed by the raw string.
+        
+        Args:
+            field (str): Column name
+        
+        Returns:
+            Decoded value, or None if missing or malformed
+        """
+        value = getattr(self, field)
+        if not isinstance(value, str):
+            return value
+        
+        memo = self.__dict__.setdefault('_decoded_json', {})
+        cached = memo.get(field)
+        if cached is None or cached[0] != value:
+            try:
+                decoded = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                decoded = None
+            cached = memo[field] = (value, decoded)
+        return cached[1]
+    
     def set_images(self, image_paths):
         """
-        Store image paths as JSON.
+        Store image paths.
         
         Args:
             image_paths (list): List of image file paths
         """
-        if image_paths:
-            self.images = json.dumps(image_paths)
-        else:
-            self.images = None
+        self.images = list(image_paths) if image_paths else None
     
     def get_images(self):
         """
-        Retrieve image paths from JSON.
+        Retrieve image paths.
         
         Returns:
             list: List of image paths or empty list
         """
-        if self.images:
-            try:
-                return json.loads(self.images)
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        images = self._decoded('images')
+        return list(images) if isinstance(images, list) else []
     
     def set_availability_rules(self, rules):
         """
-        Store availability rules as JSON.
+        Store availability rules.
         
         Args:
             rules (dict): Availability rules dictionary
         """
-        if rules:
-            self.availability_rules = json.dumps(rules)
-        else:
-            self.availability_rules = None
+        self.availability_rules = dict(rules) if rules else None
     
     def get_availability_rules(self):
         """
-        Retrieve availability rules from JSON.
+        Retrieve availability rules.
         
         Returns:
             dict: Availability rules or empty dict
         """
-        if self.availability_rules:
-            try:
-                return json.loads(self.availability_rules)
-            except (json.JSONDecodeError, TypeError):
-                return {}
-        return {}
+        rules = self._decoded('availability_rules')
+        return dict(rules) if isinstance(rules, dict) else {}
     
     def update_rating(self):
         """
-        Recalculate average rating from all reviews.
-        Should be called after a review is added/updated/deleted.
+        Recalculate rating aggregates from this resource's visible reviews.
+        Review writes through ReviewRepository keep them current already;
+        this is for repairing a single resource.
         """
-        reviews = self.reviews.all()
-        if reviews:
-            self.review_count = len(reviews)
-            self.average_rating = sum(r.rating for r in reviews) / len(reviews)
-        else:
-            self.review_count = 0
-            self.average_rating = 0.0
+        from models.review import Review
+        
+        histogram = dict(db.session.query(Review.rating, db.func.count(Review.id)).filter(
+            Review.resource_id == self.id, Review.is_hidden == False
+        ).group_by(Review.rating).all())
+        
+        for stars in range(1, 6):
+            setattr(self, f'rating_count_{stars}', histogram.get(stars, 0))
+        
+        count = sum(histogram.values())
+        total = sum(stars * n for stars, n in histogram.items())
+        self.review_count = count
+        self.rating_sum = total
+        self.average_rating = total / count if count else 0.0
+    
+    def get_rating_histogram(self):
+        """
+        Get the number of visible reviews per star rating.
+        
+        Returns:
+            dict: Counts keyed by rating, e.g. {'1': 0, '2': 1, ..., '5': 4}
+        """
+        return {str(stars): getattr(self, f'rating_count_{stars}') or 0 for stars in range(1, 6)}
     
     def is_published(self):
         """Check if resource is published."""
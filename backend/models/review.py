@@ -48,6 +48,8 @@ class Review(db.Model):
     # Constraints
     __table_args__ = (
         db.CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
+        # Serves a resource's visible reviews newest-first straight from the index
+        db.Index('ix_reviews_resource_page', 'resource_id', 'is_hidden', 'timestamp', 'id'),
         # Optional: Prevent multiple reviews for same booking
         # db.UniqueConstraint('booking_id', name='unique_booking_review'),
     )
@@ -88,8 +90,8 @@ class Review(db.Model):
             if 1 <= rating_int <= 5:
                 return rating_int
             raise ValueError("Rating must be between 1 and 5")
-        except (TypeError, ValueError):
-            raise ValueError("Rating must be an integer between 1 and 5")
+        except (TypeError, ValueError) as e:
+            raise ValueError("Rating must be an integer between 1 and 5") from e
     
     def update_rating(self, new_rating):
         """
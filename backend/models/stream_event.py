@@ -0,0 +1,41 @@
+"""
+Stream Event Model
+Outbox of events pushed to users over the server-sent events stream when the
+database fan-out backend is enabled. Every worker process tails this table,
+so an event published by one worker reaches streams held open by any other;
+rows also back ``Last-Event-ID`` resume until they are pruned.
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class StreamEvent(db.Model):
+    """
+    One event addressed to one user.
+    """
+    
+    __tablename__ = 'stream_events'
+    
+    # Primary Key (also the SSE event ID, so it must only ever increase)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    
+    # Recipient
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    
+    # Event name (e.g. 'message.created') and JSON payload
+    event_type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    # Constraints
+    __table_args__ = (
+        # Resume reads one user's events after an ID
+        db.Index('ix_stream_events_user_id_id', 'user_id', 'id'),
+    )
+    
+    def __repr__(self):
+        """String representation of StreamEvent."""
+        return f'<StreamEvent {self.id}: {self.event_type} for {self.user_id}>'
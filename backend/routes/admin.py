@@ -7,6 +7,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import current_user
 from services.admin_service import AdminService
 from services.review_service import ReviewService
+from services.message_service import MessageService
 from middleware.auth import admin_required
 from extensions import limiter
 
@@ -456,6 +457,69 @@ def unhide_review(review_id):
         }), 500
 
 
+@admin_bp.route('/broadcasts', methods=['POST'])
+@admin_required
+@limiter.limit("100 per hour")
+def send_broadcast():
+    """
+    Send an announcement to every user, or every user with a role.
+    
+    POST /api/admin/broadcasts
+    
+    Requires: Admin authentication
+    
+    Request Body:
+        {
+            "content": "The library closes early on Friday.",
+            "audience_role": "student" (optional, default: everyone)
+        }
+    
+    Returns:
+        201: Broadcast sent
+        400: Validation error
+        403: Not authorized
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'Request body is required'
+            }), 400
+        
+        content = data.get('content')
+        
+        if not content:
+            return jsonify({
+                'error': 'Validation Error',
+                'message': 'content is required'
+            }), 400
+        
+        broadcast, error = MessageService.send_broadcast(
+            sender_id=current_user.id,
+            content=content,
+            audience_role=data.get('audience_role')
+        )
+        
+        if error:
+            return jsonify({
+                'error': 'Validation Error',
+                'message': error
+            }), 400
+        
+        return jsonify({
+            'message': 'Broadcast sent successfully',
+            'data': broadcast.to_dict()
+        }), 201
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while sending the broadcast'
+        }), 500
+
+
 @admin_bp.route('/reports/activity', methods=['GET'])
 @admin_required
 def get_activity_report():
@@ -115,6 +115,110 @@ def create_booking():
         }), 500
 
 
+@bookings_bp.route('/series', methods=['POST'])
+@login_required
+@limiter.limit("10 per hour")
+def create_booking_series():
+    """
+    Create a recurring series of bookings.
+    
+    POST /api/bookings/series
+    
+    Requires: Authentication
+    
+    Request Body:
+        {
+            "resource_id": 1,
+            "start_datetime": "2025-01-13T10:00:00Z",
+            "end_datetime": "2025-01-13T12:00:00Z",
+            "frequency": "weekly",
+            "interval": 1,
+            "by_day": ["MO", "WE"],
+            "until": "2025-05-01T00:00:00Z",
+            "count": 30,
+            "notes": "Optional notes for every occurrence"
+        }
+    
+    One of until/count is required. Conflicting occurrences are skipped and
+    reported; the rest are created.
+    
+    Returns:
+        201: Series created (possibly with skipped occurrences)
+        400: Validation error
+        401: Not authenticated
+        404: Resource not found
+        409: Every occurrence conflicts with an existing booking
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'Request body is required'
+            }), 400
+        
+        resource_id = data.get('resource_id')
+        start_datetime_str = data.get('start_datetime')
+        end_datetime_str = data.get('end_datetime')
+        frequency = data.get('frequency')
+        until_str = data.get('until')
+        
+        if not resource_id or not start_datetime_str or not end_datetime_str or not frequency:
+            return jsonify({
+                'error': 'Validation Error',
+                'message': 'resource_id, start_datetime, end_datetime and frequency are required'
+            }), 400
+        
+        try:
+            start_datetime = datetime.fromisoformat(start_datetime_str.replace('Z', '+00:00'))
+            end_datetime = datetime.fromisoformat(end_datetime_str.replace('Z', '+00:00'))
+            until = datetime.fromisoformat(until_str.replace('Z', '+00:00')) if until_str else None
+        except (ValueError, AttributeError):
+            return jsonify({
+                'error': 'Validation Error',
+                'message': 'Invalid datetime format. Use ISO 8601 format (e.g., 2025-01-15T10:00:00Z)'
+            }), 400
+        
+        result, error = BookingService.create_booking_series(
+            requester_id=current_user.id,
+            resource_id=resource_id,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            frequency=frequency,
+            interval=data.get('interval', 1),
+            by_day=data.get('by_day'),
+            until=until,
+            count=data.get('count'),
+            notes=data.get('notes')
+        )
+        
+        if error:
+            status_code = 404 if 'not found' in error.lower() else 400
+            return jsonify({
+                'error': 'Not Found' if status_code == 404 else 'Validation Error',
+                'message': error
+            }), status_code
+        
+        if not result['created']:
+            return jsonify({
+                'error': 'Conflict',
+                'message': 'Every occurrence conflicts with an existing booking',
+                'conflicts': result['conflicts']
+            }), 409
+        
+        return jsonify({
+            'message': f"Created {result['created']} of {result['requested']} bookings",
+            **result
+        }), 201
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while creating the booking series'
+        }), 500
+
+
 @bookings_bp.route('', methods=['GET'])
 @login_required
 def list_bookings():
@@ -126,12 +230,16 @@ def list_bookings():
     Requires: Authentication
     
     Query Parameters:
-        status: Filter by status ('pending', 'approved', 'rejected', 'cancelled', 'completed')
+        status: Filter by status ('pending', 'approved', 'rejected', 'cancelled', 'completed', 'expired')
         page: Page number (default: 1)
         per_page: Items per page (default: 20, max: 100)
+        cursor: Opaque ``next_cursor`` from the previous page (replaces page)
+        include_total: Set to 'false' to skip total counts (default: true)
+        expand: Comma-separated related objects to embed ('resource', 'requester')
     
     Returns:
         200: List of bookings with pagination
+        400: Invalid page, per_page, cursor or expand
         401: Not authenticated
     """
     try:
@@ -139,6 +247,9 @@ def list_bookings():
         status = request.args.get('status')
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 20)), 100)
+        cursor = request.args.get('cursor') or None
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        expand = [name for name in request.args.get('expand', '').split(',') if name]
         
         # Validate status if provided
         if status and status not in BookingService.VALID_STATUSES:
@@ -152,7 +263,10 @@ def list_bookings():
             user_id=current_user.id,
             status=status,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            expand=expand
         )
         
         return jsonify(result), 200
@@ -160,7 +274,7 @@ def list_bookings():
     except ValueError:
         return jsonify({
             'error': 'Bad Request',
-            'message': 'Invalid page or per_page value'
+            'message': 'Invalid page, per_page, cursor or expand value'
         }), 400
     except Exception as e:
         return jsonify({
@@ -308,6 +422,61 @@ def respond_to_booking(booking_id):
         }), 500
 
 
+@bookings_bp.route('/bulk-respond', methods=['POST'])
+@login_required
+def bulk_respond_to_bookings():
+    """
+    Approve or reject many pending bookings in one request.
+    
+    POST /api/bookings/bulk-respond
+    
+    Requires: Authentication (resource owner, staff, or admin)
+    
+    Request Body:
+        {
+            "decisions": [
+                {"booking_id": 1, "action": "approve", "notes": "Optional notes"},
+                {"booking_id": 2, "action": "reject", "notes": "Required reason"}
+            ]
+        }
+    
+    Each decision succeeds or fails on its own; overlapping approvals are
+    resolved in request order.
+    
+    Returns:
+        200: Per-booking results
+        400: Malformed request
+        401: Not authenticated
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('decisions'), list):
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'decisions list is required'
+            }), 400
+        
+        result, error = BookingService.bulk_respond(
+            approver=current_user,
+            decisions=data['decisions']
+        )
+        
+        if error:
+            return jsonify({
+                'error': 'Validation Error',
+                'message': error
+            }), 400
+        
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while responding to the bookings'
+        }), 500
+
+
 @bookings_bp.route('/<int:booking_id>/approve', methods=['POST'])
 @login_required
 def approve_booking(booking_id):
@@ -519,19 +688,30 @@ def get_pending_approvals():
     
     Requires: Authentication (resource owner, staff, or admin)
     
+    Query Parameters:
+        expand: Comma-separated related objects to embed ('resource', 'requester')
+    
     Returns:
         200: List of pending bookings
+        400: Invalid expand value
         401: Not authenticated
     """
     try:
+        expand = [name for name in request.args.get('expand', '').split(',') if name]
+        
         # Get pending bookings that need approval
-        bookings = BookingService.get_pending_approvals(current_user)
+        bookings = BookingService.get_pending_approvals(current_user, expand=expand)
         
         return jsonify({
             'count': len(bookings),
             'bookings': bookings
         }), 200
     
+    except ValueError as e:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'error': 'Internal Server Error',
@@ -623,3 +803,130 @@ def check_availability():
             'error': 'Internal Server Error',
             'message': 'An error occurred while checking availability'
         }), 500
+
+
+@bookings_bp.route('/check-availability/batch', methods=['POST'])
+@login_required
+def check_availability_batch():
+    """
+    Check availability for many resources and time windows in one request.
+    
+    POST /api/bookings/check-availability/batch
+    
+    Requires: Authentication
+    
+    Request Body (explicit slots):
+        {
+            "slots": [
+                {"resource_id": 1, "start_datetime": "2025-01-15T10:00:00Z", "end_datetime": "2025-01-15T12:00:00Z"},
+                {"resource_id": 2, "start_datetime": "2025-01-15T10:00:00Z", "end_datetime": "2025-01-15T12:00:00Z"}
+            ]
+        }
+    
+    Request Body (one window across a filtered resource set):
+        {
+            "start_datetime": "2025-01-15T10:00:00Z",
+            "end_datetime": "2025-01-15T12:00:00Z",
+            "resource_ids": [1, 2, 3] (optional),
+            "category": "study_room" (optional),
+            "location": "Library" (optional)
+        }
+    
+    Returns:
+        200: Availability vector aligned with resource_ids; errors keyed by position
+        400: Validation error
+        401: Not authenticated
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'Request body is required'
+            }), 400
+        
+        max_size = BookingService.MAX_BATCH_SIZE
+        
+        try:
+            if 'slots' in data:
+                slots_data = data.get('slots')
+                if not isinstance(slots_data, list) or not slots_data:
+                    return jsonify({
+                        'error': 'Validation Error',
+                        'message': 'slots must be a non-empty list'
+                    }), 400
+                
+                if len(slots_data) > max_size:
+                    return jsonify({
+                        'error': 'Validation Error',
+                        'message': f'A batch may contain at most {max_size} slots'
+                    }), 400
+                
+                slots = []
+                for slot in slots_data:
+                    if not isinstance(slot, dict) or not slot.get('resource_id') \
+                            or not slot.get('start_datetime') or not slot.get('end_datetime'):
+                        return jsonify({
+                            'error': 'Validation Error',
+                            'message': 'Each slot requires resource_id, start_datetime and end_datetime'
+                        }), 400
+                    
+                    slots.append((
+                        int(slot['resource_id']),
+                        datetime.fromisoformat(slot['start_datetime'].replace('Z', '+00:00')),
+                        datetime.fromisoformat(slot['end_datetime'].replace('Z', '+00:00'))
+                    ))
+            else:
+                start_datetime_str = data.get('start_datetime')
+                end_datetime_str = data.get('end_datetime')
+                
+                if not start_datetime_str or not end_datetime_str:
+                    return jsonify({
+                        'error': 'Validation Error',
+                        'message': 'Either slots or start_datetime and end_datetime are required'
+                    }), 400
+                
+                start_datetime = datetime.fromisoformat(start_datetime_str.replace('Z', '+00:00'))
+                end_datetime = datetime.fromisoformat(end_datetime_str.replace('Z', '+00:00'))
+                
+                resource_ids = data.get('resource_ids')
+                if resource_ids is not None:
+                    if not isinstance(resource_ids, list) or len(resource_ids) > max_size:
+                        return jsonify({
+                            'error': 'Validation Error',
+                            'message': f'resource_ids must be a list of at most {max_size} IDs'
+                        }), 400
+                    resource_ids = [int(resource_id) for resource_id in resource_ids]
+                else:
+                    resource_ids = BookingService.get_bookable_resource_ids(
+                        category=data.get('category'),
+                        location=data.get('location')
+                    )
+                
+                slots = [(resource_id, start_datetime, end_datetime) for resource_id in resource_ids]
+        except (TypeError, ValueError):
+            return jsonify({
+                'error': 'Validation Error',
+                'message': 'Invalid resource_id or datetime format. Use ISO 8601 format (e.g., 2025-01-15T10:00:00Z)'
+            }), 400
+        
+        results = BookingService.check_availability_batch(slots)
+        
+        errors = {}
+        for position, (is_available, message) in enumerate(results):
+            if not is_available and message and 'conflict' not in message.lower():
+                errors[str(position)] = message
+        
+        return jsonify({
+            'count': len(slots),
+            'resource_ids': [slot[0] for slot in slots],
+            'available': [is_available for is_available, _ in results],
+            'errors': errors
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while checking availability'
+        }), 500
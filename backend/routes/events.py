@@ -0,0 +1,99 @@
+"""
+Events Routes
+Server-sent events stream pushing message and booking updates to the client,
+so the frontend no longer has to poll for them.
+"""
+
+import time
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_login import current_user
+from services.event_broker import get_event_broker
+from middleware.auth import login_required
+
+# Create events blueprint
+events_bp = Blueprint('events', __name__)
+
+# Sent when missed events can't be replayed; the client should refetch its state
+RESYNC = 'event: resync\ndata: {}\n\n'
+
+
+@events_bp.route('/stream', methods=['GET'])
+@login_required
+def stream():
+    """
+    Stream the current user's events.
+    
+    GET /api/events/stream
+    
+    Requires: Authentication
+    
+    Headers:
+        Last-Event-ID: ID of the last event received (sent by EventSource on reconnect)
+    
+    Query Parameters:
+        last_event_id: Same as the header, for the first connection of a page
+    
+    Events:
+        message.created: A message was sent to the user
+        message.read: The other participant read the user's messages
+        booking.approved, booking.rejected, booking.cancelled: A booking changed status
+        resync: Missed events could not be replayed; refetch state
+    
+    Returns:
+        200: text/event-stream, closed after EVENT_STREAM_MAX_SECONDS
+        400: Invalid Last-Event-ID
+        401: Not authenticated
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'Invalid Last-Event-ID'
+        }), 400
+    
+    broker = get_event_broker()
+    heartbeat = current_app.config.get('EVENT_STREAM_HEARTBEAT_SECONDS', 15)
+    max_seconds = current_app.config.get('EVENT_STREAM_MAX_SECONDS', 300)
+    
+    # Subscribe before replaying so nothing published in between is lost;
+    # events seen in both are skipped by ID below. IDs aren't compared with
+    # the last one sent: an event that commits late arrives with a lower ID.
+    subscription = broker.subscribe(current_user.id)
+    replay = broker.replay(current_user.id, last_event_id) if last_event_id is not None else []
+    
+    def generate():
+        replayed = set()
+        yield 'retry: 3000\n\n'
+        if replay is None:
+            yield RESYNC
+        for event in replay or ():
+            yield event.encode()
+            replayed.add(event.id)
+        
+        deadline = time.monotonic() + max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = subscription.get(timeout=min(heartbeat, remaining))
+            if subscription.overflowed:
+                # The client fell too far behind; it resumes on reconnect
+                yield RESYNC
+                break
+            if event is None:
+                yield ': keep-alive\n\n'
+            elif event.id in replayed:
+                # Each event reaches the subscription once, so the ID can go
+                replayed.discard(event.id)
+            else:
+                yield event.encode()
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies (nginx) from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Runs when the stream ends or the client disconnects, even before the first chunk
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
@@ -70,9 +70,13 @@ def get_thread_messages(thread_id):
     Query Parameters:
         page: Page number (default: 1)
         per_page: Items per page (default: 50, max: 100)
+        cursor: Opaque ``next_cursor`` from the previous page (replaces page)
+        include_total: Set to 'false' to skip total counts (default: true)
+        expand: Comma-separated related objects to embed ('sender', 'receiver')
     
     Returns:
         200: List of messages with pagination
+        400: Invalid page, per_page, cursor or expand
         403: Access denied
         404: Thread not found
     """
@@ -80,13 +84,19 @@ def get_thread_messages(thread_id):
         # Get query parameters
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 50)), 100)
+        cursor = request.args.get('cursor') or None
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        expand = [name for name in request.args.get('expand', '').split(',') if name]
         
         # Get thread messages
         result, error = MessageService.get_thread_messages(
             thread_id=thread_id,
             user_id=current_user.id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            expand=expand
         )
         
         if error:
@@ -103,7 +113,7 @@ def get_thread_messages(thread_id):
     except ValueError:
         return jsonify({
             'error': 'Bad Request',
-            'message': 'Invalid page or per_page value'
+            'message': 'Invalid page, per_page, cursor or expand value'
         }), 400
     except Exception as e:
         return jsonify({
@@ -3,9 +3,12 @@ Resources Routes
 REST API endpoints for resource management.
 """
 
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_login import current_user
 from services.resource_service import ResourceService
+from services.availability_service import AvailabilityService
+from services.booking_service import BookingService
 from middleware.auth import login_required, optional_auth
 from extensions import limiter
 
@@ -26,11 +29,16 @@ def list_resources():
         category: Filter by category
         location: Filter by location (partial match)
         search: Search in title and description
+        min_capacity: Minimum capacity
+        available_from: Only resources free from this time (ISO 8601, with available_to)
+        available_to: Only resources free until this time (ISO 8601, with available_from)
         page: Page number (default: 1)
         per_page: Items per page (default: 20, max: 100)
+        facets: 'true' to include counts per category, location and capacity
     
     Returns:
         200: List of resources with pagination
+        400: Invalid parameters
         500: Server error
     """
     try:
@@ -39,13 +47,47 @@ def list_resources():
         category = request.args.get('category')
         location = request.args.get('location')
         search = request.args.get('search')
+        min_capacity = request.args.get('min_capacity', type=int)
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 20)), 100)
+        facets = request.args.get('facets', 'false').lower() == 'true'
         
         # For non-authenticated users or students, only show published resources
         if not current_user.is_authenticated or current_user.is_student():
             status = 'published'
         
+        # Optional free-window filter
+        available_from_str = request.args.get('available_from')
+        available_to_str = request.args.get('available_to')
+        available_from = available_to = None
+        
+        if available_from_str or available_to_str:
+            if not (available_from_str and available_to_str):
+                return jsonify({
+                    'error': 'Bad Request',
+                    'message': 'available_from and available_to must be provided together'
+                }), 400
+            
+            try:
+                available_from = BookingService.normalize_datetime(
+                    datetime.fromisoformat(available_from_str.replace('Z', '+00:00'))
+                )
+                available_to = BookingService.normalize_datetime(
+                    datetime.fromisoformat(available_to_str.replace('Z', '+00:00'))
+                )
+            except ValueError:
+                return jsonify({
+                    'error': 'Bad Request',
+                    'message': 'Invalid datetime format. Use ISO 8601 format'
+                }), 400
+            
+            is_valid, error = BookingService.validate_datetime_range(available_from, available_to)
+            if not is_valid:
+                return jsonify({
+                    'error': 'Bad Request',
+                    'message': error
+                }), 400
+        
         # Get resources
         result = ResourceService.list_resources(
             status=status,
@@ -53,7 +95,11 @@ def list_resources():
             location=location,
             search=search,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            min_capacity=min_capacity,
+            available_from=available_from,
+            available_to=available_to,
+            facets=facets
         )
         
         return jsonify(result), 200
@@ -354,6 +400,82 @@ def publish_resource(resource_id):
         }), 500
 
 
+@resources_bp.route('/<int:resource_id>/free-slots', methods=['GET'])
+@optional_auth
+def get_free_slots(resource_id):
+    """
+    Get free time intervals for a resource.
+    
+    GET /api/resources/:id/free-slots?from=...&to=...&min_duration=30
+    
+    Open hours come from the resource's availability rules; pending and
+    approved bookings are subtracted.
+    
+    Query Parameters:
+        from: Window start (ISO 8601, default: now)
+        to: Window end (ISO 8601, default: 7 days after start, max: 90 days)
+        min_duration: Shortest interval to return in minutes (default: 15)
+    
+    Returns:
+        200: Free intervals within the window
+        400: Invalid parameters or availability rules
+        403: Access denied (draft resources)
+        404: Resource not found
+    """
+    try:
+        resource = ResourceService.get_resource(resource_id)
+        
+        if not resource:
+            return jsonify({
+                'error': 'Not Found',
+                'message': 'Resource not found'
+            }), 404
+        
+        # Draft and archived resources only visible to owner and admin
+        if resource.status in ['draft', 'archived']:
+            if not current_user.is_authenticated or not (
+                resource.owner_id == current_user.id or current_user.is_admin()
+            ):
+                return jsonify({
+                    'error': 'Forbidden',
+                    'message': 'This resource is not available'
+                }), 403
+        
+        try:
+            from_str = request.args.get('from')
+            to_str = request.args.get('to')
+            start = datetime.fromisoformat(from_str.replace('Z', '+00:00')) if from_str else None
+            end = datetime.fromisoformat(to_str.replace('Z', '+00:00')) if to_str else None
+            min_duration = int(request.args.get('min_duration', 15))
+        except ValueError:
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'Invalid from, to or min_duration value'
+            }), 400
+        
+        result, error = AvailabilityService.get_free_slots(
+            resource_id=resource_id,
+            start=start,
+            end=end,
+            min_duration_minutes=min_duration
+        )
+        
+        if error:
+            status_code = 404 if 'not found' in error.lower() else 400
+            return jsonify({
+                'error': 'Not Found' if status_code == 404 else 'Bad Request',
+                'message': error
+            }), status_code
+        
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while computing free slots'
+        }), 500
+
+
 @resources_bp.route('/search', methods=['GET'])
 def search_resources():
     """
@@ -409,6 +531,51 @@ def search_resources():
         }), 500
 
 
+@resources_bp.route('/suggest', methods=['GET'])
+def suggest_resources():
+    """
+    Autocomplete a search term.
+    
+    GET /api/resources/suggest?q=stu
+    
+    Query Parameters:
+        q: Text typed so far (required)
+        limit: Max completions (default: 8, max: 20)
+    
+    Returns:
+        200: Completions
+        400: Missing search term
+    """
+    try:
+        prefix = request.args.get('q', '').strip()
+        
+        if not prefix:
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'Search term (q) is required'
+            }), 400
+        
+        limit = min(int(request.args.get('limit', 8)), 20)
+        
+        suggestions = ResourceService.suggest(prefix, limit=limit)
+        
+        return jsonify({
+            'query': prefix,
+            'suggestions': suggestions
+        }), 200
+    
+    except ValueError:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'Invalid limit value'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while fetching suggestions'
+        }), 500
+
+
 @resources_bp.route('/categories', methods=['GET'])
 def get_categories():
     """
@@ -433,6 +600,30 @@ def get_categories():
         }), 500
 
 
+@resources_bp.route('/locations', methods=['GET'])
+def get_locations():
+    """
+    Get the locations of published resources.
+    
+    GET /api/resources/locations
+    
+    Returns:
+        200: List of locations
+    """
+    try:
+        locations = ResourceService.get_locations()
+        
+        return jsonify({
+            'locations': locations
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An error occurred while fetching locations'
+        }), 500
+
+
 @resources_bp.route('/my-resources', methods=['GET'])
 @login_required
 def get_my_resources():
@@ -516,6 +707,9 @@ def get_resource_reviews_alias(resource_id):
     Query Parameters:
         page: Page number (default: 1)
         per_page: Items per page (default: 20, max: 50)
+        cursor: Opaque ``next_cursor`` from the previous page (replaces page)
+        include_total: Set to 'false' to skip total counts (default: true)
+        expand: Comma-separated related objects to embed ('reviewer', 'resource')
     
     Returns:
         200: List of reviews with average rating
@@ -527,12 +721,18 @@ def get_resource_reviews_alias(resource_id):
         # Get query parameters
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 20)), 50)
+        cursor = request.args.get('cursor') or None
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        expand = [name for name in request.args.get('expand', '').split(',') if name]
         
         # Get reviews
         result = ReviewService.get_resource_reviews(
             resource_id=resource_id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            expand=expand
         )
         
         return jsonify(result), 200
@@ -540,7 +740,7 @@ def get_resource_reviews_alias(resource_id):
     except ValueError:
         return jsonify({
             'error': 'Bad Request',
-            'message': 'Invalid page or per_page value'
+            'message': 'Invalid page, per_page, cursor or expand value'
         }), 400
     except Exception as e:
         return jsonify({
@@ -23,6 +23,9 @@ def get_resource_reviews(resource_id):
     Query Parameters:
         page: Page number (default: 1)
         per_page: Items per page (default: 20, max: 50)
+        cursor: Opaque ``next_cursor`` from the previous page (replaces page)
+        include_total: Set to 'false' to skip total counts (default: true)
+        expand: Comma-separated related objects to embed ('reviewer', 'resource')
     
     Returns:
         200: List of reviews with average rating
@@ -32,12 +35,18 @@ def get_resource_reviews(resource_id):
         # Get query parameters
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 20)), 50)
+        cursor = request.args.get('cursor') or None
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        expand = [name for name in request.args.get('expand', '').split(',') if name]
         
         # Get reviews
         result = ReviewService.get_resource_reviews(
             resource_id=resource_id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            expand=expand
         )
         
         return jsonify(result), 200
@@ -45,7 +54,7 @@ def get_resource_reviews(resource_id):
     except ValueError:
         return jsonify({
             'error': 'Bad Request',
-            'message': 'Invalid page or per_page value'
+            'message': 'Invalid page, per_page, cursor or expand value'
         }), 400
     except Exception as e:
         return jsonify({
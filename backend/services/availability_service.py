@@ -0,0 +1,308 @@
+"""
+Availability Service
+Business logic for evaluating resource availability rules.
+Expands weekly rules into open intervals and subtracts active bookings.
+"""
+
+from typing import Optional, Tuple, List, Dict, Any, Iterable
+from datetime import datetime, timedelta, time, timezone
+from data_access.booking_repository import BookingRepository
+from data_access.resource_repository import ResourceRepository
+from models.resource import Resource
+from services.booking_service import BookingService
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # pragma: no cover - Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = KeyError
+
+
+Interval = Tuple[datetime, datetime]
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+
+class AvailabilityService:
+    """
+    Service layer for availability rules and free-slot search.
+    
+    Supported ``availability_rules`` shapes (times are UTC unless a
+    ``timezone`` key names an IANA zone):
+        
+        {}                                                   -> always open
+        {"days": ["monday", "wednesday"], "hours": "9:00-17:00"}
+        {"weekly": {"monday": ["09:00-12:00", "13:00-17:00"], "friday": "10:00-14:00"}}
+    """
+    
+    # Longest window a single free-slot query may cover (in days)
+    MAX_HORIZON_DAYS = 90
+    
+    # Default window when no end is given (in days)
+    DEFAULT_HORIZON_DAYS = 7
+    
+    @staticmethod
+    def _parse_time(value: str) -> timedelta:
+        """Parse 'HH:MM' into an offset from midnight (allows '24:00')."""
+        hours, _, minutes = value.strip().partition(':')
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        if offset < timedelta(0) or offset > timedelta(hours=24):
+            raise ValueError(f"Invalid time: {value}")
+        return offset
+    
+    @staticmethod
+    def _parse_ranges(value: Any) -> List[Tuple[timedelta, timedelta]]:
+        """Parse one 'HH:MM-HH:MM' string or a list of them into offset pairs."""
+        ranges = [value] if isinstance(value, str) else list(value or [])
+        parsed = []
+        for entry in ranges:
+            start_str, _, end_str = entry.partition('-')
+            start = AvailabilityService._parse_time(start_str)
+            end = AvailabilityService._parse_time(end_str)
+            if end <= start:
+                # Overnight range, e.g. 22:00-02:00
+                end += timedelta(days=1)
+            parsed.append((start, end))
+        return parsed
+    
+    @staticmethod
+    def parse_weekly_rules(rules: Dict[str, Any]) -> Optional[Dict[int, List[Tuple[timedelta, timedelta]]]]:
+        """
+        Normalize availability rules into per-weekday opening hours.
+        
+        Args:
+            rules: Decoded availability rules
+        
+        Returns:
+            Optional[Dict[int, List]]: Weekday (0=Monday) -> list of (start, end)
+            offsets from midnight, or None if the resource is always open
+        
+        Raises:
+            ValueError: If the rules cannot be interpreted
+        """
+        if not rules:
+            return None
+        
+        weekly: Dict[int, List[Tuple[timedelta, timedelta]]] = {}
+        
+        if 'weekly' in rules:
+            for day, ranges in rules['weekly'].items():
+                weekday = WEEKDAYS.index(day.lower())
+                weekly.setdefault(weekday, []).extend(AvailabilityService._parse_ranges(ranges))
+        elif 'days' in rules or 'hours' in rules:
+            days = rules.get('days') or WEEKDAYS
+            ranges = AvailabilityService._parse_ranges(rules.get('hours') or '00:00-24:00')
+            for day in days:
+                weekly.setdefault(WEEKDAYS.index(day.lower()), []).extend(ranges)
+        else:
+            return None
+        
+        return weekly
+    
+    @staticmethod
+    def _rules_timezone(rules: Dict[str, Any]):
+        """Resolve the optional IANA timezone of a rule set."""
+        name = (rules or {}).get('timezone')
+        if not name or name.upper() == 'UTC' or ZoneInfo is None:
+            return None
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Unknown timezone: {name}") from e
+    
+    @staticmethod
+    def expand_rules(rules: Dict[str, Any], start: datetime, end: datetime) -> List[Interval]:
+        """
+        Expand availability rules into sorted, merged open intervals.
+        
+        Args:
+            rules: Decoded availability rules
+            start: Window start (naive UTC)
+            end: Window end (naive UTC)
+        
+        Returns:
+            List[Interval]: Open intervals clipped to the window
+        
+        Raises:
+            ValueError: If the rules cannot be interpreted
+        """
+        weekly = AvailabilityService.parse_weekly_rules(rules)
+        if weekly is None:
+            return [(start, end)] if start < end else []
+        
+        zone = AvailabilityService._rules_timezone(rules)
+        
+        def to_utc(local: datetime) -> datetime:
+            if zone is None:
+                return local
+            return local.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+        
+        # Start one day early so overnight ranges from the previous day are included
+        day = start.date() - timedelta(days=1)
+        last_day = end.date() + timedelta(days=1)
+        intervals = []
+        
+        while day <= last_day:
+            midnight = datetime.combine(day, time())
+            for range_start, range_end in weekly.get(day.weekday(), ()):
+                open_start = max(to_utc(midnight + range_start), start)
+                open_end = min(to_utc(midnight + range_end), end)
+                if open_start < open_end:
+                    intervals.append((open_start, open_end))
+            day += timedelta(days=1)
+        
+        return AvailabilityService.merge_intervals(intervals)
+    
+    @staticmethod
+    def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+        """
+        Merge overlapping or touching intervals.
+        
+        Args:
+            intervals: Intervals in any order
+        
+        Returns:
+            List[Interval]: Sorted, disjoint intervals
+        """
+        merged: List[Interval] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+    
+    @staticmethod
+    def subtract_intervals(open_intervals: List[Interval], busy: Iterable[Interval]) -> List[Interval]:
+        """
+        Remove busy time from open intervals with a single sweep.
+        
+        Args:
+            open_intervals: Sorted, disjoint open intervals
+            busy: Busy intervals in any order
+        
+        Returns:
+            List[Interval]: Sorted free intervals
+        """
+        busy_merged = AvailabilityService.merge_intervals(busy)
+        free: List[Interval] = []
+        position = 0
+        
+        for open_start, open_end in open_intervals:
+            cursor = open_start
+            
+            # Skip busy intervals that end before this open interval
+            while position < len(busy_merged) and busy_merged[position][1] <= cursor:
+                position += 1
+            
+            scan = position
+            while scan < len(busy_merged) and busy_merged[scan][0] < open_end:
+                busy_start, busy_end = busy_merged[scan]
+                if busy_start > cursor:
+                    free.append((cursor, busy_start))
+                cursor = max(cursor, busy_end)
+                if cursor >= open_end:
+                    break
+                scan += 1
+            
+            if cursor < open_end:
+                free.append((cursor, open_end))
+        
+        return free
+    
+    @staticmethod
+    def find_free_slots(resources: List[Resource], start: datetime, end: datetime,
+                        min_duration: timedelta) -> Dict[int, List[Interval]]:
+        """
+        Compute free intervals for many resources with one bookings query.
+        
+        Args:
+            resources: Resources to evaluate
+            start: Window start (naive UTC)
+            end: Window end (naive UTC)
+            min_duration: Shortest free interval worth returning
+        
+        Returns:
+            Dict[int, List[Interval]]: Resource ID -> free intervals
+        
+        Raises:
+            ValueError: If a resource's availability rules cannot be interpreted
+        """
+        busy = BookingRepository.get_active_intervals(
+            [resource.id for resource in resources], start, end
+        )
+        
+        result = {}
+        for resource in resources:
+            open_intervals = AvailabilityService.expand_rules(
+                resource.get_availability_rules(), start, end
+            )
+            free = AvailabilityService.subtract_intervals(open_intervals, busy.get(resource.id, []))
+            result[resource.id] = [
+                (slot_start, slot_end) for slot_start, slot_end in free
+                if slot_end - slot_start >= min_duration
+            ]
+        
+        return result
+    
+    @staticmethod
+    def get_free_slots(resource_id: int, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None,
+                       min_duration_minutes: int = 15) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Get free intervals for a resource within a window.
+        
+        Args:
+            resource_id: Resource ID
+            start: Window start (defaults to now; clipped to now)
+            end: Window end (defaults to DEFAULT_HORIZON_DAYS after start)
+            min_duration_minutes: Shortest free interval to return
+        
+        Returns:
+            Tuple[Optional[Dict], Optional[str]]: (result, error_message)
+        """
+        resource = ResourceRepository.get_by_id(resource_id)
+        if not resource:
+            return None, "Resource not found"
+        
+        now = datetime.utcnow().replace(microsecond=0)
+        if start is not None:
+            start = BookingService.normalize_datetime(start)
+        if end is not None:
+            end = BookingService.normalize_datetime(end)
+        
+        start = max(start or now, now)
+        end = end or start + timedelta(days=AvailabilityService.DEFAULT_HORIZON_DAYS)
+        
+        if end <= start:
+            return None, "Window end must be after its start and in the future"
+        
+        if end - start > timedelta(days=AvailabilityService.MAX_HORIZON_DAYS):
+            return None, f"Window cannot exceed {AvailabilityService.MAX_HORIZON_DAYS} days"
+        
+        if min_duration_minutes < 1:
+            return None, "min_duration must be at least 1 minute"
+        
+        try:
+            free = AvailabilityService.find_free_slots(
+                [resource], start, end, timedelta(minutes=min_duration_minutes)
+            )[resource.id]
+        except (ValueError, AttributeError, TypeError) as e:
+            return None, f"Invalid availability rules: {str(e)}"
+        
+        return {
+            'resource_id': resource.id,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'min_duration': min_duration_minutes,
+            'count': len(free),
+            'free_slots': [
+                {
+                    'start': slot_start.isoformat(),
+                    'end': slot_end.isoformat(),
+                    'duration_minutes': int((slot_end - slot_start).total_seconds() // 60)
+                }
+                for slot_start, slot_end in free
+            ]
+        }, None
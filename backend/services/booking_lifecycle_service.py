@@ -0,0 +1,143 @@
+"""
+Booking Lifecycle Service
+Moves bookings past their time slot into terminal statuses.
+Approved bookings that have ended become 'completed'; pending bookings whose
+start time passed without a response become 'expired'.
+"""
+
+import os
+import threading
+import time
+from typing import Optional, Dict
+from datetime import datetime, timedelta
+from extensions import db
+from data_access.booking_repository import BookingRepository
+from models.booking import Booking
+from utils.logger import logger
+
+
+class BookingLifecycleService:
+    """
+    Service layer for the booking lifecycle sweep.
+    """
+
+    # Rows updated per statement
+    DEFAULT_BATCH_SIZE = 500
+
+    # Upper bound on batches per status in one sweep, so a single run stays short
+    DEFAULT_MAX_BATCHES = 20
+
+    @staticmethod
+    def sweep(now: Optional[datetime] = None, batch_size: Optional[int] = None,
+              max_batches: Optional[int] = None,
+              pending_grace_minutes: int = 0) -> Dict[str, int]:
+        """
+        Complete ended approved bookings and expire stale pending ones.
+
+        Args:
+            now: Reference time (defaults to current UTC time)
+            batch_size: Rows per UPDATE
+            max_batches: Maximum batches per status in this run
+            pending_grace_minutes: Pending bookings expire this long after their start
+
+        Returns:
+            Dict[str, int]: Counts of completed and expired bookings, batches run,
+            whether work remains, and elapsed milliseconds
+        """
+        now = now or datetime.utcnow()
+        batch_size = batch_size or BookingLifecycleService.DEFAULT_BATCH_SIZE
+        max_batches = max_batches or BookingLifecycleService.DEFAULT_MAX_BATCHES
+        started = time.monotonic()
+
+        transitions = (
+            ('completed', 'approved', Booking.end_datetime, now),
+            ('expired', 'pending', Booking.start_datetime, now - timedelta(minutes=pending_grace_minutes)),
+        )
+
+        result = {'completed': 0, 'expired': 0, 'batches': 0, 'remaining': 0}
+
+        for to_status, from_status, column, cutoff in transitions:
+            for _ in range(max_batches):
+                count = BookingRepository.transition_batch(
+                    from_status, to_status, column, cutoff, batch_size
+                )
+                result[to_status] += count
+                result['batches'] += 1
+                if count < batch_size:
+                    break
+            else:
+                # Batch budget exhausted; the next run picks up the rest
+                result['remaining'] = 1
+
+        result['duration_ms'] = int((time.monotonic() - started) * 1000)
+
+        logger.info(
+            f"Booking sweep: completed={result['completed']} expired={result['expired']} "
+            f"batches={result['batches']} remaining={result['remaining']} "
+            f"duration_ms={result['duration_ms']}"
+        )
+        return result
+
+
+class BookingSweeper(threading.Thread):
+    """
+    Daemon thread that runs the lifecycle sweep on a fixed interval.
+
+    Every worker process may run one; the guarded UPDATEs make concurrent
+    sweeps safe, but a single scheduler (or the CLI command from cron) is enough.
+    """
+
+    def __init__(self, app, interval_seconds: int = 300):
+        """
+        Initialize the sweeper.
+
+        Args:
+            app: Flask application to run the sweep in
+            interval_seconds: Seconds between sweeps
+        """
+        super().__init__(name='booking-sweeper', daemon=True)
+        self.app = app
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Run sweeps until stopped."""
+        while not self._stop_event.wait(self.interval_seconds):
+            with self.app.app_context():
+                try:
+                    BookingLifecycleService.sweep(
+                        batch_size=self.app.config.get('BOOKING_SWEEP_BATCH_SIZE'),
+                        pending_grace_minutes=self.app.config.get('BOOKING_PENDING_EXPIRY_MINUTES', 0)
+                    )
+                except Exception as e:
+                    logger.error(f"Booking sweep failed: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    def stop(self):
+        """Ask the thread to exit after the current sweep."""
+        self._stop_event.set()
+
+
+def init_booking_sweeper(app) -> Optional[BookingSweeper]:
+    """
+    Start the in-process sweeper if enabled in configuration.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        Optional[BookingSweeper]: The started sweeper, or None if disabled
+    """
+    if not app.config.get('BOOKING_SWEEPER_ENABLED') or app.testing:
+        return None
+
+    # With the debug reloader only the serving child process should sweep
+    if app.debug and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        return None
+
+    sweeper = BookingSweeper(app, interval_seconds=app.config.get('BOOKING_SWEEP_INTERVAL_SECONDS', 300))
+    sweeper.start()
+    app.extensions['booking_sweeper'] = sweeper
+    return sweeper
@@ -4,13 +4,18 @@ Business logic layer for booking management.
 Handles validation, conflict detection, and approval workflows.
 """
 
-from typing import Optional, Tuple, List, Dict, Any
+import heapq
+import uuid
+from typing import Optional, Sequence, Tuple, List, Dict, Any
 from datetime import datetime, timedelta, timezone
 from data_access.booking_repository import BookingRepository
 from data_access.resource_repository import ResourceRepository
+from data_access.load_options import serialize_flags
+from services.event_broker import publish_event
 from models.booking import Booking
 from models.resource import Resource
 from models.user import User
+from utils.pagination import build_pagination, decode_cursor
 
 
 class BookingService:
@@ -20,7 +25,7 @@ class BookingService:
     """
     
     # Valid booking statuses
-    VALID_STATUSES = {'pending', 'approved', 'rejected', 'cancelled', 'completed'}
+    VALID_STATUSES = {'pending', 'approved', 'rejected', 'cancelled', 'completed', 'expired'}
     
     # Minimum booking duration (in minutes)
     MIN_DURATION_MINUTES = 15
@@ -31,6 +36,20 @@ class BookingService:
     # Minimum advance booking time (in minutes)
     MIN_ADVANCE_MINUTES = 30
     
+    # Maximum number of windows in one batch availability check
+    MAX_BATCH_SIZE = 200
+    
+    # Recurring series limits
+    VALID_FREQUENCIES = {'daily', 'weekly'}
+    MAX_SERIES_OCCURRENCES = 100
+    
+    # Weekday names and RRULE codes accepted in by_day (Monday = 0)
+    WEEKDAY_CODES = {
+        'mo': 0, 'tu': 1, 'we': 2, 'th': 3, 'fr': 4, 'sa': 5, 'su': 6,
+        'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+        'friday': 4, 'saturday': 5, 'sunday': 6
+    }
+    
     @staticmethod
     def validate_datetime_range(start_datetime: datetime, end_datetime: datetime) -> Tuple[bool, Optional[str]]:
         """
@@ -68,6 +87,21 @@ class BookingService:
         
         return True, None
     
+    @staticmethod
+    def normalize_datetime(value: datetime) -> datetime:
+        """
+        Convert a datetime to naive UTC for consistent comparisons/storage.
+        
+        Args:
+            value: Naive (assumed UTC) or timezone-aware datetime
+        
+        Returns:
+            datetime: Naive UTC datetime
+        """
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    
     @staticmethod
     def create_booking(requester_id: int, resource_id: int,
                       start_datetime: datetime, end_datetime: datetime,
@@ -86,11 +120,9 @@ class BookingService:
             Tuple[Optional[Booking], Optional[str]]: (booking, error_message)
         """
         # Normalize datetimes to naive UTC for consistent comparisons/storage
-        if start_datetime.tzinfo is not None:
-            start_datetime = start_datetime.astimezone(timezone.utc).replace(tzinfo=None)
-        if end_datetime.tzinfo is not None:
-            end_datetime = end_datetime.astimezone(timezone.utc).replace(tzinfo=None)
-
+        start_datetime = BookingService.normalize_datetime(start_datetime)
+        end_datetime = BookingService.normalize_datetime(end_datetime)
+        
         # Check if resource exists
         resource = ResourceRepository.get_by_id(resource_id)
         if not resource:
@@ -105,79 +137,298 @@ class BookingService:
         if not is_valid:
             return None, error
         
-        # Check for conflicts
-        conflicts = BookingRepository.check_conflicts(
-            resource_id=resource_id,
-            start_datetime=start_datetime,
-            end_datetime=end_datetime
+        # Check for conflicts and insert while holding the resource lock,
+        # so concurrent requests cannot both pass the check
+        try:
+            with BookingRepository.lock_resource(resource_id):
+                conflicts = BookingRepository.check_conflicts(
+                    resource_id=resource_id,
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    use_index=False
+                )
+                
+                if conflicts:
+                    return None, "This time slot conflicts with an existing booking"
+                
+                booking = BookingRepository.create(
+                    resource_id=resource_id,
+                    requester_id=requester_id,
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    notes=notes
+                )
+            return booking, None
+        except Exception as e:
+            return None, f"Failed to create booking: {str(e)}"
+    
+    @staticmethod
+    def expand_recurrence(start_datetime: datetime, end_datetime: datetime,
+                          frequency: str, interval: int = 1,
+                          by_day: Optional[List[str]] = None,
+                          until: Optional[datetime] = None,
+                          count: Optional[int] = None) -> Tuple[Optional[List[Tuple[datetime, datetime]]], Optional[str]]:
+        """
+        Expand an RRULE-style recurrence into occurrence windows.
+        
+        Args:
+            start_datetime: Start of the first occurrence
+            end_datetime: End of the first occurrence
+            frequency: 'daily' or 'weekly'
+            interval: Repeat every N days/weeks
+            by_day: Weekdays for weekly series (e.g. ['MO', 'WE']); defaults to
+                the weekday of start_datetime
+            until: Last allowed occurrence start (inclusive)
+            count: Number of occurrences
+        
+        Returns:
+            Tuple[Optional[List[Tuple[datetime, datetime]]], Optional[str]]:
+            (occurrence windows ordered by start, error_message)
+        """
+        if frequency not in BookingService.VALID_FREQUENCIES:
+            return None, f"Invalid frequency. Must be one of: {', '.join(sorted(BookingService.VALID_FREQUENCIES))}"
+        
+        if not isinstance(interval, int) or interval < 1:
+            return None, "interval must be a positive integer"
+        
+        if until is None and count is None:
+            return None, "Either until or count is required"
+        
+        if count is not None and (not isinstance(count, int) or count < 1):
+            return None, "count must be a positive integer"
+        
+        if until is not None and until < start_datetime:
+            return None, "until must not be before start_datetime"
+        
+        if frequency == 'weekly':
+            try:
+                weekdays = sorted({
+                    BookingService.WEEKDAY_CODES[day.lower()] for day in by_day
+                }) if by_day else [start_datetime.weekday()]
+            except (KeyError, AttributeError):
+                return None, "by_day must contain weekday codes such as MO, WE or names such as monday"
+            
+            period_start = start_datetime - timedelta(days=start_datetime.weekday())
+            offsets = [timedelta(days=weekday) for weekday in weekdays]
+            step = timedelta(weeks=interval)
+        else:
+            period_start = start_datetime
+            offsets = [timedelta(0)]
+            step = timedelta(days=interval)
+        
+        duration = end_datetime - start_datetime
+        limit = BookingService.MAX_SERIES_OCCURRENCES
+        occurrences = []
+        
+        while True:
+            for offset in offsets:
+                occurrence_start = period_start + offset
+                if occurrence_start < start_datetime:
+                    continue
+                if until is not None and occurrence_start > until:
+                    return occurrences, None
+                if count is not None and len(occurrences) == count:
+                    return occurrences, None
+                if len(occurrences) == limit:
+                    return None, f"A series cannot have more than {limit} occurrences"
+                occurrences.append((occurrence_start, occurrence_start + duration))
+            period_start += step
+    
+    @staticmethod
+    def _find_series_conflicts(occurrences: List[Tuple[datetime, datetime]],
+                               busy: List[Tuple[int, datetime, datetime]]) -> List[List[int]]:
+        """
+        Match occurrences against existing bookings in one sweep.
+        
+        Both inputs are ordered by start. Bookings enter a min-heap keyed by end
+        time once they start before the current occurrence ends, and leave it
+        once they end before it starts, so whatever remains overlaps.
+        
+        Args:
+            occurrences: Equal-length (start, end) windows ordered by start
+            busy: Active (booking_id, start, end) tuples ordered by start
+        
+        Returns:
+            List[List[int]]: Conflicting booking IDs for each occurrence
+        """
+        conflicts = []
+        active = []
+        position = 0
+        
+        for occurrence_start, occurrence_end in occurrences:
+            while position < len(busy) and busy[position][1] < occurrence_end:
+                booking_id, _, booking_end = busy[position]
+                heapq.heappush(active, (booking_end, booking_id))
+                position += 1
+            
+            while active and active[0][0] <= occurrence_start:
+                heapq.heappop(active)
+            
+            conflicts.append(sorted(booking_id for _, booking_id in active))
+        
+        return conflicts
+    
+    @staticmethod
+    def create_booking_series(requester_id: int, resource_id: int,
+                              start_datetime: datetime, end_datetime: datetime,
+                              frequency: str, interval: int = 1,
+                              by_day: Optional[List[str]] = None,
+                              until: Optional[datetime] = None,
+                              count: Optional[int] = None,
+                              notes: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Create a recurring series of bookings.
+        
+        Occurrences that conflict with existing bookings are reported and
+        skipped; the remaining occurrences are inserted in one transaction.
+        
+        Args:
+            requester_id: ID of user making the bookings
+            resource_id: ID of resource to book
+            start_datetime: Start of the first occurrence
+            end_datetime: End of the first occurrence
+            frequency: 'daily' or 'weekly'
+            interval: Repeat every N days/weeks
+            by_day: Weekdays for weekly series
+            until: Last allowed occurrence start (inclusive)
+            count: Number of occurrences
+            notes: Optional notes for every occurrence
+        
+        Returns:
+            Tuple[Optional[Dict], Optional[str]]: (series result, error_message)
+        """
+        start_datetime = BookingService.normalize_datetime(start_datetime)
+        end_datetime = BookingService.normalize_datetime(end_datetime)
+        if until is not None:
+            until = BookingService.normalize_datetime(until)
+        
+        resource = ResourceRepository.get_by_id(resource_id)
+        if not resource:
+            return None, "Resource not found"
+        
+        if resource.status != 'published':
+            return None, "This resource is not available for booking"
+        
+        # Later occurrences share the first one's duration and start after it
+        is_valid, error = BookingService.validate_datetime_range(start_datetime, end_datetime)
+        if not is_valid:
+            return None, error
+        
+        occurrences, error = BookingService.expand_recurrence(
+            start_datetime, end_datetime, frequency, interval, by_day, until, count
         )
+        if error:
+            return None, error
         
-        if conflicts:
-            return None, "This time slot conflicts with an existing booking"
+        # by_day and until can rule out every start, e.g. a Wednesday rule ending on Tuesday
+        if not occurrences:
+            return None, "Recurrence produces no occurrences"
+        
+        for (_, previous_end), (next_start, _) in zip(occurrences, occurrences[1:]):
+            if next_start < previous_end:
+                return None, "Occurrences in a series cannot overlap each other"
         
-        # Create booking
         try:
-            booking = BookingRepository.create(
-                resource_id=resource_id,
-                requester_id=requester_id,
-                start_datetime=start_datetime,
-                end_datetime=end_datetime,
-                notes=notes
-            )
-            return booking, None
+            with BookingRepository.lock_resource(resource_id):
+                busy = BookingRepository.get_active_in_range(
+                    resource_id, occurrences[0][0], occurrences[-1][1]
+                )
+                conflicts = BookingService._find_series_conflicts(occurrences, busy)
+                
+                free = [
+                    window for window, conflict_ids in zip(occurrences, conflicts)
+                    if not conflict_ids
+                ]
+                series_id = str(uuid.uuid4()) if free else None
+                bookings = BookingRepository.create_many(
+                    resource_id=resource_id,
+                    requester_id=requester_id,
+                    windows=free,
+                    notes=notes,
+                    series_id=series_id
+                ) if free else []
+                booking_dicts = [booking.to_dict() for booking in bookings]
         except Exception as e:
-            return None, f"Failed to create booking: {str(e)}"
+            return None, f"Failed to create booking series: {str(e)}"
+        
+        return {
+            'series_id': series_id,
+            'requested': len(occurrences),
+            'created': len(booking_dicts),
+            'bookings': booking_dicts,
+            'conflicts': [
+                {
+                    'start_datetime': occurrence_start.isoformat(),
+                    'end_datetime': occurrence_end.isoformat(),
+                    'conflicting_booking_ids': conflict_ids
+                }
+                for (occurrence_start, occurrence_end), conflict_ids in zip(occurrences, conflicts)
+                if conflict_ids
+            ]
+        }, None
     
     @staticmethod
     def get_booking(booking_id: int) -> Optional[Booking]:
         """
         Get a booking by ID.
         
+        The resource is loaded with the booking since the permission
+        helpers read its owner.
+        
         Args:
             booking_id: Booking ID
         
         Returns:
             Optional[Booking]: Booking object or None
         """
-        return BookingRepository.get_by_id(booking_id)
+        return BookingRepository.get_by_id(booking_id, include=('resource',))
     
     @staticmethod
     def list_user_bookings(user_id: int, status: Optional[str] = None,
-                          page: int = 1, per_page: int = 20) -> Dict[str, Any]:
+                          page: int = 1, per_page: int = 20,
+                          cursor: Optional[str] = None,
+                          include_total: bool = True,
+                          expand: Sequence[str] = ()) -> Dict[str, Any]:
         """
         List bookings for a user with pagination.
         
+        Pages are addressed either by number (offset) or by the opaque
+        ``next_cursor`` returned with the previous page (keyset).
+        
         Args:
             user_id: User ID
             status: Optional status filter
-            page: Page number
+            page: Page number (ignored when a cursor is given)
             per_page: Items per page
+            cursor: Cursor from a previous page's ``next_cursor``
+            include_total: Whether to run the COUNT query for totals
+            expand: Related objects to embed ('resource', 'requester')
         
         Returns:
             Dict containing bookings and pagination info
+        
+        Raises:
+            ValueError: If the cursor is malformed or an expand name is unknown
         """
-        offset = (page - 1) * per_page
+        after = decode_cursor(cursor) if cursor else None
         
         bookings = BookingRepository.get_all(
             requester_id=user_id,
             status=status,
-            limit=per_page,
-            offset=offset
+            limit=per_page + 1,
+            offset=0 if after else (page - 1) * per_page,
+            after=after,
+            include=expand
         )
         
-        total = BookingRepository.count(requester_id=user_id, status=status)
-        total_pages = (total + per_page - 1) // per_page
+        total = BookingRepository.count(requester_id=user_id, status=status) if include_total else None
+        bookings, pagination = build_pagination(
+            bookings, per_page, 'start_datetime', page=page, cursor=cursor, total=total
+        )
         
         return {
-            'bookings': [b.to_dict() for b in bookings],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
-            }
+            'bookings': [b.to_dict(**serialize_flags(expand)) for b in bookings],
+            'pagination': pagination
         }
     
     @staticmethod
@@ -194,7 +445,7 @@ class BookingService:
         Returns:
             Tuple[Optional[Booking], Optional[str]]: (booking, error_message)
         """
-        booking = BookingRepository.get_by_id(booking_id)
+        booking = BookingRepository.get_by_id(booking_id, include=('resource',))
         if not booking:
             return None, "Booking not found"
         
@@ -207,23 +458,26 @@ class BookingService:
         if not (resource.owner_id == approver.id or approver.is_staff() or approver.is_admin()):
             return None, "You don't have permission to approve this booking"
         
-        # Check for conflicts again (in case status changed)
-        conflicts = BookingRepository.check_conflicts(
-            resource_id=booking.resource_id,
-            start_datetime=booking.start_datetime,
-            end_datetime=booking.end_datetime,
-            exclude_booking_id=booking.id
-        )
-        
-        if conflicts:
-            return None, "This booking now conflicts with an approved booking"
-        
         try:
-            approved_booking = BookingRepository.approve(
-                booking=booking,
-                approver_id=approver.id,
-                approval_notes=approval_notes
-            )
+            with BookingRepository.lock_resource(booking.resource_id):
+                # Check for conflicts again (in case status changed)
+                conflicts = BookingRepository.check_conflicts(
+                    resource_id=booking.resource_id,
+                    start_datetime=booking.start_datetime,
+                    end_datetime=booking.end_datetime,
+                    exclude_booking_id=booking.id,
+                    use_index=False
+                )
+                
+                if conflicts:
+                    return None, "This booking now conflicts with an approved booking"
+                
+                approved_booking = BookingRepository.approve(
+                    booking=booking,
+                    approver_id=approver.id,
+                    approval_notes=approval_notes
+                )
+            BookingService._publish_status(approved_booking, approver.id, resource.owner_id)
             return approved_booking, None
         except Exception as e:
             return None, f"Failed to approve booking: {str(e)}"
@@ -242,7 +496,7 @@ class BookingService:
         Returns:
             Tuple[Optional[Booking], Optional[str]]: (booking, error_message)
         """
-        booking = BookingRepository.get_by_id(booking_id)
+        booking = BookingRepository.get_by_id(booking_id, include=('resource',))
         if not booking:
             return None, "Booking not found"
         
@@ -264,10 +518,146 @@ class BookingService:
                 approver_id=approver.id,
                 rejection_reason=rejection_reason.strip()
             )
+            BookingService._publish_status(rejected_booking, approver.id, resource.owner_id)
             return rejected_booking, None
         except Exception as e:
             return None, f"Failed to reject booking: {str(e)}"
     
+    @staticmethod
+    def bulk_respond(approver: User,
+                     decisions: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Approve or reject many pending bookings at once.
+        
+        Permissions, statuses and conflicts are validated in memory: approvals
+        are checked against existing bookings with one query and against each
+        other in request order, so of two overlapping approvals only the first
+        succeeds. All transitions are then applied in a single transaction.
+        
+        Args:
+            approver: User responding to the bookings
+            decisions: List of {"booking_id", "action", "notes"} dictionaries
+        
+        Returns:
+            Tuple[Optional[Dict], Optional[str]]: (per-booking results, error_message)
+        """
+        if not decisions:
+            return None, "At least one decision is required"
+        
+        if len(decisions) > BookingService.MAX_BATCH_SIZE:
+            return None, f"Cannot respond to more than {BookingService.MAX_BATCH_SIZE} bookings at once"
+        
+        booking_ids = []
+        for decision in decisions:
+            if not isinstance(decision, dict) or not isinstance(decision.get('booking_id'), int):
+                return None, "Each decision requires an integer booking_id"
+            if decision.get('action') not in ('approve', 'reject'):
+                return None, 'Each decision action must be "approve" or "reject"'
+            booking_ids.append(decision['booking_id'])
+        
+        if len(set(booking_ids)) != len(booking_ids):
+            return None, "Each booking may only appear once"
+        
+        bookings = {booking.id: booking for booking in BookingRepository.get_by_ids(booking_ids)}
+        
+        errors = {}
+        approving = []
+        rejecting = {}
+        for decision in decisions:
+            booking_id = decision['booking_id']
+            booking = bookings.get(booking_id)
+            notes = decision.get('notes')
+            if isinstance(notes, str):
+                notes = notes.strip() or None
+            
+            if not booking:
+                errors[booking_id] = "Booking not found"
+            elif booking.status != 'pending':
+                errors[booking_id] = f"Cannot {decision['action']} booking with status: {booking.status}"
+            elif not (booking.resource.owner_id == approver.id or approver.is_staff() or approver.is_admin()):
+                errors[booking_id] = f"You don't have permission to {decision['action']} this booking"
+            elif notes is not None and not isinstance(notes, str):
+                # Notes also group the updates, so they must be hashable text
+                errors[booking_id] = "Notes must be a string"
+            elif decision['action'] == 'reject':
+                if not notes:
+                    errors[booking_id] = "Rejection reason is required"
+                else:
+                    rejecting[booking_id] = notes
+            else:
+                approving.append((booking, notes))
+        
+        resource_ids = {booking.resource_id for booking, _ in approving}
+        
+        try:
+            with BookingRepository.lock_resources(resource_ids):
+                conflicts = BookingRepository.check_conflicts_batch([
+                    (booking.resource_id, booking.start_datetime, booking.end_datetime)
+                    for booking, _ in approving
+                ])
+                
+                # Bookings decided in this request no longer block outside them
+                decided = set(rejecting) | {booking.id for booking, _ in approving}
+                accepted = set()
+                approvals = {}
+                
+                for (booking, notes), conflict_ids in zip(approving, conflicts):
+                    blockers = set(conflict_ids) - {booking.id}
+                    if (blockers - decided) or (blockers & accepted):
+                        errors[booking.id] = "This booking now conflicts with an approved booking"
+                        continue
+                    accepted.add(booking.id)
+                    approvals.setdefault(notes, []).append(booking.id)
+                
+                rejections = {}
+                for booking_id, reason in rejecting.items():
+                    rejections.setdefault(reason, []).append(booking_id)
+                
+                responded = {
+                    booking.id: booking
+                    for booking in BookingRepository.bulk_respond(approver.id, approvals, rejections)
+                }
+                updated = {booking_id: booking.to_dict() for booking_id, booking in responded.items()}
+        except Exception as e:
+            return None, f"Failed to respond to bookings: {str(e)}"
+        
+        expected = {booking_id: 'approved' for booking_id in accepted}
+        expected.update({booking_id: 'rejected' for booking_id in rejecting})
+        
+        results = []
+        for decision in decisions:
+            booking_id = decision['booking_id']
+            booking_data = updated.get(booking_id)
+            
+            if booking_id not in errors and booking_data and booking_data['status'] != expected[booking_id]:
+                # Changed by another request between validation and update
+                errors[booking_id] = f"Cannot {decision['action']} booking with status: {booking_data['status']}"
+            
+            if booking_id in errors:
+                results.append({
+                    'booking_id': booking_id,
+                    'action': decision['action'],
+                    'success': False,
+                    'error': errors[booking_id]
+                })
+            else:
+                results.append({
+                    'booking_id': booking_id,
+                    'action': decision['action'],
+                    'success': True,
+                    'booking': booking_data
+                })
+                BookingService._publish_status(
+                    responded[booking_id], approver.id, bookings[booking_id].resource.owner_id
+                )
+        
+        return {
+            'processed': len(decisions),
+            'succeeded': len(decisions) - len(errors),
+            'failed': len(errors),
+            'results': results
+        }, None
+    
     @staticmethod
     def cancel_booking(booking_id: int, user: User,
                       cancellation_reason: Optional[str] = None) -> Tuple[Optional[Booking], Optional[str]]:
@@ -282,7 +672,7 @@ class BookingService:
         Returns:
             Tuple[Optional[Booking], Optional[str]]: (booking, error_message)
         """
-        booking = BookingRepository.get_by_id(booking_id)
+        booking = BookingRepository.get_by_id(booking_id, include=('resource',))
         if not booking:
             return None, "Booking not found"
         
@@ -300,10 +690,27 @@ class BookingService:
                 booking=booking,
                 cancellation_reason=cancellation_reason
             )
+            BookingService._publish_status(cancelled_booking, user.id, resource.owner_id)
             return cancelled_booking, None
         except Exception as e:
             return None, f"Failed to cancel booking: {str(e)}"
     
+    @staticmethod
+    def _publish_status(booking: Booking, actor_id: int, owner_id: Optional[int]) -> None:
+        """
+        Push a booking's new status to the requester and resource owner.
+        
+        Args:
+            booking: Booking after its status change was committed
+            actor_id: User who made the change (not notified)
+            owner_id: Resource owner ID
+        """
+        publish_event(
+            {booking.requester_id, owner_id} - {actor_id, None},
+            f'booking.{booking.status}',
+            booking.to_dict()
+        )
+    
     @staticmethod
     def check_availability(resource_id: int, start_datetime: datetime,
                           end_datetime: datetime) -> Tuple[bool, Optional[str]]:
@@ -318,6 +725,9 @@ class BookingService:
         Returns:
             Tuple[bool, Optional[str]]: (is_available, message)
         """
+        start_datetime = BookingService.normalize_datetime(start_datetime)
+        end_datetime = BookingService.normalize_datetime(end_datetime)
+        
         # Validate datetime range
         is_valid, error = BookingService.validate_datetime_range(start_datetime, end_datetime)
         if not is_valid:
@@ -335,6 +745,66 @@ class BookingService:
         
         return True, "Time slot is available"
     
+    @staticmethod
+    def get_bookable_resource_ids(category: Optional[str] = None,
+                                  location: Optional[str] = None) -> List[int]:
+        """
+        Get IDs of published resources for a batch availability check.
+        
+        Args:
+            category: Optional category filter
+            location: Optional location filter (partial match)
+        
+        Returns:
+            List[int]: At most MAX_BATCH_SIZE resource IDs
+        """
+        return ResourceRepository.get_ids(
+            status='published',
+            category=category,
+            location=location,
+            limit=BookingService.MAX_BATCH_SIZE
+        )
+    
+    @staticmethod
+    def check_availability_batch(slots: List[Tuple[int, datetime, datetime]]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Check availability for many (resource_id, start, end) slots at once.
+        
+        Each slot is validated like check_availability; the valid ones are then
+        resolved together with a single conflict query.
+        
+        Args:
+            slots: List of (resource_id, start_datetime, end_datetime) tuples
+        
+        Returns:
+            List[Tuple[bool, Optional[str]]]: (is_available, message) per slot, in input order
+        """
+        results: List[Tuple[bool, Optional[str]]] = [(False, None)] * len(slots)
+        positions = []
+        windows = []
+        
+        for position, (resource_id, start_datetime, end_datetime) in enumerate(slots):
+            start_datetime = BookingService.normalize_datetime(start_datetime)
+            end_datetime = BookingService.normalize_datetime(end_datetime)
+            
+            is_valid, error = BookingService.validate_datetime_range(start_datetime, end_datetime)
+            if not is_valid:
+                results[position] = (False, error)
+                continue
+            
+            positions.append(position)
+            windows.append((resource_id, start_datetime, end_datetime))
+        
+        conflicts = BookingRepository.check_conflicts_batch(windows)
+        
+        for position, conflict_ids in zip(positions, conflicts):
+            if conflict_ids:
+                results[position] = (False, f"Time slot conflicts with {len(conflict_ids)} existing booking(s)")
+            else:
+                results[position] = (True, "Time slot is available")
+        
+        return results
+    
     @staticmethod
     def get_resource_bookings(resource_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -351,24 +821,28 @@ class BookingService:
         return [b.to_dict() for b in bookings]
     
     @staticmethod
-    def get_pending_approvals(user: User) -> List[Dict[str, Any]]:
+    def get_pending_approvals(user: User, expand: Sequence[str] = ()) -> List[Dict[str, Any]]:
         """
         Get pending bookings that need approval by user.
         
         Args:
             user: User object
+            expand: Related objects to embed ('resource', 'requester')
         
         Returns:
             List of booking dictionaries
+        
+        Raises:
+            ValueError: If an expand name is unknown
         """
         if user.is_admin():
             # Admins can see all pending bookings
-            bookings = BookingRepository.get_all(status='pending')
+            bookings = BookingRepository.get_all(status='pending', include=expand)
         else:
             # Resource owners see their own resources' bookings
-            bookings = BookingRepository.get_pending_for_resource_owner(user.id)
+            bookings = BookingRepository.get_pending_for_resource_owner(user.id, include=expand)
         
-        return [b.to_dict() for b in bookings]
+        return [b.to_dict(**serialize_flags(expand)) for b in bookings]
     
     @staticmethod
     def get_upcoming_bookings(user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
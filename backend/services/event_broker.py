@@ -0,0 +1,486 @@
+"""
+Event Broker
+In-process publish/subscribe for the server-sent events stream.
+
+Services publish small events (new message, read receipt, booking decision)
+to user IDs after their write commits; the broker hands them to every stream
+that user has open in this process. How an event gets from the publishing
+process to the others is up to a pluggable fan-out backend:
+
+- ``LocalEventBackend`` delivers straight to this process and keeps a short
+  per-user replay buffer for ``Last-Event-ID`` resume.
+- ``DatabaseEventBackend`` writes events to the ``stream_events`` table and
+  runs one poller thread per process that tails it, so every worker sees
+  every event and resume survives reconnecting to a different worker.
+  Event IDs can commit out of order when several workers write at once
+  (PostgreSQL), so the poller re-checks IDs it skipped for a grace period.
+
+Any class with the same ``publish``/``replay``/``start`` methods can be
+configured by import path (``EVENT_BACKEND``).
+"""
+
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Set
+from flask import current_app
+from werkzeug.utils import import_string
+from extensions import db
+from utils.logger import logger
+
+
+class Event(NamedTuple):
+    """One event addressed to one user."""
+
+    id: int
+    user_id: int
+    type: str
+    data: Dict[str, Any]
+
+    def encode(self) -> str:
+        """
+        Format the event as a server-sent events message.
+
+        Returns:
+            str: ``id``/``event``/``data`` fields terminated by a blank line
+        """
+        return f'id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n'
+
+
+class Subscription:
+    """
+    Queue of events for one open stream.
+
+    The queue is bounded: a client that stops reading is marked as
+    overflowed instead of letting its backlog grow without limit.
+    """
+
+    def __init__(self, user_id: int, max_pending: int = 256):
+        """
+        Initialize an empty subscription.
+
+        Args:
+            user_id: Subscribed user
+            max_pending: Events held before the subscription overflows
+        """
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue: 'queue.Queue[Event]' = queue.Queue(maxsize=max_pending)
+
+    def push(self, event: Event) -> None:
+        """
+        Queue an event without blocking the publisher.
+
+        Args:
+            event: Event to deliver
+        """
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[Event]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Optional[Event]: Next event, or None if none arrived in time
+        """
+        try:
+            return self._queue.get(timeout=max(timeout, 0))
+        except queue.Empty:
+            return None
+
+
+class EventBroker:
+    """
+    Routes events to the open streams of this process.
+    """
+
+    def __init__(self, backend_class=None, replay_size: int = 100, **backend_options):
+        """
+        Initialize the broker and its fan-out backend.
+
+        Args:
+            backend_class: Fan-out backend class (default: ``LocalEventBackend``)
+            replay_size: Events per user available for resume
+            **backend_options: Extra keyword arguments for the backend
+        """
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        backend_class = backend_class or LocalEventBackend
+        self.backend = backend_class(self, replay_size=replay_size, **backend_options)
+
+    def publish(self, user_ids: Iterable[int], event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Publish an event to users.
+
+        Call after the write the event describes has committed. Failures are
+        logged rather than raised: a missed push only delays the client until
+        its next resync, while raising would fail a write that succeeded.
+
+        Args:
+            user_ids: Recipients
+            event_type: Event name (e.g. 'message.created')
+            data: JSON-serializable payload
+        """
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return
+
+        try:
+            self.backend.publish(user_ids, event_type, data)
+        except Exception as e:
+            logger.error(f"Publishing {event_type} event failed: {str(e)}")
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """
+        Open a subscription for a user's events.
+
+        Args:
+            user_id: Subscribing user
+
+        Returns:
+            Subscription: Queue receiving the user's events from now on
+        """
+        self.backend.start()
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Close a subscription.
+
+        Args:
+            subscription: Subscription returned by ``subscribe``
+        """
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def replay(self, user_id: int, after_id: int) -> Optional[List[Event]]:
+        """
+        Get a user's events published after an event ID.
+
+        Args:
+            user_id: User ID
+            after_id: Last event ID the client received
+
+        Returns:
+            Optional[List[Event]]: Missed events in order, or None if some of
+            them are no longer available and the client has to resync
+        """
+        return self.backend.replay(user_id, after_id)
+
+    def deliver(self, event: Event) -> None:
+        """
+        Hand an event to the recipient's open streams in this process.
+
+        Called by the fan-out backend.
+
+        Args:
+            event: Event to deliver
+        """
+        with self._lock:
+            subscriptions = list(self._subscribers.get(event.user_id, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def subscriber_count(self) -> int:
+        """
+        Count open streams in this process.
+
+        Returns:
+            int: Number of subscriptions
+        """
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+
+class LocalEventBackend:
+    """
+    Fan-out within the publishing process only.
+
+    Event IDs continue from the wall clock at startup, so IDs from a restarted
+    process stay above those handed out before it and resume can tell that
+    events published before the restart are gone.
+    """
+
+    def __init__(self, broker: EventBroker, replay_size: int = 100):
+        """
+        Initialize the backend.
+
+        Args:
+            broker: Broker to deliver to
+            replay_size: Events kept per user for resume
+        """
+        self.broker = broker
+        self.replay_size = replay_size
+        self._lock = threading.Lock()
+        self._first_id = int(time.time() * 1000)
+        self._ids = itertools.count(self._first_id)
+        self._recent: Dict[int, Deque[Event]] = {}
+        # Highest event ID evicted from each user's replay buffer
+        self._evicted_through: Dict[int, int] = {}
+
+    def start(self) -> None:
+        """Nothing to start; delivery happens in ``publish``."""
+
+    def publish(self, user_ids: List[int], event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Assign IDs, buffer the events for resume and deliver them.
+
+        Args:
+            user_ids: Recipients
+            event_type: Event name
+            data: Payload
+        """
+        events = []
+        with self._lock:
+            for user_id in user_ids:
+                event = Event(next(self._ids), user_id, event_type, data)
+                recent = self._recent.setdefault(user_id, deque())
+                if len(recent) >= self.replay_size:
+                    self._evicted_through[user_id] = recent.popleft().id
+                recent.append(event)
+                events.append(event)
+
+        for event in events:
+            self.broker.deliver(event)
+
+    def replay(self, user_id: int, after_id: int) -> Optional[List[Event]]:
+        """
+        Get buffered events after an ID.
+
+        Args:
+            user_id: User ID
+            after_id: Last event ID the client received
+
+        Returns:
+            Optional[List[Event]]: Missed events, or None if the gap predates
+            this process or the buffer
+        """
+        with self._lock:
+            if after_id < self._first_id - 1 or after_id < self._evicted_through.get(user_id, 0):
+                return None
+            return [event for event in self._recent.get(user_id, ()) if event.id > after_id]
+
+
+class DatabaseEventBackend:
+    """
+    Fan-out through the ``stream_events`` table.
+
+    Publishing inserts one row per recipient; each process polls the table
+    from a single daemon thread (started with the first stream it serves)
+    and delivers new rows locally. Database load is one indexed query per
+    poll interval per process, however many clients are connected.
+    """
+
+    # Rows fetched per poll
+    BATCH_SIZE = 500
+
+    # Skipped IDs remembered at most (the most recent are kept)
+    MAX_GAPS = 10000
+
+    def __init__(self, broker: EventBroker, replay_size: int = 100, app=None,
+                 poll_interval: float = 1.0, retention_minutes: int = 60,
+                 gap_grace_seconds: float = 10.0):
+        """
+        Initialize the backend.
+
+        Args:
+            broker: Broker to deliver to
+            replay_size: Events returned at most on resume
+            app: Flask application the poller runs in
+            poll_interval: Seconds between polls
+            retention_minutes: Age after which events are pruned
+            gap_grace_seconds: How long a skipped ID is re-checked before it
+                is taken for a rolled-back insert
+        """
+        self.broker = broker
+        self.replay_size = replay_size
+        self.app = app
+        self.poll_interval = poll_interval
+        self.retention_minutes = retention_minutes
+        self.gap_grace_seconds = gap_grace_seconds
+        self._lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def publish(self, user_ids: List[int], event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Store the events; pollers in every process deliver them.
+
+        Args:
+            user_ids: Recipients
+            event_type: Event name
+            data: Payload
+        """
+        from data_access.event_repository import EventRepository
+        EventRepository.append(user_ids, event_type, data)
+
+    def replay(self, user_id: int, after_id: int) -> Optional[List[Event]]:
+        """
+        Read stored events after an ID.
+
+        Args:
+            user_id: User ID
+            after_id: Last event ID the client received
+
+        Returns:
+            Optional[List[Event]]: Missed events, or None if more were missed
+            than ``replay_size`` or some were already pruned
+        """
+        from data_access.event_repository import EventRepository
+
+        oldest_id, _ = EventRepository.get_id_range()
+        if oldest_id is not None and after_id < oldest_id - 1:
+            return None
+
+        rows = EventRepository.get_after(after_id, user_id=user_id, limit=self.replay_size + 1)
+        if len(rows) > self.replay_size:
+            return None
+        return [Event(row.id, row.user_id, row.event_type, row.payload) for row in rows]
+
+    def start(self) -> None:
+        """Start this process's poller thread if it is not running yet."""
+        from data_access.event_repository import EventRepository
+
+        with self._lock:
+            if self._poller is not None:
+                return
+            # Read the starting point here, before the first subscriber is
+            # registered, so nothing published after subscribing is skipped
+            _, last_id = EventRepository.get_id_range()
+            self._poller = threading.Thread(
+                target=self._run, args=(last_id or 0,), name='event-poller', daemon=True
+            )
+            self._poller.start()
+
+    def stop(self) -> None:
+        """Ask the poller thread to exit."""
+        self._stop_event.set()
+
+    def _run(self, last_id: int) -> None:
+        """
+        Poll for new events until stopped.
+
+        Args:
+            last_id: Highest event ID already delivered (or predating the poller)
+        """
+        from data_access.event_repository import EventRepository
+
+        last_prune = 0.0
+        gaps: Dict[int, float] = {}
+
+        while not self._stop_event.wait(self.poll_interval):
+            with self.app.app_context():
+                try:
+                    last_id = self._poll(last_id, gaps)
+
+                    if time.monotonic() - last_prune >= 60:
+                        EventRepository.prune(datetime.utcnow() - timedelta(minutes=self.retention_minutes))
+                        last_prune = time.monotonic()
+                except Exception as e:
+                    logger.error(f"Event poll failed: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    def _poll(self, last_id: int, gaps: Dict[int, float]) -> int:
+        """
+        Deliver new events, and skipped ones that have since committed.
+
+        An ID is assigned when an insert runs but only becomes visible when
+        its transaction commits, so with concurrent writers a lower ID can
+        show up after a higher one was delivered. IDs passed over are kept
+        in ``gaps`` and looked up again on every poll until
+        ``gap_grace_seconds`` have passed, after which they are assumed to
+        belong to rolled-back inserts.
+
+        Args:
+            last_id: Highest event ID delivered so far
+            gaps: Skipped IDs below ``last_id``, mapped to when they were first
+                missed (updated in place)
+
+        Returns:
+            int: New highest delivered event ID
+        """
+        from data_access.event_repository import EventRepository
+
+        now = time.monotonic()
+
+        if gaps:
+            for row in EventRepository.get_by_ids(gaps):
+                self.broker.deliver(Event(row.id, row.user_id, row.event_type, row.payload))
+                del gaps[row.id]
+            for event_id, missed_at in list(gaps.items()):
+                if now - missed_at >= self.gap_grace_seconds:
+                    del gaps[event_id]
+
+        for row in EventRepository.get_after(last_id, limit=self.BATCH_SIZE):
+            for event_id in range(max(last_id + 1, row.id - self.MAX_GAPS), row.id):
+                gaps[event_id] = now
+            self.broker.deliver(Event(row.id, row.user_id, row.event_type, row.payload))
+            last_id = row.id
+
+        if len(gaps) > self.MAX_GAPS:
+            for event_id in sorted(gaps)[:len(gaps) - self.MAX_GAPS]:
+                del gaps[event_id]
+
+        return last_id
+
+
+BACKENDS = {
+    'local': LocalEventBackend,
+    'database': DatabaseEventBackend,
+}
+
+
+def get_event_broker() -> EventBroker:
+    """
+    Get the event broker for the current application.
+
+    Returns:
+        EventBroker: The broker
+    """
+    broker = current_app.extensions.get('event_broker')
+    if broker is None:
+        config = current_app.config
+        name = config.get('EVENT_BACKEND', 'local')
+        backend_class = BACKENDS.get(name) or import_string(name)
+        options = {}
+        if backend_class is not LocalEventBackend:
+            options = {
+                'app': current_app._get_current_object(),
+                'poll_interval': config.get('EVENT_POLL_INTERVAL_SECONDS', 1.0),
+                'retention_minutes': config.get('EVENT_RETENTION_MINUTES', 60),
+                'gap_grace_seconds': config.get('EVENT_GAP_GRACE_SECONDS', 10.0),
+            }
+        broker = EventBroker(backend_class, replay_size=config.get('EVENT_REPLAY_SIZE', 100), **options)
+        current_app.extensions['event_broker'] = broker
+    return broker
+
+
+def publish_event(user_ids: Iterable[int], event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Publish an event through the current application's broker.
+
+    Args:
+        user_ids: Recipients
+        event_type: Event name
+        data: JSON-serializable payload
+    """
+    get_event_broker().publish(user_ids, event_type, data)
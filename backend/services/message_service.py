@@ -4,11 +4,21 @@ Business logic layer for messaging system.
 Handles validation and thread management.
 """
 
-from typing import Optional, Tuple, List, Dict, Any
+from datetime import datetime
+from typing import Optional, Sequence, Tuple, List, Dict, Any
+from data_access.broadcast_repository import BroadcastRepository
 from data_access.message_repository import MessageRepository
 from data_access.user_repository import UserRepository
+from data_access.load_options import serialize_flags
+from data_access.message_search import highlight
+from data_access.resource_search import tokenize
+from data_access.unread_counter import get_unread_counter
+from services.auth_service import AuthService
+from services.event_broker import publish_event
+from models.broadcast import Broadcast
 from models.message import Message
 from models.user import User
+from utils.pagination import Cursor, build_pagination, decode_cursor
 
 
 class MessageService:
@@ -58,6 +68,10 @@ class MessageService:
         if not sender:
             return None, "Sender not found"
         
+        # The announcements thread only holds broadcasts
+        if thread_id == Broadcast.THREAD_ID:
+            return None, "Cannot reply to announcements"
+        
         # Cannot send message to self
         if sender_id == receiver_id:
             return None, "Cannot send message to yourself"
@@ -80,15 +94,67 @@ class MessageService:
                 booking_id=booking_id,
                 resource_id=resource_id
             )
-            return message, None
         except Exception as e:
             return None, f"Failed to send message: {str(e)}"
+        
+        publish_event([receiver_id], 'message.created', message.to_dict())
+        return message, None
+    
+    @staticmethod
+    def send_broadcast(sender_id: int, content: str,
+                      audience_role: Optional[str] = None) -> Tuple[Optional[Broadcast], Optional[str]]:
+        """
+        Send an announcement to every user, or every user with a role.
+        
+        The broadcast is stored once; recipients see it in their
+        announcements thread and read state is recorded per user only when
+        they read it, so the cost of sending doesn't grow with the audience.
+        
+        Args:
+            sender_id: ID of sending admin
+            content: Broadcast content
+            audience_role: Role to address ('student', 'staff', 'admin'), or None for everyone
+        
+        Returns:
+            Tuple[Optional[Broadcast], Optional[str]]: (broadcast, error_message)
+        """
+        if not content or not content.strip():
+            return None, "Message content is required"
+        
+        content = content.strip()
+        
+        if len(content) > MessageService.MAX_CONTENT_LENGTH:
+            return None, f"Message cannot exceed {MessageService.MAX_CONTENT_LENGTH} characters"
+        
+        if audience_role is not None and audience_role not in AuthService.VALID_ROLES:
+            return None, f"Invalid audience role. Must be one of: {', '.join(sorted(AuthService.VALID_ROLES))}"
+        
+        sender = UserRepository.get_by_id(sender_id)
+        if not sender:
+            return None, "Sender not found"
+        
+        if not sender.is_admin():
+            return None, "Only admins can send broadcasts"
+        
+        try:
+            broadcast = BroadcastRepository.create(
+                sender_id=sender_id,
+                content=content,
+                audience_role=audience_role
+            )
+        except Exception as e:
+            return None, f"Failed to send broadcast: {str(e)}"
+        
+        return broadcast, None
     
     @staticmethod
     def get_user_threads(user_id: int, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
         """
         Get all message threads for a user with pagination.
         
+        The user's broadcasts appear as one ``announcements`` thread, placed
+        by its latest broadcast among the threads ordered newest first.
+        
         Args:
             user_id: User ID
             page: Page number
@@ -98,67 +164,136 @@ class MessageService:
             Dict containing threads and pagination info
         """
         offset = (page - 1) * per_page
+        thread_offset = offset
+        announcements = BroadcastRepository.get_thread_summary(user_id)
+        
+        if announcements:
+            # Position of the announcements thread in the merged listing
+            position = MessageRepository.count_user_threads(
+                user_id, newer_than=announcements['latest_timestamp']
+            )
+            # On later pages, the announcements thread takes one slot of the offset
+            if position < offset:
+                thread_offset -= 1
         
         threads = MessageRepository.get_user_threads(
             user_id=user_id,
-            limit=per_page,
-            offset=offset
+            limit=per_page + 1,
+            offset=thread_offset
         )
+        total = MessageRepository.count_user_threads(user_id)
         
-        # For pagination, we'd need a count of total threads
-        # For now, we'll indicate if there might be more
-        has_next = len(threads) == per_page
+        if announcements:
+            if offset <= position <= offset + per_page:
+                threads.insert(position - offset, announcements)
+            total += 1
         
         return {
-            'threads': threads,
+            'threads': threads[:per_page],
             'pagination': {
                 'page': page,
                 'per_page': per_page,
-                'has_next': has_next,
+                'total': total,
+                'total_pages': (total + per_page - 1) // per_page,
+                'has_next': len(threads) > per_page,
                 'has_prev': page > 1
             }
         }
     
     @staticmethod
     def get_thread_messages(thread_id: str, user_id: int,
-                           page: int = 1, per_page: int = 50) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+                           page: int = 1, per_page: int = 50,
+                           cursor: Optional[str] = None,
+                           include_total: bool = True,
+                           expand: Sequence[str] = ()) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Get all messages in a thread with pagination.
         
         Args:
             thread_id: Thread ID
             user_id: User ID
-            page: Page number
+            page: Page number (ignored when a cursor is given)
             per_page: Items per page
+            cursor: Cursor from a previous page's ``next_cursor``
+            include_total: Whether to run the COUNT query for totals
+            expand: Related objects to embed ('sender', 'receiver')
         
         Returns:
             Tuple[Optional[Dict], Optional[str]]: (result, error_message)
+        
+        Raises:
+            ValueError: If the cursor is malformed or an expand name is unknown
         """
-        offset = (page - 1) * per_page
+        after = decode_cursor(cursor) if cursor else None
+        
+        if thread_id == Broadcast.THREAD_ID:
+            return MessageService._get_broadcast_messages(
+                user_id, page=page, per_page=per_page, after=after,
+                cursor=cursor, include_total=include_total
+            )
         
         messages = MessageRepository.get_thread_messages(
             thread_id=thread_id,
             user_id=user_id,
-            limit=per_page,
-            offset=offset
+            limit=per_page + 1,
+            offset=0 if after else (page - 1) * per_page,
+            after=after,
+            include=expand
         )
         
-        if not messages and page == 1:
+        if not messages and page == 1 and not after:
             return None, "Thread not found or access denied"
         
-        total = MessageRepository.count_thread_messages(thread_id, user_id)
-        total_pages = (total + per_page - 1) // per_page
+        total = MessageRepository.count_thread_messages(thread_id, user_id) if include_total else None
+        messages, pagination = build_pagination(
+            messages, per_page, 'timestamp', page=page, cursor=cursor, total=total
+        )
         
         return {
-            'messages': [m.to_dict() for m in messages],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
-            }
+            'messages': [m.to_dict(**serialize_flags(expand)) for m in messages],
+            'pagination': pagination
+        }, None
+    
+    @staticmethod
+    def _get_broadcast_messages(user_id: int, page: int, per_page: int,
+                                after: Optional[Cursor], cursor: Optional[str],
+                                include_total: bool) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Get a user's broadcasts as the messages of the announcements thread.
+        
+        Args:
+            user_id: User ID
+            page: Page number (ignored when a cursor is given)
+            per_page: Items per page
+            after: Decoded cursor
+            cursor: Cursor as given by the client
+            include_total: Whether to run the COUNT query for totals
+        
+        Returns:
+            Tuple[Optional[Dict], Optional[str]]: (result, error_message)
+        """
+        rows = BroadcastRepository.get_for_user(
+            user_id=user_id,
+            limit=per_page + 1,
+            offset=0 if after else (page - 1) * per_page,
+            after=after
+        )
+        
+        if not rows and page == 1 and not after:
+            return None, "Thread not found or access denied"
+        
+        total = BroadcastRepository.count_for_user(user_id) if include_total else None
+        broadcasts, pagination = build_pagination(
+            [broadcast for broadcast, _ in rows], per_page, 'timestamp',
+            page=page, cursor=cursor, total=total
+        )
+        read_at = {broadcast.id: read for broadcast, read in rows}
+        
+        return {
+            'messages': [
+                b.to_dict(is_read=read_at[b.id] is not None, read_at=read_at[b.id]) for b in broadcasts
+            ],
+            'pagination': pagination
         }, None
     
     @staticmethod
@@ -178,6 +313,12 @@ class MessageService:
         if not message:
             return None, "Message not found or you are not the receiver"
         
+        publish_event([message.sender_id], 'message.read', {
+            'thread_id': message.thread_id,
+            'message_ids': [message.id],
+            'reader_id': user_id,
+            'read_at': message.read_at.isoformat() if message.read_at else None
+        })
         return message, None
     
     @staticmethod
@@ -192,16 +333,34 @@ class MessageService:
         Returns:
             Tuple[int, Optional[str]]: (count, error_message)
         """
+        if thread_id == Broadcast.THREAD_ID:
+            # Broadcast receipts have no sender to notify
+            try:
+                return BroadcastRepository.mark_all_as_read(user_id), None
+            except Exception as e:
+                return 0, f"Failed to mark thread as read: {str(e)}"
+        
         try:
             count = MessageRepository.mark_thread_as_read(thread_id, user_id)
-            return count, None
         except Exception as e:
             return 0, f"Failed to mark thread as read: {str(e)}"
+        
+        if count:
+            publish_event(
+                set(MessageRepository.get_thread_participant_ids(thread_id)) - {user_id},
+                'message.read',
+                {'thread_id': thread_id, 'reader_id': user_id, 'read_at': datetime.utcnow().isoformat()}
+            )
+        return count, None
     
     @staticmethod
     def get_unread_count(user_id: int) -> int:
         """
-        Get count of unread messages for a user.
+        Get count of unread messages for a user, broadcasts included.
+        
+        Served from the per-user counter cache, which falls back to counting
+        in the database when the user's count is unknown or due for
+        reconciliation.
         
         Args:
             user_id: User ID
@@ -209,7 +368,12 @@ class MessageService:
         Returns:
             int: Number of unread messages
         """
-        return MessageRepository.get_unread_count(user_id)
+        return get_unread_counter().get(user_id, MessageService._count_unread)
+    
+    @staticmethod
+    def _count_unread(user_id: int) -> int:
+        """Count a user's unread messages and broadcasts in the database."""
+        return MessageRepository.get_unread_count(user_id) + BroadcastRepository.get_unread_count(user_id)
     
     @staticmethod
     def search_messages(user_id: int, search_term: str,
@@ -217,6 +381,9 @@ class MessageService:
         """
         Search messages by content.
         
+        Results are ordered by relevance. Each message carries a ``snippet``
+        with the matched words' character ranges for highlighting.
+        
         Args:
             user_id: User ID
             search_term: Search term
@@ -239,7 +406,13 @@ class MessageService:
                 search_term=search_term,
                 limit=min(limit, 100)  # Cap at 100
             )
-            return [m.to_dict() for m in messages], None
+            tokens = tokenize(search_term)
+            results = []
+            for message in messages:
+                data = message.to_dict()
+                data['snippet'] = highlight(message.content, tokens)
+                results.append(data)
+            return results, None
         except Exception as e:
             return [], f"Search failed: {str(e)}"
     
@@ -318,6 +491,9 @@ class MessageService:
         Returns:
             bool: True if user can access
         """
+        if thread_id == Broadcast.THREAD_ID:
+            return BroadcastRepository.count_for_user(user_id) > 0
+        
         # Get any message from the thread to check access
         messages = MessageRepository.get_thread_messages(thread_id, user_id, limit=1)
         return len(messages) > 0
@@ -5,7 +5,12 @@ Handles validation, permissions, and resource operations.
 """
 
 from typing import Optional, List, Tuple, Dict, Any
+from datetime import datetime
+from data_access.booking_repository import BookingRepository
+from data_access.resource_facets import get_facet_cache
 from data_access.resource_repository import ResourceRepository
+from data_access.resource_suggest import get_suggest_index
+from data_access.search_engine import get_search_engine
 from models.resource import Resource
 from models.user import User
 
@@ -184,7 +189,11 @@ class ResourceService:
                       owner_id: Optional[int] = None,
                       page: int = 1, per_page: int = 20,
                       search: Optional[str] = None,
-                      location: Optional[str] = None) -> Dict[str, Any]:
+                      location: Optional[str] = None,
+                      min_capacity: Optional[int] = None,
+                      available_from: Optional[datetime] = None,
+                      available_to: Optional[datetime] = None,
+                      facets: bool = False) -> Dict[str, Any]:
         """
         List resources with pagination and filtering.
         
@@ -196,13 +205,33 @@ class ResourceService:
             per_page: Items per page
             search: Search term
             location: Filter by location
+            min_capacity: Minimum capacity
+            available_from: Only resources free from this time (with available_to)
+            available_to: Only resources free until this time (with available_from)
+            facets: Also count matches per category, location and capacity bucket
         
         Returns:
-            Dict containing resources and pagination info
+            Dict containing resources and pagination info (and facets if requested)
         """
         # Calculate offset
         offset = (page - 1) * per_page
         
+        # Narrow to resources without an active booking in the requested window
+        resource_ids = None
+        if available_from and available_to:
+            resource_ids = BookingRepository.get_free_resource_ids(
+                ResourceRepository.get_ids(
+                    status=status,
+                    category=category,
+                    owner_id=owner_id,
+                    search=search,
+                    location=location,
+                    min_capacity=min_capacity
+                ),
+                available_from,
+                available_to
+            )
+        
         # Get resources
         resources = ResourceRepository.get_all(
             status=status,
@@ -211,7 +240,9 @@ class ResourceService:
             limit=per_page,
             offset=offset,
             search=search,
-            location=location
+            location=location,
+            min_capacity=min_capacity,
+            resource_ids=resource_ids
         )
         
         # Get total count
@@ -220,13 +251,15 @@ class ResourceService:
             category=category,
             owner_id=owner_id,
             search=search,
-            location=location
+            location=location,
+            min_capacity=min_capacity,
+            resource_ids=resource_ids
         )
         
         # Calculate pagination info
         total_pages = (total + per_page - 1) // per_page
         
-        return {
+        result = {
             'resources': [r.to_dict() for r in resources],
             'pagination': {
                 'page': page,
@@ -237,6 +270,44 @@ class ResourceService:
                 'has_prev': page > 1
             }
         }
+        
+        if facets:
+            filters = {
+                'status': status,
+                'category': category,
+                'owner_id': owner_id,
+                'search': search,
+                'location': location,
+                'min_capacity': min_capacity
+            }
+            result['facets'] = ResourceService.get_facets(filters, resource_ids)
+        
+        return result
+    
+    @staticmethod
+    def get_facets(filters: Dict[str, Any],
+                   resource_ids: Optional[List[int]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Get facet counts for a filter set, from the cache when possible.
+        
+        Args:
+            filters: Keyword filters accepted by ``ResourceRepository.count``
+            resource_ids: Availability-window restriction; these depend on
+                bookings, so such results are not cached
+        
+        Returns:
+            Dict of facet name to {value: count}
+        """
+        if resource_ids is not None:
+            return ResourceRepository.get_facet_counts(resource_ids=resource_ids, **filters)
+        
+        cache = get_facet_cache()
+        signature = tuple(sorted(filters.items()))
+        facets = cache.get(signature)
+        if facets is None:
+            facets = ResourceRepository.get_facet_counts(**filters)
+            cache.put(signature, facets)
+        return facets
     
     @staticmethod
     def search_resources(search_term: str, category: Optional[str] = None,
@@ -245,6 +316,9 @@ class ResourceService:
         """
         Search resources.
         
+        Served by the in-process search engine when it is enabled (see
+        ``RESOURCE_SEARCH_BACKEND``), otherwise by the database.
+        
         Args:
             search_term: Search term
             category: Optional category filter
@@ -257,15 +331,43 @@ class ResourceService:
         if not search_term or not search_term.strip():
             return []
         
-        resources = ResourceRepository.search(
-            search_term=search_term.strip(),
+        engine = get_search_engine()
+        resource_ids = engine.search(
+            search_term.strip(),
             category=category,
             location=location,
             limit=limit
-        )
+        ) if engine is not None else None
+        
+        if resource_ids is not None:
+            resources = ResourceRepository.get_by_ids(resource_ids)
+        else:
+            resources = ResourceRepository.search(
+                search_term=search_term.strip(),
+                category=category,
+                location=location,
+                limit=limit
+            )
         
         return [r.to_dict() for r in resources]
     
+    @staticmethod
+    def suggest(prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Get typeahead completions for a partially typed search term.
+        
+        Args:
+            prefix: Text typed so far
+            limit: Maximum completions
+        
+        Returns:
+            List of completions (title, category or location), most popular first
+        """
+        if not prefix or not prefix.strip():
+            return []
+        
+        return get_suggest_index().suggest(prefix.strip(), limit=limit)
+    
     @staticmethod
     def update_resource(resource_id: int, user: User,
                        **kwargs) -> Tuple[Optional[Resource], Optional[str]]:
@@ -396,6 +498,16 @@ class ResourceService:
         """
         return sorted(list(ResourceService.VALID_CATEGORIES))
     
+    @staticmethod
+    def get_locations() -> List[str]:
+        """
+        Get the locations of published resources.
+        
+        Returns:
+            List of location names
+        """
+        return ResourceRepository.get_locations()
+    
     @staticmethod
     def get_user_resources(user_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """
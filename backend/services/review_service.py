@@ -4,13 +4,15 @@ Business logic layer for review management.
 Handles validation, rating system, and moderation.
 """
 
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Sequence, Tuple, List, Dict, Any
 from datetime import datetime, timedelta
 from data_access.review_repository import ReviewRepository
 from data_access.resource_repository import ResourceRepository
 from data_access.booking_repository import BookingRepository
+from data_access.load_options import serialize_flags
 from models.review import Review
 from models.user import User
+from utils.pagination import build_pagination, decode_cursor
 
 
 class ReviewService:
@@ -30,6 +32,26 @@ class ReviewService:
     # Edit window (in days)
     EDIT_WINDOW_DAYS = 7
     
+    @staticmethod
+    def validate_rating(rating: Any) -> Tuple[bool, Optional[str]]:
+        """
+        Validate a rating.
+        
+        Args:
+            rating: Rating to validate
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (is_valid, error_message)
+        """
+        # bool is an int subclass, but true/false aren't ratings
+        if not isinstance(rating, int) or isinstance(rating, bool):
+            return False, f"Rating must be a whole number between {ReviewService.MIN_RATING} and {ReviewService.MAX_RATING}"
+        
+        if rating < ReviewService.MIN_RATING or rating > ReviewService.MAX_RATING:
+            return False, f"Rating must be between {ReviewService.MIN_RATING} and {ReviewService.MAX_RATING}"
+        
+        return True, None
+    
     @staticmethod
     def create_review(resource_id: int, reviewer_id: int, rating: int,
                      comment: Optional[str] = None,
@@ -48,8 +70,9 @@ class ReviewService:
             Tuple[Optional[Review], Optional[str]]: (review, error_message)
         """
         # Validate rating
-        if rating < ReviewService.MIN_RATING or rating > ReviewService.MAX_RATING:
-            return None, f"Rating must be between {ReviewService.MIN_RATING} and {ReviewService.MAX_RATING}"
+        is_valid, error = ReviewService.validate_rating(rating)
+        if not is_valid:
+            return None, error
         
         # Validate comment if provided
         if comment:
@@ -139,8 +162,9 @@ class ReviewService:
         
         # Validate new rating if provided
         if rating is not None:
-            if rating < ReviewService.MIN_RATING or rating > ReviewService.MAX_RATING:
-                return None, f"Rating must be between {ReviewService.MIN_RATING} and {ReviewService.MAX_RATING}"
+            is_valid, error = ReviewService.validate_rating(rating)
+            if not is_valid:
+                return None, error
         
         # Validate new comment if provided
         if comment is not None:
@@ -186,46 +210,58 @@ class ReviewService:
     
     @staticmethod
     def get_resource_reviews(resource_id: int, page: int = 1,
-                            per_page: int = 20) -> Dict[str, Any]:
+                            per_page: int = 20, cursor: Optional[str] = None,
+                            include_total: bool = True,
+                            expand: Sequence[str] = ()) -> Dict[str, Any]:
         """
         Get all reviews for a resource with pagination.
         
         Args:
             resource_id: Resource ID
-            page: Page number
+            page: Page number (ignored when a cursor is given)
             per_page: Items per page
+            cursor: Cursor from a previous page's ``next_cursor``
+            include_total: Whether to include the total review count
+            expand: Related objects to embed ('reviewer', 'resource')
         
         Returns:
-            Dict containing reviews and pagination info
+            Dict containing reviews, rating summary and pagination info
+        
+        Raises:
+            ValueError: If the cursor is malformed or an expand name is unknown
         """
-        offset = (page - 1) * per_page
+        after = decode_cursor(cursor) if cursor else None
+        
+        # Total and rating summary come from the resource's stored aggregates,
+        # which are kept in step with visible reviews on every review write;
+        # the page itself is a single index range scan.
+        resource = ResourceRepository.get_by_id(resource_id)
         
         reviews = ReviewRepository.get_by_resource(
             resource_id=resource_id,
             include_hidden=False,
-            limit=per_page,
-            offset=offset
+            limit=per_page + 1,
+            offset=0 if after else (page - 1) * per_page,
+            after=after,
+            include=expand
         )
         
-        total = ReviewRepository.count_by_resource(resource_id, include_hidden=False)
-        total_pages = (total + per_page - 1) // per_page
-        
-        # Get average rating
-        avg_rating = ReviewRepository.get_average_rating(resource_id)
+        total = (resource.review_count if resource else 0) if include_total else None
+        reviews, pagination = build_pagination(
+            reviews, per_page, 'timestamp', page=page, cursor=cursor, total=total
+        )
         
-        return {
-            'reviews': [r.to_dict() for r in reviews],
-            'average_rating': avg_rating,
-            'total_reviews': total,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
-            }
+        result = {
+            'reviews': [r.to_dict(**serialize_flags(expand)) for r in reviews],
+            'average_rating': resource.average_rating if resource and resource.review_count else None,
+            'rating_histogram': resource.get_rating_histogram() if resource else {
+                str(stars): 0 for stars in range(ReviewService.MIN_RATING, ReviewService.MAX_RATING + 1)
+            },
+            'pagination': pagination
         }
+        if total is not None:
+            result['total_reviews'] = total
+        return result
     
     @staticmethod
     def get_user_reviews(user_id: int, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
@@ -556,6 +556,204 @@ class TestBookingConflictDetection:
         assert response2.status_code == 201
 
 
+class TestBookingConflictIndex:
+    """Test that the in-memory conflict index tracks booking state changes"""
+    
+    def test_cancelled_booking_frees_slot(self, client, app, student_user, sample_resource, sample_booking_data):
+        """Test that a cancelled booking no longer blocks its time slot."""
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        booking_data = {
+            'resource_id': sample_resource['id'],
+            **sample_booking_data
+        }
+        
+        response = client.post('/api/bookings', json=booking_data, headers={'X-CSRF-Token': csrf_token})
+        assert response.status_code == 201
+        booking_id = response.json['booking']['id']
+        
+        response = client.post('/api/bookings', json=booking_data, headers={'X-CSRF-Token': csrf_token})
+        assert response.status_code == 409
+        
+        response = client.post(
+            f'/api/bookings/{booking_id}/cancel',
+            json={},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        assert response.status_code == 200
+        
+        response = client.post('/api/bookings', json=booking_data, headers={'X-CSRF-Token': csrf_token})
+        assert response.status_code == 201
+    
+    def test_index_ignores_stale_entries(self, app, student_user, sample_resource):
+        """Test that bookings changed outside the repository are not reported as conflicts."""
+        from data_access.booking_repository import BookingRepository
+        
+        start = datetime.utcnow() + timedelta(hours=3)
+        end = start + timedelta(hours=1)
+        
+        with app.app_context():
+            booking = BookingRepository.create(
+                resource_id=sample_resource['id'],
+                requester_id=student_user['id'],
+                start_datetime=start,
+                end_datetime=end
+            )
+            assert len(BookingRepository.check_conflicts(sample_resource['id'], start, end)) == 1
+            
+            # Simulate another worker cancelling the booking behind the index's back
+            Booking.query.filter_by(id=booking.id).update({'status': 'cancelled'})
+            db.session.commit()
+            
+            assert BookingRepository.check_conflicts(sample_resource['id'], start, end) == []
+    
+    def test_index_matches_database_query(self, app, student_user, sample_resource):
+        """Test that index answers agree with the database overlap query."""
+        from data_access.booking_repository import BookingRepository
+        
+        base = (datetime.utcnow() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        
+        with app.app_context():
+            for hour in (0, 2, 5):
+                BookingRepository.create(
+                    resource_id=sample_resource['id'],
+                    requester_id=student_user['id'],
+                    start_datetime=base + timedelta(hours=hour),
+                    end_datetime=base + timedelta(hours=hour + 1)
+                )
+            
+            windows = [(0, 1), (1, 2), (0.5, 2.5), (3, 5), (4, 8), (6, 7)]
+            for window_start, window_end in windows:
+                start = base + timedelta(hours=window_start)
+                end = base + timedelta(hours=window_end)
+                indexed = {b.id for b in BookingRepository.check_conflicts(sample_resource['id'], start, end)}
+                queried = {b.id for b in BookingRepository._query_conflicts(sample_resource['id'], start, end)}
+                assert indexed == queried
+
+
+# ============================================================================
+# Test: Recurring Booking Series
+# ============================================================================
+
+class TestBookingSeries:
+    """Test recurring booking series creation"""
+    
+    @staticmethod
+    def _next_monday():
+        today = datetime.utcnow().date()
+        monday = today + timedelta(days=7 - today.weekday())
+        return datetime.combine(monday, datetime.min.time()) + timedelta(hours=10)
+    
+    def test_weekly_series_skips_conflicting_occurrence(self, client, app, student_user, sample_resource):
+        """Test that conflicting occurrences are reported while the rest are created."""
+        from data_access.booking_repository import BookingRepository
+        
+        monday = self._next_monday()
+        wednesday = monday + timedelta(days=2)
+        
+        with app.app_context():
+            existing = BookingRepository.create(
+                resource_id=sample_resource['id'],
+                requester_id=student_user['id'],
+                start_datetime=wednesday + timedelta(minutes=30),
+                end_datetime=wednesday + timedelta(hours=3)
+            )
+            existing_id = existing.id
+        
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        response = client.post('/api/bookings/series', json={
+            'resource_id': sample_resource['id'],
+            'start_datetime': monday.isoformat(),
+            'end_datetime': (monday + timedelta(hours=1)).isoformat(),
+            'frequency': 'weekly',
+            'by_day': ['MO', 'WE'],
+            'count': 6
+        }, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 201
+        data = response.json
+        assert data['requested'] == 6
+        assert data['created'] == 5
+        assert data['conflicts'] == [{
+            'start_datetime': wednesday.isoformat(),
+            'end_datetime': (wednesday + timedelta(hours=1)).isoformat(),
+            'conflicting_booking_ids': [existing_id]
+        }]
+        assert {b['series_id'] for b in data['bookings']} == {data['series_id']}
+        assert [b['start_datetime'] for b in data['bookings']] == [
+            (monday + timedelta(days=offset)).isoformat() for offset in (0, 7, 9, 14, 16)
+        ]
+    
+    def test_daily_series_until(self, client, student_user, sample_resource):
+        """Test that a daily series stops at its until date (inclusive)."""
+        monday = self._next_monday()
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post('/api/bookings/series', json={
+            'resource_id': sample_resource['id'],
+            'start_datetime': monday.isoformat(),
+            'end_datetime': (monday + timedelta(hours=2)).isoformat(),
+            'frequency': 'daily',
+            'interval': 2,
+            'until': (monday + timedelta(days=6)).isoformat()
+        }, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 201
+        assert response.json['created'] == 4
+        assert response.json['conflicts'] == []
+        
+        # Repeating the series now conflicts on every occurrence
+        response = client.post('/api/bookings/series', json={
+            'resource_id': sample_resource['id'],
+            'start_datetime': monday.isoformat(),
+            'end_datetime': (monday + timedelta(hours=2)).isoformat(),
+            'frequency': 'daily',
+            'interval': 2,
+            'count': 4
+        }, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 409
+        assert len(response.json['conflicts']) == 4
+    
+    def test_series_validation(self, client, student_user, sample_resource):
+        """Test that invalid recurrence rules are rejected."""
+        monday = self._next_monday()
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        base = {
+            'resource_id': sample_resource['id'],
+            'start_datetime': monday.isoformat(),
+            'end_datetime': (monday + timedelta(hours=1)).isoformat(),
+            'frequency': 'weekly'
+        }
+        
+        for extra in ({}, {'count': 5, 'frequency': 'hourly'}, {'count': 5, 'by_day': ['XX']},
+                      {'count': 500}, {'count': 3, 'frequency': 'daily',
+                                       'end_datetime': (monday + timedelta(days=2)).isoformat()}):
+            response = client.post(
+                '/api/bookings/series',
+                json={**base, **extra},
+                headers={'X-CSRF-Token': csrf_token}
+            )
+            assert response.status_code == 400, extra
+    
+    def test_series_without_occurrences(self, client, student_user, sample_resource):
+        """Test that a rule matching no day before its until date is rejected."""
+        monday = self._next_monday()
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post('/api/bookings/series', json={
+            'resource_id': sample_resource['id'],
+            'start_datetime': monday.isoformat(),
+            'end_datetime': (monday + timedelta(hours=1)).isoformat(),
+            'frequency': 'weekly',
+            'by_day': ['WE'],
+            'until': (monday + timedelta(days=1)).isoformat()
+        }, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 400
+        assert response.json['message'] == 'Recurrence produces no occurrences'
+
+
 # ============================================================================
 # Test: Approval/Rejection Workflow
 # ============================================================================
@@ -689,6 +887,216 @@ class TestBookingApprovalWorkflow:
         assert 'rejection_reason' in response.json['message'].lower()
 
 
+class TestBulkRespondEndpoint:
+    """Test POST /api/bookings/bulk-respond"""
+    
+    @staticmethod
+    def _pending_bookings(resource_id, requester_id, hour_offsets):
+        base = (datetime.utcnow() + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+        bookings = []
+        for offset in hour_offsets:
+            booking = Booking(
+                resource_id=resource_id,
+                requester_id=requester_id,
+                start_datetime=base + timedelta(hours=offset),
+                end_datetime=base + timedelta(hours=offset + 2)
+            )
+            db.session.add(booking)
+            bookings.append(booking)
+        db.session.commit()
+        return [booking.id for booking in bookings]
+    
+    def test_bulk_respond_resolves_mutual_conflicts(self, client, app, student_user, staff_user, sample_resource):
+        """Test that only the first of two overlapping approvals succeeds."""
+        with app.app_context():
+            first, overlapping, other = self._pending_bookings(
+                sample_resource['id'], student_user['id'], (0, 1, 5)
+            )
+        
+        csrf_token = login_user(client, staff_user['email'], staff_user['password'])
+        response = client.post('/api/bookings/bulk-respond', json={'decisions': [
+            {'booking_id': first, 'action': 'approve', 'notes': 'OK'},
+            {'booking_id': overlapping, 'action': 'approve'},
+            {'booking_id': other, 'action': 'reject', 'notes': 'Room closed'},
+            {'booking_id': 99999, 'action': 'approve'}
+        ]}, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 200
+        data = response.json
+        assert data['succeeded'] == 2
+        assert data['failed'] == 2
+        
+        results = {r['booking_id']: r for r in data['results']}
+        assert results[first]['booking']['status'] == 'approved'
+        assert results[first]['booking']['approval_notes'] == 'OK'
+        assert 'conflict' in results[overlapping]['error']
+        assert results[other]['booking']['rejection_reason'] == 'Room closed'
+        assert 'not found' in results[99999]['error']
+        
+        with app.app_context():
+            assert db.session.get(Booking, overlapping).status == 'pending'
+            assert db.session.get(Booking, other).status == 'rejected'
+    
+    def test_rejection_frees_slot_for_approval(self, client, app, student_user, staff_user, sample_resource):
+        """Test that bookings rejected in the same request do not block approvals."""
+        with app.app_context():
+            rejected, approved = self._pending_bookings(
+                sample_resource['id'], student_user['id'], (0, 1)
+            )
+        
+        csrf_token = login_user(client, staff_user['email'], staff_user['password'])
+        response = client.post('/api/bookings/bulk-respond', json={'decisions': [
+            {'booking_id': approved, 'action': 'approve'},
+            {'booking_id': rejected, 'action': 'reject', 'notes': 'Overlaps'}
+        ]}, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 200
+        assert response.json['failed'] == 0
+    
+    def test_bulk_respond_rejects_non_string_notes(self, client, app, student_user, staff_user, sample_resource):
+        """Test that object or array notes fail only their own decision."""
+        with app.app_context():
+            first, second, third = self._pending_bookings(
+                sample_resource['id'], student_user['id'], (0, 3, 6)
+            )
+        
+        csrf_token = login_user(client, staff_user['email'], staff_user['password'])
+        response = client.post('/api/bookings/bulk-respond', json={'decisions': [
+            {'booking_id': first, 'action': 'approve', 'notes': {'text': 'OK'}},
+            {'booking_id': second, 'action': 'reject', 'notes': ['Closed']},
+            {'booking_id': third, 'action': 'approve', 'notes': '  Enjoy  '}
+        ]}, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 200
+        results = {r['booking_id']: r for r in response.json['results']}
+        assert results[first]['error'] == "Notes must be a string"
+        assert results[second]['error'] == "Notes must be a string"
+        assert results[third]['booking']['approval_notes'] == 'Enjoy'
+    
+    def test_bulk_respond_checks_permissions(self, client, app, student_user, sample_resource):
+        """Test that students cannot respond and malformed requests are rejected."""
+        with app.app_context():
+            booking_id, = self._pending_bookings(sample_resource['id'], student_user['id'], (0,))
+        
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        response = client.post('/api/bookings/bulk-respond', json={'decisions': [
+            {'booking_id': booking_id, 'action': 'approve'}
+        ]}, headers={'X-CSRF-Token': csrf_token})
+        
+        assert response.status_code == 200
+        assert 'permission' in response.json['results'][0]['error']
+        
+        for body in ({}, {'decisions': [{'booking_id': booking_id, 'action': 'maybe'}]},
+                     {'decisions': [{'booking_id': booking_id, 'action': 'approve'}] * 2}):
+            response = client.post('/api/bookings/bulk-respond', json=body, headers={'X-CSRF-Token': csrf_token})
+            assert response.status_code == 400
+
+
+# ============================================================================
+# Test: Booking Lifecycle Sweep
+# ============================================================================
+
+class TestBookingLifecycleSweep:
+    """Test the scheduled completion/expiry sweep"""
+    
+    @staticmethod
+    def _insert(app, resource_id, requester_id, status, start, end):
+        """Insert a booking directly with a given status."""
+        with app.app_context():
+            booking = Booking(
+                resource_id=resource_id,
+                requester_id=requester_id,
+                start_datetime=start,
+                end_datetime=end
+            )
+            booking.status = status
+            db.session.add(booking)
+            db.session.commit()
+            return booking.id
+    
+    def test_sweep_completes_and_expires_past_bookings(self, app, student_user, sample_resource):
+        """Test that ended approved bookings complete and stale pending ones expire."""
+        from services.booking_lifecycle_service import BookingLifecycleService
+        
+        now = datetime.utcnow()
+        args = (app, sample_resource['id'], student_user['id'])
+        ended = self._insert(*args, 'approved', now - timedelta(hours=3), now - timedelta(hours=2))
+        running = self._insert(*args, 'approved', now - timedelta(hours=1), now + timedelta(hours=1))
+        stale = self._insert(*args, 'pending', now - timedelta(hours=5), now - timedelta(hours=4))
+        upcoming = self._insert(*args, 'pending', now + timedelta(hours=1), now + timedelta(hours=2))
+        cancelled = self._insert(*args, 'cancelled', now - timedelta(hours=8), now - timedelta(hours=7))
+        
+        with app.app_context():
+            result = BookingLifecycleService.sweep(now=now)
+            
+            assert result['completed'] == 1
+            assert result['expired'] == 1
+            assert result['remaining'] == 0
+            
+            statuses = {b.id: b.status for b in Booking.query.all()}
+            assert statuses[ended] == 'completed'
+            assert statuses[running] == 'approved'
+            assert statuses[stale] == 'expired'
+            assert statuses[upcoming] == 'pending'
+            assert statuses[cancelled] == 'cancelled'
+    
+    def test_sweep_runs_in_bounded_batches(self, app, student_user, sample_resource):
+        """Test that a sweep stops after its batch budget and resumes on the next run."""
+        from services.booking_lifecycle_service import BookingLifecycleService
+        
+        now = datetime.utcnow()
+        for hour in range(5):
+            start = now - timedelta(days=1, hours=hour)
+            self._insert(app, sample_resource['id'], student_user['id'], 'approved',
+                         start, start + timedelta(minutes=30))
+        
+        with app.app_context():
+            result = BookingLifecycleService.sweep(now=now, batch_size=2, max_batches=2)
+            assert result['completed'] == 4
+            assert result['remaining'] == 1
+            
+            result = BookingLifecycleService.sweep(now=now, batch_size=2, max_batches=2)
+            assert result['completed'] == 1
+            assert result['remaining'] == 0
+            
+            assert Booking.query.filter_by(status='completed').count() == 5
+    
+    def test_expired_booking_frees_slot_in_index(self, app, student_user, sample_resource):
+        """Test that expired bookings no longer count as conflicts."""
+        from data_access.booking_repository import BookingRepository
+        from services.booking_lifecycle_service import BookingLifecycleService
+        
+        now = datetime.utcnow()
+        start = now + timedelta(minutes=5)
+        end = start + timedelta(hours=1)
+        
+        with app.app_context():
+            BookingRepository.create(
+                resource_id=sample_resource['id'],
+                requester_id=student_user['id'],
+                start_datetime=start,
+                end_datetime=end
+            )
+            assert len(BookingRepository.check_conflicts(sample_resource['id'], start, end)) == 1
+            
+            BookingLifecycleService.sweep(now=start + timedelta(minutes=1))
+            assert BookingRepository.check_conflicts(sample_resource['id'], start, end) == []
+    
+    def test_sweep_cli_command(self, app, student_user, sample_resource):
+        """Test the sweep-bookings CLI command."""
+        from app import register_cli_commands
+        register_cli_commands(app)
+        
+        now = datetime.utcnow()
+        self._insert(app, sample_resource['id'], student_user['id'], 'approved',
+                     now - timedelta(hours=2), now - timedelta(hours=1))
+        
+        result = app.test_cli_runner().invoke(args=['sweep-bookings', '--batch-size', '10'])
+        
+        assert result.exit_code == 0
+        assert '1 completed' in result.output
+
+
 # ============================================================================
 # Test: Booking Cancellation
 # ============================================================================
@@ -873,6 +1281,128 @@ class TestListBookingsEndpoint:
         assert response.status_code == 200
         assert response.json['id'] == booking_id
         assert response.json['resource_id'] == sample_resource['id']
+    
+    def test_cursor_pagination_walks_all_bookings(self, client, app, student_user, sample_resource):
+        """Test that following next_cursor returns every booking exactly once, in order."""
+        base = datetime.utcnow() + timedelta(days=1)
+        
+        with app.app_context():
+            # Two bookings share each start time so the ID tie-breaker is exercised
+            for i in range(6):
+                booking = Booking(
+                    resource_id=sample_resource['id'],
+                    requester_id=student_user['id'],
+                    start_datetime=base + timedelta(hours=i // 2),
+                    end_datetime=base + timedelta(hours=i // 2, minutes=30)
+                )
+                db.session.add(booking)
+            db.session.commit()
+            expected = [b.id for b in Booking.query.order_by(
+                Booking.start_datetime.desc(), Booking.id.desc()
+            ).all()]
+        
+        login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.get('/api/bookings?per_page=4')
+        assert response.status_code == 200
+        pagination = response.json['pagination']
+        assert pagination['page'] == 1
+        assert pagination['total'] == 6
+        assert pagination['has_next'] is True
+        seen = [b['id'] for b in response.json['bookings']]
+        
+        response = client.get(f"/api/bookings?per_page=4&cursor={pagination['next_cursor']}")
+        assert response.status_code == 200
+        pagination = response.json['pagination']
+        assert pagination['has_next'] is False
+        assert pagination['next_cursor'] is None
+        assert 'page' not in pagination
+        seen += [b['id'] for b in response.json['bookings']]
+        
+        assert seen == expected
+    
+    def test_list_bookings_without_total(self, client, app, student_user, sample_resource, sample_booking_data):
+        """Test that include_total=false omits the count fields."""
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        client.post(
+            '/api/bookings',
+            json={'resource_id': sample_resource['id'], **sample_booking_data},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        response = client.get('/api/bookings?include_total=false')
+        
+        assert response.status_code == 200
+        assert len(response.json['bookings']) == 1
+        assert 'total' not in response.json['pagination']
+        assert 'total_pages' not in response.json['pagination']
+        assert response.json['pagination']['has_next'] is False
+    
+    def test_invalid_cursor_rejected(self, client, app, student_user):
+        """Test that a malformed cursor returns 400."""
+        login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.get('/api/bookings?cursor=not-a-cursor')
+        
+        assert response.status_code == 400
+    
+    def test_expanded_list_uses_constant_queries(self, client, app, student_user, staff_user):
+        """Test that embedding related objects does not add a query per row."""
+        from sqlalchemy import event
+        
+        base = datetime.utcnow() + timedelta(days=1)
+        
+        with app.app_context():
+            # One resource per booking so every row has a distinct relation to load
+            for i in range(12):
+                resource = Resource(
+                    name=f'Room {i}',
+                    category='room',
+                    owner_id=staff_user['id'],
+                    status='published'
+                )
+                db.session.add(resource)
+                db.session.flush()
+                db.session.add(Booking(
+                    resource_id=resource.id,
+                    requester_id=student_user['id'],
+                    start_datetime=base + timedelta(hours=i),
+                    end_datetime=base + timedelta(hours=i, minutes=30)
+                ))
+            db.session.commit()
+        
+        login_user(client, student_user['email'], student_user['password'])
+        
+        def count_statements(url):
+            statements = []
+            
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+            
+            event.listen(db.engine, 'before_cursor_execute', record)
+            try:
+                response = client.get(url)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', record)
+            
+            assert response.status_code == 200
+            return response, len(statements)
+        
+        small, small_count = count_statements('/api/bookings?per_page=2&expand=resource,requester')
+        large, large_count = count_statements('/api/bookings?per_page=12&expand=resource,requester')
+        
+        assert len(small.json['bookings']) == 2
+        assert len(large.json['bookings']) == 12
+        assert all('resource' in b and 'requester' in b for b in large.json['bookings'])
+        assert small_count == large_count
+    
+    def test_unknown_expand_rejected(self, client, app, student_user):
+        """Test that expanding an unsupported relationship returns 400."""
+        login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.get('/api/bookings?expand=approver')
+        
+        assert response.status_code == 400
 
 
 # ============================================================================
@@ -933,6 +1463,99 @@ class TestCheckAvailabilityEndpoint:
         assert 'conflict' in response.json['message'].lower()
 
 
+class TestBatchAvailabilityEndpoint:
+    """Test POST /api/bookings/check-availability/batch"""
+    
+    def test_batch_availability_slots(self, client, app, student_user, sample_resource, sample_booking_data):
+        """Test availability vector for explicit slots."""
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post(
+            '/api/bookings',
+            json={'resource_id': sample_resource['id'], **sample_booking_data},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        assert response.status_code == 201
+        
+        free_start = datetime.utcnow() + timedelta(days=1)
+        past_start = datetime.utcnow() - timedelta(days=1)
+        slots = [
+            {
+                'resource_id': sample_resource['id'],
+                'start_datetime': sample_booking_data['start_datetime'],
+                'end_datetime': sample_booking_data['end_datetime']
+            },
+            {
+                'resource_id': sample_resource['id'],
+                'start_datetime': free_start.isoformat() + 'Z',
+                'end_datetime': (free_start + timedelta(hours=1)).isoformat() + 'Z'
+            },
+            {
+                'resource_id': sample_resource['id'],
+                'start_datetime': past_start.isoformat() + 'Z',
+                'end_datetime': (past_start + timedelta(hours=1)).isoformat() + 'Z'
+            }
+        ]
+        
+        response = client.post(
+            '/api/bookings/check-availability/batch',
+            json={'slots': slots},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        assert response.status_code == 200
+        assert response.json['available'] == [False, True, False]
+        assert list(response.json['errors'].keys()) == ['2']
+    
+    def test_batch_availability_filtered_resources(self, client, app, student_user, staff_user, sample_resource, sample_booking_data):
+        """Test one window across all published resources."""
+        with app.app_context():
+            other = Resource(
+                name='Conference Room B',
+                category='room',
+                owner_id=staff_user['id'],
+                status='published'
+            )
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+        
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post(
+            '/api/bookings',
+            json={'resource_id': sample_resource['id'], **sample_booking_data},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        assert response.status_code == 201
+        
+        response = client.post(
+            '/api/bookings/check-availability/batch',
+            json={
+                'start_datetime': sample_booking_data['start_datetime'],
+                'end_datetime': sample_booking_data['end_datetime'],
+                'category': 'room'
+            },
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        assert response.status_code == 200
+        availability = dict(zip(response.json['resource_ids'], response.json['available']))
+        assert availability == {sample_resource['id']: False, other_id: True}
+    
+    def test_batch_availability_requires_slots_or_window(self, client, app, student_user):
+        """Test validation of an empty batch request."""
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post(
+            '/api/bookings/check-availability/batch',
+            json={'slots': []},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        assert response.status_code == 400
+
+
 # ============================================================================
 # Test: Rate Limiting
 # ============================================================================
@@ -0,0 +1,339 @@
+"""
+Events API Tests
+Tests for the server-sent events stream and the event broker behind it.
+
+Tests cover:
+1. Authentication on the stream endpoint
+2. Message and read-receipt events published by the message service
+3. Booking status events published by the booking service
+4. Last-Event-ID resume and resync
+5. Cross-process fan-out through the database backend
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from app import create_app
+from extensions import db
+from models.user import User
+from models.resource import Resource
+from models.booking import Booking
+
+
+@pytest.fixture
+def app():
+    """Create application for testing."""
+    app = create_app('testing')
+    app.config['EVENT_STREAM_MAX_SECONDS'] = 0.2
+    app.config['EVENT_STREAM_HEARTBEAT_SECONDS'] = 0.1
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Test client."""
+    return app.test_client()
+
+
+def make_user(email, role='student'):
+    """Create a user and return its ID."""
+    user = User(name=email.split('@')[0], email=email, role=role)
+    user.set_password('EventsPass123')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def login_user(client, email):
+    """Helper function to log in a user."""
+    csrf_token = client.get('/api/auth/csrf-token').json['csrf_token']
+    response = client.post(
+        '/api/auth/login',
+        json={'email': email, 'password': 'EventsPass123'},
+        headers={'X-CSRF-Token': csrf_token}
+    )
+    assert response.status_code == 200
+
+
+def parse_events(body):
+    """Split a text/event-stream body into (id, event, data) tuples, skipping comments."""
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(
+            line.split(': ', 1) for line in block.split('\n')
+            if line and not line.startswith(':') and ': ' in line
+        )
+        if 'event' in fields:
+            events.append((fields.get('id'), fields['event'], fields.get('data')))
+    return events
+
+
+# ============================================================================
+# Test: Stream Endpoint
+# ============================================================================
+
+class TestEventStream:
+    """Test GET /api/events/stream"""
+    
+    def test_stream_requires_authentication(self, client):
+        """Test that anonymous clients are rejected."""
+        response = client.get('/api/events/stream')
+        
+        assert response.status_code == 401
+    
+    def test_stream_delivers_new_message_event(self, client, app):
+        """Test that a sent message is pushed to the receiver's open stream."""
+        from services.message_service import MessageService
+        
+        sender_id = make_user('sender@example.com')
+        receiver_id = make_user('receiver@example.com')
+        login_user(client, 'receiver@example.com')
+        
+        response = client.get('/api/events/stream', buffered=False)
+        MessageService.send_message(sender_id, receiver_id, 'Are you free?')
+        body = response.get_data(as_text=True)
+        response.close()
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        events = parse_events(body)
+        assert [event for _, event, _ in events] == ['message.created']
+        assert 'Are you free?' in events[0][2]
+    
+    def test_stream_resumes_after_last_event_id(self, client, app):
+        """Test that events missed while disconnected are replayed once."""
+        from services.event_broker import publish_event
+        
+        user_id = make_user('resume@example.com')
+        login_user(client, 'resume@example.com')
+        
+        response = client.get('/api/events/stream', buffered=False)
+        publish_event([user_id], 'booking.approved', {'id': 1})
+        first_id = parse_events(response.get_data(as_text=True))[0][0]
+        response.close()
+        
+        publish_event([user_id], 'booking.cancelled', {'id': 2})
+        publish_event([user_id], 'booking.rejected', {'id': 3})
+        
+        response = client.get('/api/events/stream', headers={'Last-Event-ID': first_id})
+        
+        assert [event for _, event, _ in parse_events(response.get_data(as_text=True))] == [
+            'booking.cancelled', 'booking.rejected'
+        ]
+    
+    def test_stream_delivers_event_with_lower_id_than_one_sent(self, client, app):
+        """Test that an event committed late is streamed after a newer one."""
+        from services.event_broker import Event, get_event_broker
+        
+        user_id = make_user('late@example.com')
+        login_user(client, 'late@example.com')
+        
+        response = client.get('/api/events/stream', buffered=False)
+        broker = get_event_broker()
+        broker.deliver(Event(7, user_id, 'message.created', {'id': 2}))
+        broker.deliver(Event(6, user_id, 'message.created', {'id': 1}))
+        events = parse_events(response.get_data(as_text=True))
+        response.close()
+        
+        assert [event_id for event_id, _, _ in events] == ['7', '6']
+    
+    def test_stream_asks_for_resync_when_gap_is_lost(self, client, app):
+        """Test that resuming from before the replay buffer sends a resync event."""
+        make_user('resync@example.com')
+        login_user(client, 'resync@example.com')
+        
+        response = client.get('/api/events/stream?last_event_id=1')
+        
+        assert [event for _, event, _ in parse_events(response.get_data(as_text=True))] == ['resync']
+    
+    def test_stream_rejects_invalid_last_event_id(self, client, app):
+        """Test that a malformed Last-Event-ID is a bad request."""
+        make_user('invalid@example.com')
+        login_user(client, 'invalid@example.com')
+        
+        response = client.get('/api/events/stream', headers={'Last-Event-ID': 'abc'})
+        
+        assert response.status_code == 400
+
+
+# ============================================================================
+# Test: Published Events
+# ============================================================================
+
+class TestPublishedEvents:
+    """Test events published by the message and booking services"""
+    
+    def test_read_receipts_go_to_sender(self, app):
+        """Test that marking messages read notifies the other participant."""
+        from services.event_broker import get_event_broker
+        from services.message_service import MessageService
+        
+        sender_id = make_user('sender@example.com')
+        receiver_id = make_user('receiver@example.com')
+        first, _ = MessageService.send_message(sender_id, receiver_id, 'One')
+        MessageService.send_message(sender_id, receiver_id, 'Two')
+        
+        subscription = get_event_broker().subscribe(sender_id)
+        MessageService.mark_message_as_read(first.id, receiver_id)
+        MessageService.mark_thread_as_read(first.thread_id, receiver_id)
+        MessageService.mark_thread_as_read(first.thread_id, receiver_id)
+        
+        receipts = [subscription.get(timeout=0) for _ in range(3)]
+        get_event_broker().unsubscribe(subscription)
+        
+        assert [event.type for event in receipts[:2]] == ['message.read', 'message.read']
+        assert receipts[0].data['message_ids'] == [first.id]
+        assert receipts[1].data['thread_id'] == first.thread_id
+        # Nothing left to read, so no receipt
+        assert receipts[2] is None
+    
+    def test_booking_cancel_notifies_owner(self, app):
+        """Test that a requester cancelling notifies the resource owner only."""
+        from services.booking_service import BookingService
+        from services.event_broker import get_event_broker
+        
+        owner_id = make_user('owner@example.com', role='staff')
+        requester_id = make_user('requester@example.com')
+        resource = Resource(owner_id=owner_id, title='Room', status='published')
+        db.session.add(resource)
+        db.session.commit()
+        start = datetime.utcnow() + timedelta(days=1)
+        booking = Booking(resource.id, requester_id, start, start + timedelta(hours=1))
+        db.session.add(booking)
+        db.session.commit()
+        
+        broker = get_event_broker()
+        owner_stream = broker.subscribe(owner_id)
+        requester_stream = broker.subscribe(requester_id)
+        
+        cancelled, error = BookingService.cancel_booking(booking.id, db.session.get(User, requester_id))
+        
+        assert error is None
+        event = owner_stream.get(timeout=0)
+        assert event.type == 'booking.cancelled'
+        assert event.data['id'] == cancelled.id
+        assert requester_stream.get(timeout=0) is None
+        broker.unsubscribe(owner_stream)
+        broker.unsubscribe(requester_stream)
+    
+    def test_bulk_response_notifies_requester_and_owner(self, app):
+        """Test that bulk approvals reach the same users as single ones."""
+        from services.booking_service import BookingService
+        from services.event_broker import get_event_broker
+        
+        owner_id = make_user('owner@example.com', role='staff')
+        requester_id = make_user('requester@example.com')
+        admin = db.session.get(User, make_user('admin@example.com', role='admin'))
+        resource = Resource(owner_id=owner_id, title='Room', status='published')
+        db.session.add(resource)
+        db.session.commit()
+        start = datetime.utcnow() + timedelta(days=1)
+        booking = Booking(resource.id, requester_id, start, start + timedelta(hours=1))
+        db.session.add(booking)
+        db.session.commit()
+        
+        broker = get_event_broker()
+        streams = {user_id: broker.subscribe(user_id) for user_id in (owner_id, requester_id, admin.id)}
+        
+        result, error = BookingService.bulk_respond(admin, [{'booking_id': booking.id, 'action': 'approve'}])
+        
+        assert error is None
+        assert result['succeeded'] == 1
+        assert streams[owner_id].get(timeout=0).type == 'booking.approved'
+        assert streams[requester_id].get(timeout=0).type == 'booking.approved'
+        assert streams[admin.id].get(timeout=0) is None
+        for stream in streams.values():
+            broker.unsubscribe(stream)
+
+
+# ============================================================================
+# Test: Database Fan-out Backend
+# ============================================================================
+
+class TestDatabaseEventBackend:
+    """Test cross-process delivery through the stream_events table"""
+    
+    @pytest.fixture
+    def app(self, tmp_path, monkeypatch):
+        """Application on a file database; the poller thread needs its own connection."""
+        from config import TestingConfig
+        
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'events.db'}")
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.drop_all()
+    
+    def test_poller_delivers_and_replays_stored_events(self, app):
+        """Test that stored events reach subscribers and back resume."""
+        from services.event_broker import DatabaseEventBackend, EventBroker
+        
+        user_id = make_user('outbox@example.com')
+        broker = EventBroker(DatabaseEventBackend, replay_size=2, app=app, poll_interval=0.02)
+        subscription = broker.subscribe(user_id)
+        
+        try:
+            broker.publish([user_id], 'message.created', {'content': 'Hi'})
+            event = subscription.get(timeout=2)
+        finally:
+            broker.backend.stop()
+        
+        assert event.type == 'message.created'
+        assert event.data == {'content': 'Hi'}
+        
+        broker.publish([user_id], 'message.read', {'thread_id': 't'})
+        assert [e.type for e in broker.replay(user_id, event.id)] == ['message.read']
+        
+        broker.publish([user_id], 'message.read', {'thread_id': 't'})
+        broker.publish([user_id], 'message.read', {'thread_id': 't'})
+        # More missed events than the replay size
+        assert broker.replay(user_id, event.id) is None
+    
+    def test_poller_delivers_ids_that_commit_out_of_order(self, app):
+        """Test that an event committed after a higher ID is still delivered once."""
+        from models.stream_event import StreamEvent
+        from services.event_broker import DatabaseEventBackend, EventBroker
+        
+        user_id = make_user('gaps@example.com')
+        broker = EventBroker(DatabaseEventBackend, app=app, poll_interval=3600, gap_grace_seconds=60)
+        subscription = broker.subscribe(user_id)
+        backend = broker.backend
+        backend.stop()
+        
+        def commit_event(event_id):
+            db.session.add(StreamEvent(id=event_id, user_id=user_id, event_type=f'e{event_id}', payload={}))
+            db.session.commit()
+        
+        def delivered():
+            events = []
+            while (event := subscription.get(timeout=0)) is not None:
+                events.append(event.id)
+            return events
+        
+        gaps = {}
+        # A writer holding ID 1 commits after the one holding ID 2
+        commit_event(2)
+        last_id = backend._poll(0, gaps)
+        assert delivered() == [2]
+        assert set(gaps) == {1}
+        
+        commit_event(1)
+        last_id = backend._poll(last_id, gaps)
+        assert delivered() == [1]
+        assert gaps == {}
+        
+        # A skipped ID is given up on once the grace period has passed
+        commit_event(4)
+        last_id = backend._poll(last_id, gaps)
+        backend.gap_grace_seconds = 0
+        backend._poll(last_id, gaps)
+        commit_event(3)
+        backend._poll(last_id, gaps)
+        assert delivered() == [4]
+        assert gaps == {}
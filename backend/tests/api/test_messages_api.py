@@ -311,6 +311,506 @@ class TestMessageThreading:
         assert response.status_code == 200
         assert 'messages' in response.json
         assert len(response.json['messages']) == 3
+    
+    def test_get_thread_messages_by_cursor(self, client, app, student_user, staff_user):
+        """Test paging through a thread oldest-first with next_cursor."""
+        thread_id = f"thread_{student_user['id']}_{staff_user['id']}"
+        
+        with app.app_context():
+            for i in range(5):
+                db.session.add(Message(
+                    sender_id=student_user['id'],
+                    receiver_id=staff_user['id'],
+                    content=f'Message {i + 1}',
+                    thread_id=thread_id
+                ))
+            db.session.commit()
+        
+        login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.get(f'/api/messages/thread/{thread_id}?per_page=3')
+        assert response.status_code == 200
+        contents = [m['content'] for m in response.json['messages']]
+        cursor = response.json['pagination']['next_cursor']
+        
+        response = client.get(f'/api/messages/thread/{thread_id}?per_page=3&cursor={cursor}')
+        assert response.status_code == 200
+        contents += [m['content'] for m in response.json['messages']]
+        
+        assert contents == [f'Message {i + 1}' for i in range(5)]
+        assert response.json['pagination']['has_next'] is False
+
+
+# ============================================================================
+# Test: Thread Summaries
+# ============================================================================
+
+class TestThreadSummaries:
+    """Test the per-user thread summaries behind the inbox"""
+    
+    def _inbox(self, user_id):
+        from data_access.message_repository import MessageRepository
+        return {t['thread_id']: t for t in MessageRepository.get_user_threads(user_id)}
+    
+    def test_summaries_follow_message_writes(self, app, student_user, staff_user, another_user):
+        """Test that create, mark-as-read and delete keep summaries exact."""
+        from data_access.message_repository import MessageRepository
+        
+        student, staff, other = student_user['id'], staff_user['id'], another_user['id']
+        first = MessageRepository.create(student, staff, 'One', thread_id='t_staff')
+        second = MessageRepository.create(student, staff, 'Two', thread_id='t_staff')
+        MessageRepository.create(other, staff, 'Hello', thread_id='t_other')
+        
+        inbox = self._inbox(staff)
+        assert list(inbox) == ['t_other', 't_staff']
+        assert inbox['t_staff']['unread_count'] == 2
+        assert inbox['t_staff']['latest_message'] == 'Two'
+        assert inbox['t_staff']['other_user_id'] == student
+        assert self._inbox(student)['t_staff']['unread_count'] == 0
+        
+        MessageRepository.mark_as_read(first.id, staff)
+        MessageRepository.mark_as_read(first.id, staff)
+        assert self._inbox(staff)['t_staff']['unread_count'] == 1
+        
+        MessageRepository.delete_message(second.id, student)
+        inbox = self._inbox(staff)
+        assert inbox['t_staff']['unread_count'] == 0
+        assert inbox['t_staff']['latest_message'] == 'One'
+        
+        MessageRepository.delete_message(first.id, student)
+        assert list(self._inbox(staff)) == ['t_other']
+        assert self._inbox(student) == {}
+        
+        assert MessageRepository.mark_thread_as_read('t_other', staff) == 1
+        assert self._inbox(staff)['t_other']['unread_count'] == 0
+    
+    def test_concurrent_read_and_delete_apply_once(self, app, student_user, staff_user):
+        """Test that a message read elsewhere isn't taken off the counts again by a stale copy."""
+        from sqlalchemy import update
+        from data_access.message_repository import MessageRepository
+        from data_access.unread_counter import get_unread_counter
+        from models.message_thread import ThreadParticipant
+        from services.message_service import MessageService
+        
+        student, staff = student_user['id'], staff_user['id']
+        ids = [MessageRepository.create(student, staff, content, thread_id='t_staff').id
+               for content in ('One', 'Two', 'Three')]
+        assert MessageService.get_unread_count(staff) == 3
+        
+        def read_elsewhere(message_id):
+            # Another worker's mark-as-read, unseen by the loaded message
+            message = db.session.get(Message, message_id)
+            assert not message.is_read
+            db.session.execute(
+                update(Message).where(Message.id == message_id).values(is_read=True)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                MessageRepository._participant_update(message.thread_pk, staff)
+                .values(unread_count=ThreadParticipant.unread_count - 1)
+            )
+            get_unread_counter().adjust(staff, -1)
+            return message
+        
+        # Held so the session keeps serving the stale copy
+        stale = read_elsewhere(ids[0])
+        MessageRepository.mark_as_read(ids[0], staff)
+        assert self._inbox(staff)['t_staff']['unread_count'] == 2
+        assert MessageService.get_unread_count(staff) == 2
+        
+        stale = read_elsewhere(ids[1])
+        assert MessageRepository.delete_message(ids[1], student)
+        assert self._inbox(staff)['t_staff']['unread_count'] == 1
+        assert MessageService.get_unread_count(staff) == 1
+        assert not MessageRepository.delete_message(ids[1], student)
+    
+    def test_inbox_pagination_is_exact(self, client, app, student_user, staff_user, another_user):
+        """Test that the thread list reports totals and pages without gaps."""
+        from data_access.message_repository import MessageRepository
+        
+        for index in range(3):
+            # One thread per resource the two users talk about
+            resource = Resource(owner_id=staff_user['id'], title=f'Room {index}', status='published')
+            db.session.add(resource)
+            db.session.commit()
+            MessageRepository.create(staff_user['id'], student_user['id'], f'Hi {index}',
+                                     thread_id=f't_{index}', resource_id=resource.id)
+        MessageRepository.create(another_user['id'], staff_user['id'], 'Not yours', thread_id='t_private')
+        
+        login_user(client, student_user['email'], student_user['password'])
+        first = client.get('/api/messages?per_page=2').json
+        second = client.get('/api/messages?per_page=2&page=2').json
+        
+        assert first['pagination']['total'] == 3
+        assert first['pagination']['total_pages'] == 2
+        assert first['pagination']['has_next'] is True
+        assert second['pagination']['has_next'] is False
+        assert [t['thread_id'] for t in first['threads'] + second['threads']] == ['t_2', 't_1', 't_0']
+    
+    def test_rebuild_threads_command(self, app, student_user, staff_user):
+        """Test that the rebuild command picks up messages written directly."""
+        from app import register_cli_commands
+        
+        register_cli_commands(app)
+        db.session.add(Message(sender_id=student_user['id'], receiver_id=staff_user['id'],
+                               content='Direct', thread_id='t_direct'))
+        db.session.commit()
+        assert self._inbox(staff_user['id']) == {}
+        
+        result = app.test_cli_runner().invoke(args=['rebuild-threads'])
+        
+        assert 'rebuilt for 1 threads' in result.output
+        assert self._inbox(staff_user['id'])['t_direct']['unread_count'] == 1
+
+
+# ============================================================================
+# Test: Thread Identity
+# ============================================================================
+
+class TestThreadIdentity:
+    """Test that threads are keyed by participants and context"""
+    
+    def test_conversation_does_not_split(self, app, student_user, staff_user):
+        """Test that every way of starting a conversation lands in one thread."""
+        from data_access.message_repository import MessageRepository
+        
+        student, staff = student_user['id'], staff_user['id']
+        first = MessageRepository.create(student, staff, 'Hi')
+        reply = MessageRepository.create(staff, student, 'Hello', thread_id='made_up_by_client')
+        
+        assert first.thread_id == f'thread_{student}_{staff}'
+        assert Message(staff, student, 'Direct').thread_id == first.thread_id
+        assert reply.thread_id == first.thread_id
+        assert reply.thread_pk == first.thread_pk
+        assert MessageRepository.count_user_threads(student) == 1
+    
+    def test_reply_by_thread_id_keeps_context(self, app, student_user, staff_user):
+        """Test that a reply passing only the thread ID stays in the booking thread."""
+        from data_access.message_repository import MessageRepository
+        
+        resource = Resource(owner_id=staff_user['id'], title='Lab', status='published')
+        db.session.add(resource)
+        db.session.commit()
+        
+        question = MessageRepository.create(student_user['id'], staff_user['id'], 'Is it free?',
+                                            resource_id=resource.id)
+        general = MessageRepository.create(student_user['id'], staff_user['id'], 'Unrelated')
+        reply = MessageRepository.create(staff_user['id'], student_user['id'], 'Yes',
+                                         thread_id=question.thread_id)
+        
+        assert question.thread_id == f"thread_{student_user['id']}_{staff_user['id']}_resource_{resource.id}"
+        assert general.thread_pk != question.thread_pk
+        assert reply.thread_pk == question.thread_pk
+        assert reply.resource_id == resource.id
+    
+    def test_rebuild_merges_legacy_thread_ids(self, client, app, student_user, staff_user):
+        """Test that differently named threads of one conversation merge, keeping old IDs as aliases."""
+        from data_access.message_repository import MessageRepository
+        
+        student, staff = student_user['id'], staff_user['id']
+        for thread_id, content in ((f'users_{student}_{staff}', 'Old format'),
+                                   (f'thread_{student}_{staff}', 'New format')):
+            db.session.add(Message(sender_id=student, receiver_id=staff, content=content, thread_id=thread_id))
+        db.session.commit()
+        
+        assert MessageRepository.rebuild_thread_summaries() == 1
+        
+        threads = MessageRepository.get_user_threads(staff)
+        assert [(t['thread_id'], t['unread_count']) for t in threads] == [(f'users_{student}_{staff}', 2)]
+        login_user(client, staff_user['email'], staff_user['password'])
+        response = client.get(f'/api/messages/thread/thread_{student}_{staff}')
+        assert [m['content'] for m in response.json['messages']] == ['Old format', 'New format']
+
+
+# ============================================================================
+# Test: Unread Counter
+# ============================================================================
+
+class TestUnreadCounter:
+    """Test the per-user unread count cache"""
+    
+    def test_counter_follows_writes_without_recounting(self, app, student_user, staff_user):
+        """Test that message writes adjust the cached count in place."""
+        from sqlalchemy import event
+        from data_access.message_repository import MessageRepository
+        from services.message_service import MessageService
+        
+        student, staff = student_user['id'], staff_user['id']
+        first = MessageRepository.create(student, staff, 'One', thread_id='t_count')
+        assert MessageService.get_unread_count(staff) == 1
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        second = MessageRepository.create(student, staff, 'Two', thread_id='t_count')
+        MessageRepository.create(student, staff, 'Three', thread_id='t_count')
+        MessageRepository.mark_as_read(first.id, staff)
+        
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            assert MessageService.get_unread_count(staff) == 2
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        assert statements == []
+        
+        MessageRepository.delete_message(second.id, student)
+        assert MessageService.get_unread_count(staff) == 1
+        MessageRepository.mark_thread_as_read('t_count', staff)
+        assert MessageService.get_unread_count(staff) == 0
+    
+    def test_counter_reconciles_after_ttl(self, app, student_user, staff_user):
+        """Test that a count missed by the cache is corrected once it expires."""
+        from data_access.unread_counter import get_unread_counter
+        from services.message_service import MessageService
+        
+        staff = staff_user['id']
+        assert MessageService.get_unread_count(staff) == 0
+        
+        # A write that bypassed the repository
+        db.session.add(Message(sender_id=student_user['id'], receiver_id=staff, content='Direct'))
+        db.session.commit()
+        assert MessageService.get_unread_count(staff) == 0
+        
+        get_unread_counter().ttl_seconds = 0
+        assert MessageService.get_unread_count(staff) == 1
+    
+    def test_reload_between_commit_and_adjust_counts_once(self, app, student_user, staff_user, monkeypatch):
+        """Test that a count reloaded after a commit isn't adjusted for the same write again."""
+        from data_access.message_repository import MessageRepository
+        from data_access.unread_counter import get_unread_counter
+        from services.message_service import MessageService
+        
+        staff = staff_user['id']
+        counter = get_unread_counter()
+        assert MessageService.get_unread_count(staff) == 0
+        adjust = counter.adjust
+        
+        def reload_then_adjust(user_id, delta, generation=None):
+            # Another request reloads the expired count after the commit, before the adjustment
+            counter.ttl_seconds = 0
+            assert MessageService.get_unread_count(user_id) == 1
+            counter.ttl_seconds = 300
+            adjust(user_id, delta, generation)
+        
+        monkeypatch.setattr(counter, 'adjust', reload_then_adjust)
+        MessageRepository.create(student_user['id'], staff, 'Hello')
+        monkeypatch.undo()
+        
+        assert MessageService.get_unread_count(staff) == 1
+    
+    def test_stale_load_is_not_stored(self, app):
+        """Test that a count loaded while a write landed is discarded."""
+        from data_access.unread_counter import LocalCounterStore, UnreadCounter
+        
+        counter = UnreadCounter(LocalCounterStore())
+        
+        def loader(user_id):
+            # The write commits after the load read the database
+            counter.adjust(user_id, 1)
+            return 4
+        
+        assert counter.get(7, loader) == 4
+        assert counter.get(7, lambda user_id: 5) == 5
+        counter.adjust(7, 1)
+        assert counter.get(7, lambda user_id: 0) == 6
+    
+    def test_sqlite_store_is_shared_between_workers(self, tmp_path):
+        """Test that two store instances on one file see each other's adjustments."""
+        from data_access.unread_counter import SQLiteCounterStore, UnreadCounter
+        
+        path = str(tmp_path / 'counters.db')
+        worker_a = UnreadCounter(SQLiteCounterStore(path))
+        worker_b = UnreadCounter(SQLiteCounterStore(path))
+        
+        assert worker_a.get(3, lambda user_id: 2) == 2
+        worker_b.adjust(3, 1)
+        worker_b.adjust(3, 1)
+        worker_b.adjust(3, -1)
+        
+        assert worker_a.get(3, lambda user_id: 99) == 3
+        
+        # A reload by one worker between another's commit and adjustment
+        generation = worker_b.begin(3)
+        worker_a.ttl_seconds = 0
+        assert worker_a.get(3, lambda user_id: 4) == 4
+        worker_a.ttl_seconds = 300
+        worker_b.adjust(3, 1, generation)
+        assert worker_a.get(3, lambda user_id: 4) == 4
+
+
+# ============================================================================
+# Test: Message Search Index
+# ============================================================================
+
+class TestMessageSearchIndex:
+    """Test full-text message search"""
+    
+    def test_search_is_ranked_and_scoped_to_user(self, client, app, student_user, staff_user, another_user):
+        """Test that results are the user's own messages, best match first."""
+        from data_access.message_repository import MessageRepository
+        
+        student, staff, another = student_user['id'], staff_user['id'], another_user['id']
+        MessageRepository.create(student, staff, 'Is the projector in the library working?')
+        MessageRepository.create(staff, student, 'Library hours: the library opens at eight')
+        MessageRepository.create(another, staff, 'Unrelated question')
+        # Other users' messages and a participant token in content don't match
+        MessageRepository.create(another, student, f'library library u{staff}')
+        
+        login_user(client, staff_user['email'], staff_user['password'])
+        response = client.get('/api/messages/search?q=librar')
+        
+        assert response.status_code == 200
+        assert [m['content'] for m in response.json['messages']] == [
+            'Library hours: the library opens at eight',
+            'Is the projector in the library working?',
+        ]
+        snippet = response.json['messages'][0]['snippet']
+        assert [snippet['text'][start:end] for start, end in snippet['highlights']] == ['Library', 'library']
+    
+    def test_search_follows_deleted_messages(self, app, student_user, staff_user):
+        """Test that deleted messages leave the index."""
+        from data_access.message_repository import MessageRepository
+        
+        message = MessageRepository.create(student_user['id'], staff_user['id'], 'Projector booking')
+        assert MessageRepository.search_messages(staff_user['id'], 'projector') == [message]
+        
+        MessageRepository.delete_message(message.id, student_user['id'])
+        
+        assert MessageRepository.search_messages(staff_user['id'], 'projector') == []
+    
+    def test_snippet_is_cut_around_first_match(self):
+        """Test snippet windows and highlight offsets on long messages."""
+        from data_access.message_search import highlight
+        
+        content = ' '.join(f'word{i}' for i in range(40)) + ' Café meeting'
+        snippet = highlight(content, ['cafe'], max_words=8)
+        
+        assert snippet['text'].startswith('…word')
+        assert snippet['text'].endswith('Café meeting')
+        assert [snippet['text'][start:end] for start, end in snippet['highlights']] == ['Café']
+        assert highlight('Short note', ['missing']) == {'text': 'Short note', 'highlights': []}
+
+
+# ============================================================================
+# Test: Broadcasts
+# ============================================================================
+
+def make_admin():
+    """Create an admin user and return its ID."""
+    admin = User(name='Admin User', email='admin@example.com', role='admin')
+    admin.set_password('AdminPass123')
+    db.session.add(admin)
+    db.session.commit()
+    return admin.id
+
+
+class TestBroadcasts:
+    """Test admin broadcasts and the announcements thread"""
+    
+    def test_broadcast_is_stored_once_and_read_lazily(self, client, app, student_user, staff_user, another_user):
+        """Test that a broadcast adds no per-user rows until a user reads it."""
+        from models.broadcast import Broadcast, BroadcastReceipt
+        from services.message_service import MessageService
+        
+        admin = make_admin()
+        assert MessageService.get_unread_count(student_user['id']) == 0
+        
+        broadcast, error = MessageService.send_broadcast(admin, 'Library closes early', audience_role='student')
+        
+        assert error is None
+        assert Broadcast.query.count() == 1
+        assert BroadcastReceipt.query.count() == 0
+        assert Message.query.count() == 0
+        # Cached counts were dropped, so the broadcast shows up
+        assert MessageService.get_unread_count(student_user['id']) == 1
+        assert MessageService.get_unread_count(another_user['id']) == 1
+        assert MessageService.get_unread_count(staff_user['id']) == 0
+        
+        login_user(client, student_user['email'], student_user['password'])
+        response = client.get('/api/messages/thread/announcements')
+        
+        assert response.status_code == 200
+        assert [m['content'] for m in response.json['messages']] == ['Library closes early']
+        assert BroadcastReceipt.query.count() == 1
+        assert MessageService.get_unread_count(student_user['id']) == 0
+        assert MessageService.get_unread_count(another_user['id']) == 1
+        
+        # Staff aren't in the audience
+        client.post('/api/auth/logout')
+        login_user(client, staff_user['email'], staff_user['password'])
+        assert client.get('/api/messages/thread/announcements').status_code == 404
+    
+    def test_count_loaded_during_broadcast_is_not_kept(self, app, student_user):
+        """Test that a count read before a broadcast committed isn't cached after it."""
+        from data_access.unread_counter import get_unread_counter
+        from services.message_service import MessageService
+        
+        admin = make_admin()
+        
+        def loader(user_id):
+            # The broadcast commits while this load is reading the database
+            MessageService.send_broadcast(admin, 'Maintenance tonight')
+            return 0
+        
+        assert get_unread_counter().get(student_user['id'], loader) == 0
+        assert MessageService.get_unread_count(student_user['id']) == 1
+    
+    def test_announcements_are_merged_into_inbox(self, app, student_user, staff_user, another_user):
+        """Test that the announcements thread is placed by its latest broadcast."""
+        from data_access.message_repository import MessageRepository
+        from services.message_service import MessageService
+        
+        student = student_user['id']
+        admin = make_admin()
+        oldest = MessageRepository.create(staff_user['id'], student, 'Oldest')
+        middle = MessageRepository.create(another_user['id'], student, 'Middle')
+        direct = MessageRepository.create(admin, student, 'Direct from admin')
+        MessageService.send_broadcast(admin, 'Announcement')
+        MessageRepository.create(staff_user['id'], student, 'Newest', thread_id=oldest.thread_id)
+        
+        pages = [MessageService.get_user_threads(student, page=page, per_page=2) for page in (1, 2)]
+        
+        assert [t['thread_id'] for t in pages[0]['threads']] == [oldest.thread_id, 'announcements']
+        assert pages[0]['threads'][1]['unread_count'] == 1
+        assert pages[0]['pagination']['has_next'] is True
+        assert [t['thread_id'] for t in pages[1]['threads']] == [direct.thread_id, middle.thread_id]
+        assert pages[1]['pagination']['total'] == 4
+        assert pages[1]['pagination']['has_next'] is False
+    
+    def test_broadcast_endpoint_requires_admin(self, client, app, student_user):
+        """Test that only admins can send broadcasts and replies are refused."""
+        from services.message_service import MessageService
+        
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post(
+            '/api/admin/broadcasts',
+            json={'content': 'Hello everyone'},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        assert response.status_code == 403
+        
+        admin = make_admin()
+        client.post('/api/auth/logout', headers={'X-CSRF-Token': csrf_token})
+        csrf_token = login_user(client, 'admin@example.com', 'AdminPass123')
+        
+        response = client.post(
+            '/api/admin/broadcasts',
+            json={'content': 'Hello everyone', 'audience_role': 'student'},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        assert response.status_code == 201
+        assert response.json['data']['thread_id'] == 'announcements'
+        
+        message, error = MessageService.send_message(
+            student_user['id'], admin, 'Thanks', thread_id='announcements'
+        )
+        assert message is None
+        assert error == 'Cannot reply to announcements'
 
 
 # ============================================================================
@@ -13,11 +13,14 @@ Tests cover:
 """
 
 import pytest
+from datetime import datetime, timedelta
 from flask import session
 from app import create_app
 from extensions import db
 from models.user import User
 from models.resource import Resource
+from models.booking import Booking
+from data_access.booking_repository import BookingRepository
 
 
 @pytest.fixture
@@ -143,7 +146,7 @@ def seeded_resources(app):
         )
         db.session.add(owner)
         db.session.flush()
-
+        
         resources = []
         sample_data = [
             {
@@ -168,7 +171,7 @@ def seeded_resources(app):
                 'capacity': 20
             },
         ]
-
+        
         for entry in sample_data:
             resource = Resource(
                 owner_id=owner.id,
@@ -181,7 +184,7 @@ def seeded_resources(app):
             resource.status = 'published'
             db.session.add(resource)
             resources.append(resource)
-
+        
         db.session.commit()
         yield resources
 
@@ -255,7 +258,7 @@ class TestListResourcesEndpoint:
         assert response.status_code == 200
         data = response.get_json()
         assert 'resources' in data
-
+    
     def test_list_resources_search_filters_results(self, client, seeded_resources):
         """Search filter should affect both results and pagination totals."""
         response = client.get('/api/resources?search=library')
@@ -264,7 +267,7 @@ class TestListResourcesEndpoint:
         # Two library resources seeded
         assert data['pagination']['total'] == 2
         assert len(data['resources']) == 2
-
+    
     def test_list_resources_location_filter(self, client, seeded_resources):
         """Location filter should narrow the dataset."""
         response = client.get('/api/resources?location=Engineering')
@@ -272,7 +275,7 @@ class TestListResourcesEndpoint:
         data = response.get_json()
         assert data['pagination']['total'] == 1
         assert len(data['resources']) == 1
-
+    
     def test_list_resources_search_pagination(self, client, seeded_resources):
         """Pagination metadata should remain consistent with filtered totals."""
         response = client.get('/api/resources?search=library&per_page=1&page=2')
@@ -284,6 +287,134 @@ class TestListResourcesEndpoint:
         assert pagination['page'] == 2
 
 
+class TestResourceFacets:
+    """Test GET /api/resources?facets=true - Facet counts."""
+    
+    def test_facets_only_when_requested(self, client, seeded_resources):
+        """Test that facets are opt-in."""
+        assert 'facets' not in client.get('/api/resources').get_json()
+    
+    def test_facets_count_current_filters(self, client, seeded_resources):
+        """Test counts per category, location and capacity bucket."""
+        facets = client.get('/api/resources?facets=true').get_json()['facets']
+        
+        assert facets['category'] == {'study_room': 2, 'technology': 1}
+        assert facets['location'] == {
+            'Library East Wing': 1, 'Library West Wing': 1, 'Engineering Building': 1
+        }
+        assert facets['capacity'] == {'5-10': 2, '11-25': 1}
+        
+        facets = client.get('/api/resources?facets=true&search=library&min_capacity=8').get_json()['facets']
+        
+        assert facets == {
+            'category': {'study_room': 1},
+            'location': {'Library West Wing': 1},
+            'capacity': {'5-10': 1}
+        }
+    
+    def test_facets_computed_in_one_statement(self, client, seeded_resources):
+        """Test that all facets come from a single grouped query."""
+        from sqlalchemy import event
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        client.get('/api/resources')
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            client.get('/api/resources?facets=true&category=study_room')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        
+        assert sum('UNION ALL' in statement for statement in statements) == 1
+    
+    def test_facets_cached_until_resource_write(self, client, seeded_resources):
+        """Test that cached facets are reused and cleared by resource writes."""
+        from data_access.resource_repository import ResourceRepository
+        
+        assert client.get('/api/resources?facets=true').get_json()['facets']['category']['technology'] == 1
+        
+        # A direct write bypasses invalidation, so the cached counts are served
+        seeded_resources[1].category = 'technology'
+        db.session.commit()
+        assert client.get('/api/resources?facets=true').get_json()['facets']['category']['technology'] == 1
+        
+        ResourceRepository.update(seeded_resources[0], category='technology')
+        assert client.get('/api/resources?facets=true').get_json()['facets']['category'] == {'technology': 3}
+
+
+class TestAvailabilityFilter:
+    """Test GET /api/resources?available_from=&available_to= - Free-window search."""
+    
+    @staticmethod
+    def _window(days_ahead=2, hour=14, hours=2):
+        start = datetime.combine(datetime.utcnow().date() + timedelta(days=days_ahead), datetime.min.time())
+        start += timedelta(hours=hour)
+        return start, start + timedelta(hours=hours)
+    
+    @staticmethod
+    def _query(client, start, end, extra=''):
+        return client.get(
+            f'/api/resources?category=study_room&min_capacity=8'
+            f'&available_from={start.isoformat()}&available_to={end.isoformat()}{extra}'
+        )
+    
+    def test_filter_excludes_booked_resources(self, client, seeded_resources):
+        """Test capacity and free-window filters combine."""
+        room = seeded_resources[1]
+        start, end = self._window()
+        BookingRepository.create(room.id, room.owner_id, start + timedelta(minutes=50), start + timedelta(minutes=70))
+        
+        booked = self._query(client, start, end).get_json()
+        assert booked['resources'] == []
+        assert booked['pagination']['total'] == 0
+        
+        # A window that only touches the booking's edge slot is still free
+        free = self._query(client, start + timedelta(minutes=75), end).get_json()
+        assert [r['id'] for r in free['resources']] == [room.id]
+    
+    def test_filter_tracks_booking_changes(self, client, seeded_resources):
+        """Test the in-memory slot bitmaps follow cancellations and new bookings."""
+        room = seeded_resources[1]
+        start, end = self._window(days_ahead=3)
+        
+        assert len(self._query(client, start, end).get_json()['resources']) == 1
+        
+        booking = BookingRepository.create(room.id, room.owner_id, start, end)
+        assert self._query(client, start, end).get_json()['resources'] == []
+        
+        BookingRepository.cancel(booking)
+        assert len(self._query(client, start, end).get_json()['resources']) == 1
+    
+    def test_filter_sees_bookings_from_other_workers(self, client, seeded_resources):
+        """Test a booking the in-memory index hasn't seen still hides the room."""
+        from data_access.booking_index import get_booking_index
+        
+        room = seeded_resources[1]
+        start, end = self._window(days_ahead=4)
+        assert len(self._query(client, start, end).get_json()['resources']) == 1
+        
+        # Written by another worker: this process's index is not told
+        db.session.add(Booking(resource_id=room.id, requester_id=room.owner_id,
+                               start_datetime=start, end_datetime=end))
+        db.session.commit()
+        
+        assert self._query(client, start, end).get_json()['resources'] == []
+        assert get_booking_index().free_resources([room.id], start, end) == []
+    
+    def test_filter_requires_complete_valid_window(self, client, seeded_resources):
+        """Test partial or invalid windows are rejected."""
+        start, end = self._window()
+        
+        response = client.get(f'/api/resources?available_from={start.isoformat()}')
+        assert response.status_code == 400
+        
+        response = self._query(client, end, start)
+        assert response.status_code == 400
+
+
 class TestGetResourceEndpoint:
     """Test GET /api/resources/:id - Get single resource."""
     
@@ -302,6 +433,41 @@ class TestGetResourceEndpoint:
         
         assert 'X-Content-Type-Options' in response.headers
         assert 'X-Frame-Options' in response.headers
+    
+    def test_get_resource_returns_json_fields(self, client, seeded_resources):
+        """Test that images and availability rules round-trip as JSON values."""
+        from data_access.resource_repository import ResourceRepository
+        
+        rules = {'days': ['monday'], 'hours': '9:00-17:00'}
+        resource = ResourceRepository.create(
+            owner_id=seeded_resources[0].owner_id, title='Projector Kit',
+            images=['kit.jpg'], availability_rules=rules, status='published'
+        )
+        db.session.expire_all()
+        
+        data = client.get(f'/api/resources/{resource.id}').get_json()
+        
+        assert data['images'] == ['kit.jpg']
+        assert data['availability_rules'] == rules
+    
+    def test_legacy_text_json_decoded_once(self, seeded_resources, monkeypatch):
+        """Test that JSON-encoded text values are parsed once per raw value."""
+        import json
+        from models import resource as resource_module
+        
+        resource = seeded_resources[0]
+        resource.images = json.dumps(['a.jpg'])
+        
+        calls = []
+        real_loads = json.loads
+        monkeypatch.setattr(resource_module.json, 'loads', lambda raw: calls.append(raw) or real_loads(raw))
+        
+        assert resource.get_images() == ['a.jpg']
+        assert resource.get_images() == ['a.jpg']
+        assert len(calls) == 1
+        
+        resource.images = 'not json'
+        assert resource.get_images() == []
 
 
 class TestCreateResourceEndpoint:
@@ -599,6 +765,89 @@ class TestPublishResourceEndpoint:
         assert response.status_code == 403
 
 
+class TestFreeSlotsEndpoint:
+    """Test GET /api/resources/:id/free-slots - Free interval search."""
+    
+    @staticmethod
+    def _next_monday():
+        today = datetime.utcnow().date()
+        return datetime.combine(today + timedelta(days=7 - today.weekday()), datetime.min.time())
+    
+    @staticmethod
+    def _add_booking(resource, start, end, status):
+        booking = Booking(resource.id, resource.owner_id, start, end)
+        booking.status = status
+        db.session.add(booking)
+        db.session.commit()
+    
+    def test_free_slots_follow_rules_and_bookings(self, client, seeded_resources):
+        """Test open hours come from rules and only active bookings block time."""
+        resource = seeded_resources[0]
+        resource.set_availability_rules({'days': ['monday'], 'hours': '9:00-17:00'})
+        db.session.commit()
+        
+        monday = self._next_monday()
+        self._add_booking(resource, monday + timedelta(hours=10), monday + timedelta(hours=11), 'approved')
+        self._add_booking(resource, monday + timedelta(hours=13), monday + timedelta(hours=14), 'cancelled')
+        
+        response = client.get(
+            f'/api/resources/{resource.id}/free-slots'
+            f'?from={monday.isoformat()}&to={(monday + timedelta(days=2)).isoformat()}'
+        )
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [(slot['start'], slot['end']) for slot in data['free_slots']] == [
+            ((monday + timedelta(hours=9)).isoformat(), (monday + timedelta(hours=10)).isoformat()),
+            ((monday + timedelta(hours=11)).isoformat(), (monday + timedelta(hours=17)).isoformat()),
+        ]
+        assert data['free_slots'][1]['duration_minutes'] == 360
+    
+    def test_free_slots_min_duration_and_overnight_rules(self, client, seeded_resources):
+        """Test short gaps are dropped and overnight ranges span midnight."""
+        resource = seeded_resources[1]
+        resource.set_availability_rules({'weekly': {'monday': '22:00-02:00'}})
+        db.session.commit()
+        
+        monday = self._next_monday()
+        self._add_booking(resource, monday + timedelta(hours=22, minutes=10), monday + timedelta(hours=23), 'pending')
+        
+        response = client.get(
+            f'/api/resources/{resource.id}/free-slots'
+            f'?from={monday.isoformat()}&to={(monday + timedelta(days=1)).isoformat()}&min_duration=30'
+        )
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['count'] == 1
+        assert data['free_slots'][0]['start'] == (monday + timedelta(hours=23)).isoformat()
+        assert data['free_slots'][0]['end'] == (monday + timedelta(days=1)).isoformat()
+    
+    def test_free_slots_invalid_requests(self, client, seeded_resources):
+        """Test unknown resources, oversized windows and bad parameters."""
+        resource = seeded_resources[2]
+        monday = self._next_monday()
+        
+        assert client.get('/api/resources/99999/free-slots').status_code == 404
+        assert client.get(
+            f'/api/resources/{resource.id}/free-slots'
+            f'?from={monday.isoformat()}&to={(monday + timedelta(days=120)).isoformat()}'
+        ).status_code == 400
+        assert client.get(f'/api/resources/{resource.id}/free-slots?min_duration=abc').status_code == 400
+    
+    def test_free_slots_hidden_for_draft_resource(self, client, app, staff_user):
+        """Test draft resources are not exposed to anonymous users."""
+        with app.app_context():
+            resource = Resource(owner_id=staff_user['id'], title='Draft Room', category='study_room')
+            db.session.add(resource)
+            db.session.commit()
+            resource_id = resource.id
+        
+        response = client.get(f'/api/resources/{resource_id}/free-slots')
+        
+        assert response.status_code == 403
+
+
 class TestSearchResourcesEndpoint:
     """Test GET /api/resources/search - Search resources."""
     
@@ -651,6 +900,158 @@ class TestSearchResourcesEndpoint:
         # Should handle safely without causing SQL error
         assert response.status_code in [200, 400]
         assert response.content_type == 'application/json'
+    
+    def test_search_ranks_best_match_first(self, client, seeded_resources):
+        """Test that results are ordered by full-text relevance."""
+        response = client.get('/api/resources/search?q=library')
+        
+        assert response.status_code == 200
+        titles = [r['title'] for r in response.get_json()['results']]
+        # Matches in title, description and location outrank title and location only
+        assert titles == ['Library Study Room', 'Library Collaboration Space']
+    
+    def test_search_matches_word_prefix(self, client, seeded_resources):
+        """Test that a partially typed last word still matches."""
+        response = client.get('/api/resources/search?q=hands engin')
+        
+        assert response.status_code == 200
+        titles = [r['title'] for r in response.get_json()['results']]
+        assert titles == ['Engineering Lab']
+    
+    def test_search_index_follows_updates(self, client, seeded_resources):
+        """Test that the index tracks inserted, updated and deleted resources."""
+        from data_access.resource_repository import ResourceRepository
+        
+        resource = ResourceRepository.get_by_id(seeded_resources[2].id)
+        ResourceRepository.update(resource, title='Robotics Workshop')
+        
+        titles = [r['title'] for r in client.get('/api/resources/search?q=robotics').get_json()['results']]
+        assert titles == ['Robotics Workshop']
+        
+        ResourceRepository.delete(resource)
+        
+        assert client.get('/api/resources/search?q=robotics').get_json()['results'] == []
+    
+    def test_list_search_does_not_match_location(self, client, seeded_resources):
+        """Test that the list endpoint's search covers title and description only."""
+        response = client.get('/api/resources?search=building')
+        
+        assert response.status_code == 200
+        assert response.get_json()['pagination']['total'] == 0
+
+
+class TestResourceSearchEngine:
+    """Test GET /api/resources/search served by the in-process search engine."""
+    
+    @pytest.fixture(autouse=True)
+    def use_engine(self, app):
+        app.config['RESOURCE_SEARCH_BACKEND'] = 'engine'
+    
+    def _titles(self, client, query):
+        response = client.get(f'/api/resources/search?{query}')
+        assert response.status_code == 200
+        return [r['title'] for r in response.get_json()['results']]
+    
+    def test_engine_ranks_title_matches_first(self, client, seeded_resources):
+        """Test that field boosts put title matches ahead of other fields."""
+        assert self._titles(client, 'q=library') == ['Library Study Room', 'Library Collaboration Space']
+        assert self._titles(client, 'q=engineering') == ['Engineering Lab']
+    
+    def test_engine_tolerates_typos(self, client, seeded_resources):
+        """Test that misspelled words still find resources."""
+        assert self._titles(client, 'q=stdy') == ['Library Study Room']
+        assert self._titles(client, 'q=colaboration') == ['Library Collaboration Space']
+    
+    def test_engine_prefix_and_filters(self, client, seeded_resources):
+        """Test prefix matching with category filtering."""
+        assert self._titles(client, 'q=hands engin') == ['Engineering Lab']
+        assert self._titles(client, 'q=lib&category=technology') == []
+        assert self._titles(client, 'q=lib&category=study_room') == [
+            'Library Study Room', 'Library Collaboration Space'
+        ]
+    
+    def test_engine_excludes_unpublished(self, client, seeded_resources):
+        """Test that only published resources are returned."""
+        from data_access.resource_repository import ResourceRepository
+        
+        self._titles(client, 'q=library')
+        ResourceRepository.update_status(seeded_resources[0], 'archived')
+        
+        assert self._titles(client, 'q=library') == ['Library Collaboration Space']
+    
+    def test_engine_follows_updates_and_deletes(self, client, seeded_resources):
+        """Test that repository writes are applied to a built index."""
+        from data_access.resource_repository import ResourceRepository
+        
+        assert self._titles(client, 'q=robotics') == []
+        
+        resource = ResourceRepository.get_by_id(seeded_resources[2].id)
+        ResourceRepository.update(resource, title='Robotics Workshop')
+        assert self._titles(client, 'q=robotcs') == ['Robotics Workshop']
+        
+        ResourceRepository.delete(resource)
+        assert self._titles(client, 'q=robotics') == []
+    
+    def test_database_backend_skips_engine(self, app, client, seeded_resources):
+        """Test that the database backend never builds the engine."""
+        app.config['RESOURCE_SEARCH_BACKEND'] = 'database'
+        
+        assert self._titles(client, 'q=library') == ['Library Study Room', 'Library Collaboration Space']
+        assert 'resource_search_engine' not in app.extensions
+
+
+class TestSuggestResourcesEndpoint:
+    """Test GET /api/resources/suggest - Typeahead completions."""
+    
+    def _suggestions(self, client, query):
+        response = client.get(f'/api/resources/suggest?{query}')
+        assert response.status_code == 200
+        return [(s['type'], s['text']) for s in response.get_json()['suggestions']]
+    
+    def test_suggest_requires_query(self, client):
+        """Test that a missing or invalid query is rejected."""
+        assert client.get('/api/resources/suggest').status_code == 400
+        assert client.get('/api/resources/suggest?q=lib&limit=abc').status_code == 400
+    
+    def test_suggest_completes_any_word(self, client, seeded_resources):
+        """Test that titles, categories and locations complete from any word."""
+        assert ('title', 'Library Study Room') in self._suggestions(client, 'q=stu')
+        assert ('category', 'study_room') in self._suggestions(client, 'q=stu')
+        assert self._suggestions(client, 'q=west') == [('location', 'Library West Wing')]
+    
+    def test_suggest_ranks_by_popularity(self, client, seeded_resources):
+        """Test that reviewed and booked resources are suggested first."""
+        collaboration = seeded_resources[1]
+        collaboration.review_count = 3
+        start = datetime.utcnow() + timedelta(days=1)
+        booking = Booking(collaboration.id, collaboration.owner_id, start, start + timedelta(hours=1))
+        booking.status = 'approved'
+        db.session.add(booking)
+        db.session.commit()
+        
+        titles = [text for kind, text in self._suggestions(client, 'q=libr') if kind == 'title']
+        assert titles == ['Library Collaboration Space', 'Library Study Room']
+        
+        response = client.get('/api/resources/suggest?q=libr&limit=1')
+        assert len(response.get_json()['suggestions']) == 1
+    
+    def test_suggest_follows_resource_writes(self, client, seeded_resources):
+        """Test that renames, unpublishing and deletes update a built index."""
+        from data_access.resource_repository import ResourceRepository
+        
+        assert self._suggestions(client, 'q=robot') == []
+        
+        lab = ResourceRepository.get_by_id(seeded_resources[2].id)
+        ResourceRepository.update(lab, title='Robotics Workshop')
+        assert self._suggestions(client, 'q=robot') == [('title', 'Robotics Workshop')]
+        assert ('title', 'Engineering Lab') not in self._suggestions(client, 'q=eng')
+        
+        ResourceRepository.update_status(seeded_resources[0], 'archived')
+        assert ('location', 'Library East Wing') not in self._suggestions(client, 'q=east')
+        
+        ResourceRepository.delete(lab)
+        assert self._suggestions(client, 'q=robot') == []
+        assert self._suggestions(client, 'q=technology') == []
 
 
 class TestGetCategoriesEndpoint:
@@ -673,6 +1074,89 @@ class TestGetCategoriesEndpoint:
         assert 'X-Frame-Options' in response.headers
 
 
+class TestGetLocationsEndpoint:
+    """Test GET /api/resources/locations - Cached location list."""
+    
+    def _locations(self, client):
+        response = client.get('/api/resources/locations')
+        assert response.status_code == 200
+        return response.get_json()['locations']
+    
+    def test_get_locations(self, client, seeded_resources):
+        """Test that published resource locations are listed."""
+        assert self._locations(client) == ['Engineering Building', 'Library East Wing', 'Library West Wing']
+    
+    def test_locations_reload_when_generation_changes(self, client, seeded_resources):
+        """Test that the cache is kept until another worker bumps the generation."""
+        from data_access.resource_repository import ResourceRepository
+        from data_access.versioned_cache import bump_generation
+        
+        self._locations(client)
+        
+        # A write that does not bump the generation is not seen
+        seeded_resources[0].location = 'Main Hall'
+        db.session.commit()
+        assert 'Main Hall' not in self._locations(client)
+        
+        # Simulates a repository write committed by another worker
+        bump_generation(ResourceRepository.DICTIONARY_GENERATION)
+        db.session.commit()
+        assert 'Main Hall' in self._locations(client)
+    
+    def test_resource_writes_bump_generation(self, client, seeded_resources):
+        """Test that create, update, unpublish and delete refresh the lists."""
+        from data_access.resource_repository import ResourceRepository
+        
+        assert 'technology' in ResourceRepository.get_categories()
+        self._locations(client)
+        
+        ResourceRepository.update(seeded_resources[0], location='Science Annex')
+        assert 'Science Annex' in self._locations(client)
+        
+        ResourceRepository.update_status(seeded_resources[2], 'archived')
+        assert 'Engineering Building' not in self._locations(client)
+        assert 'technology' not in ResourceRepository.get_categories()
+        
+        ResourceRepository.create(
+            owner_id=seeded_resources[0].owner_id, title='Media Booth',
+            category='equipment', location='Media Center', status='published'
+        )
+        assert 'Media Center' in self._locations(client)
+        
+        ResourceRepository.delete(seeded_resources[1])
+        assert self._locations(client) == ['Media Center', 'Science Annex']
+    
+    def test_first_bump_survives_concurrent_row_creation(self, app, staff_user, monkeypatch):
+        """Test that losing the race to create the counter row doesn't fail the write."""
+        from sqlalchemy import insert
+        from data_access.resource_repository import ResourceRepository
+        from data_access.versioned_cache import bump_generation
+        from models.cache_generation import CacheGeneration
+        
+        name = ResourceRepository.DICTIONARY_GENERATION
+        assert db.session.get(CacheGeneration, name) is None
+        execute = db.session.execute
+        raced = []
+        
+        def execute_then_race(statement, *args, **kwargs):
+            result = execute(statement, *args, **kwargs)
+            if not raced:
+                # Another worker creates the row right after our UPDATE missed it
+                raced.append(True)
+                execute(insert(CacheGeneration).values(name=name, generation=5, updated_at=datetime.utcnow()))
+            return result
+        
+        resource = Resource(owner_id=staff_user['id'], title='Race Room')
+        db.session.add(resource)
+        monkeypatch.setattr(db.session, 'execute', execute_then_race)
+        bump_generation(name)
+        monkeypatch.undo()
+        db.session.commit()
+        
+        assert db.session.get(CacheGeneration, name).generation == 6
+        assert db.session.get(Resource, resource.id) is not None
+
+
 class TestGetMyResourcesEndpoint:
     """Test GET /api/resources/my-resources - Get user's resources."""
     
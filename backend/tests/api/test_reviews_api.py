@@ -346,6 +346,40 @@ class TestRatingValidation:
         assert response.status_code == 400
         assert 'between 1 and 5' in response.json['message'].lower()
     
+    def test_fractional_rating_rejected(self, client, app, student_user, test_resource):
+        """Test that create and update reject ratings that aren't whole numbers."""
+        csrf_token = login_user(client, student_user['email'], student_user['password'])
+        
+        response = client.post(
+            '/api/reviews',
+            json={'resource_id': test_resource['id'], 'rating': 4.5},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        
+        assert response.status_code == 400
+        assert 'whole number' in response.json['message']
+        
+        response = client.post(
+            '/api/reviews',
+            json={'resource_id': test_resource['id'], 'rating': 4},
+            headers={'X-CSRF-Token': csrf_token}
+        )
+        review_id = response.json['review']['id']
+        
+        for rating in (4.5, '5', True):
+            response = client.put(
+                f'/api/reviews/{review_id}',
+                json={'rating': rating},
+                headers={'X-CSRF-Token': csrf_token}
+            )
+            
+            assert response.status_code == 400, rating
+            assert response.json['message'] == 'Rating must be a whole number between 1 and 5'
+        
+        resource = db.session.get(Resource, test_resource['id'])
+        db.session.refresh(resource)
+        assert resource.get_rating_histogram() == {'1': 0, '2': 0, '3': 0, '4': 1, '5': 0}
+    
     def test_valid_ratings(self, client, app, student_user):
         """Test that all valid ratings (1-5) are accepted."""
         csrf_token = login_user(client, student_user['email'], student_user['password'])
@@ -735,6 +769,30 @@ class TestGetReviews:
         assert 'average_rating' in response.json
         assert len(response.json['reviews']) >= 1
     
+    def test_get_resource_reviews_by_cursor(self, client, app, student_user, test_resource):
+        """Test paging through reviews with next_cursor."""
+        with app.app_context():
+            timestamp = datetime.utcnow()
+            for rating in (5, 4, 3, 2, 1):
+                review = Review(resource_id=test_resource['id'], reviewer_id=student_user['id'], rating=rating)
+                review.timestamp = timestamp
+                db.session.add(review)
+            db.session.commit()
+        
+        url = f'/api/reviews/resources/{test_resource["id"]}/reviews?per_page=2&include_total=false'
+        ratings = []
+        cursor = None
+        for _ in range(3):
+            response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+            assert response.status_code == 200
+            assert 'total_reviews' not in response.json
+            ratings += [r['rating'] for r in response.json['reviews']]
+            cursor = response.json['pagination']['next_cursor']
+        
+        # Same timestamp throughout, so newest-first falls back to highest ID first
+        assert ratings == [1, 2, 3, 4, 5]
+        assert cursor is None
+    
     def test_get_my_reviews(self, client, app, student_user, test_resource):
         """Test getting current user's reviews."""
         csrf_token = login_user(client, student_user['email'], student_user['password'])
@@ -759,6 +817,143 @@ class TestGetReviews:
         assert len(response.json['reviews']) >= 1
 
 
+# ============================================================================
+# Test: Rating Aggregates
+# ============================================================================
+
+class TestRatingAggregates:
+    """Test incremental maintenance of resource rating aggregates"""
+    
+    def _aggregates(self, resource_id):
+        resource = db.session.get(Resource, resource_id)
+        db.session.refresh(resource)
+        return resource.review_count, resource.rating_sum, resource.average_rating
+    
+    def _histogram(self, resource_id):
+        resource = db.session.get(Resource, resource_id)
+        db.session.refresh(resource)
+        return [resource.get_rating_histogram()[str(stars)] for stars in range(1, 6)]
+    
+    def test_review_writes_apply_deltas(self, app, student_user, admin_user, test_resource):
+        """Test that create, update, hide, unhide and delete keep aggregates exact."""
+        from data_access.review_repository import ReviewRepository
+        
+        resource_id = test_resource['id']
+        first = ReviewRepository.create(resource_id, student_user['id'], 5)
+        second = ReviewRepository.create(resource_id, admin_user['id'], 2)
+        assert self._aggregates(resource_id) == (2, 7, 3.5)
+        
+        assert self._histogram(resource_id) == [0, 1, 0, 0, 1]
+        
+        ReviewRepository.update(second, rating=4)
+        assert self._aggregates(resource_id) == (2, 9, 4.5)
+        assert self._histogram(resource_id) == [0, 0, 0, 1, 1]
+        
+        ReviewRepository.hide_review(first, 'spam')
+        ReviewRepository.hide_review(first, 'spam again')
+        assert self._aggregates(resource_id) == (1, 4, 4.0)
+        assert self._histogram(resource_id) == [0, 0, 0, 1, 0]
+        
+        # Hidden reviews don't move the aggregates until they are visible again
+        ReviewRepository.update(first, rating=1)
+        ReviewRepository.unhide_review(first)
+        assert self._aggregates(resource_id) == (2, 5, 2.5)
+        assert self._histogram(resource_id) == [1, 0, 0, 1, 0]
+        
+        ReviewRepository.delete(first)
+        ReviewRepository.delete(second)
+        assert self._aggregates(resource_id) == (0, 0, 0.0)
+        assert self._histogram(resource_id) == [0, 0, 0, 0, 0]
+    
+    def test_concurrent_hide_and_delete_apply_once(self, app, student_user, admin_user, test_resource):
+        """Test that a review hidden elsewhere isn't subtracted again by a stale copy."""
+        from sqlalchemy import update
+        from data_access.review_repository import ReviewRepository
+        
+        resource_id = test_resource['id']
+        ReviewRepository.create(resource_id, admin_user['id'], 2)
+        review = ReviewRepository.create(resource_id, student_user['id'], 5)
+        assert not review.is_hidden
+        
+        def hide_elsewhere():
+            # Another worker's hide: its UPDATE and delta, unseen by our in-memory review
+            db.session.execute(
+                update(Review).where(Review.id == review.id).values(is_hidden=True)
+                .execution_options(synchronize_session=False)
+            )
+            ReviewRepository._apply_rating_change(resource_id, removed=5)
+        
+        hide_elsewhere()
+        ReviewRepository.hide_review(review, 'spam')
+        assert self._aggregates(resource_id) == (1, 2, 2.0)
+        
+        ReviewRepository.unhide_review(review)
+        hide_elsewhere()
+        ReviewRepository.delete(review)
+        assert self._aggregates(resource_id) == (1, 2, 2.0)
+        assert self._histogram(resource_id) == [0, 1, 0, 0, 0]
+    
+    def test_repair_ratings_command(self, app, student_user, test_resource):
+        """Test that the repair command rebuilds drifted aggregates."""
+        from app import register_cli_commands
+        from data_access.review_repository import ReviewRepository
+        
+        register_cli_commands(app)
+        ReviewRepository.create(test_resource['id'], student_user['id'], 4)
+        
+        # Drift caused by a write that bypassed the repository
+        db.session.add(Review(resource_id=test_resource['id'], reviewer_id=student_user['id'], rating=2))
+        db.session.commit()
+        
+        result = app.test_cli_runner().invoke(args=['repair-ratings'])
+        
+        assert 'repaired for 1 resources' in result.output
+        assert self._aggregates(test_resource['id']) == (2, 6, 3.0)
+        assert self._histogram(test_resource['id']) == [0, 1, 0, 1, 0]
+        assert ReviewRepository.rebuild_rating_aggregates() == 0
+    
+    def test_reviews_page_includes_histogram(self, client, app, student_user, admin_user, test_resource):
+        """Test that the resource reviews endpoint returns the star distribution."""
+        from data_access.review_repository import ReviewRepository
+        
+        ReviewRepository.create(test_resource['id'], student_user['id'], 5)
+        ReviewRepository.create(test_resource['id'], admin_user['id'], 3)
+        
+        response = client.get(f'/api/resources/{test_resource["id"]}/reviews')
+        
+        assert response.status_code == 200
+        assert response.json['rating_histogram'] == {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1}
+        assert response.json['average_rating'] == 4.0
+
+    def test_reviews_page_total_without_count_query(self, app, student_user, admin_user, test_resource):
+        """Test that the reviews page takes its total from the stored aggregates."""
+        from sqlalchemy import event
+        from data_access.review_repository import ReviewRepository
+        from services.review_service import ReviewService
+
+        ReviewRepository.create(test_resource['id'], student_user['id'], 5)
+        hidden = ReviewRepository.create(test_resource['id'], admin_user['id'], 1)
+        ReviewRepository.hide_review(hidden, 'spam')
+        db.session.expire_all()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            result = ReviewService.get_resource_reviews(test_resource['id'], per_page=10)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        assert result['total_reviews'] == 1
+        assert result['pagination']['total'] == 1
+        assert [r['rating'] for r in result['reviews']] == [5]
+        assert not any('count(' in statement.lower() for statement in statements)
+        assert len(statements) == 2
+
+
 # ============================================================================
 # Test: Rate Limiting
 # ============================================================================
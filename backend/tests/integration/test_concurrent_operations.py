@@ -112,6 +112,66 @@ class TestConcurrentBookings:
             assert 400 in statuses or 409 in statuses, "One approval should fail due to conflict"
 
 
+class TestBookingLockStriping:
+    """Test per-resource locking around booking creation"""
+    
+    def test_same_slot_only_booked_once(self, client, app, sample_resource, student_alice, student_bob):
+        """
+        Test that simultaneous requests for the same slot cannot both pass
+        the conflict check.
+        """
+        alice_token = login_and_get_token(client, student_alice['email'], student_alice['password'])
+        bob_client = app.test_client()
+        bob_token = login_and_get_token(bob_client, student_bob['email'], student_bob['password'])
+        
+        booking = {
+            'resource_id': sample_resource['id'],
+            'start_datetime': (datetime.utcnow() + timedelta(days=5)).isoformat(),
+            'end_datetime': (datetime.utcnow() + timedelta(days=5, hours=1)).isoformat()
+        }
+        
+        barrier = threading.Barrier(2)
+        results = {}
+        
+        def book(name, user_client, token):
+            barrier.wait()
+            results[name] = user_client.post(
+                '/api/bookings',
+                json=booking,
+                headers={'X-CSRF-Token': token}
+            ).status_code
+        
+        threads = [
+            threading.Thread(target=book, args=('alice', client, alice_token)),
+            threading.Thread(target=book, args=('bob', bob_client, bob_token))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(results.values()) == [201, 409]
+        
+        with app.app_context():
+            from models.booking import Booking
+            assert Booking.query.filter_by(resource_id=sample_resource['id']).count() == 1
+    
+    def test_unrelated_resources_use_different_stripes(self, app):
+        """Test that lock stripes only collide for resources on the same stripe"""
+        from data_access.booking_locks import get_lock_stripes
+        
+        with app.app_context():
+            stripes = get_lock_stripes()
+            
+            assert stripes.for_resource(1) is not stripes.for_resource(2)
+            assert stripes.for_resource(1) is stripes.for_resource(1 + len(stripes))
+            
+            # Holding one resource's stripe does not block another resource
+            with stripes.for_resource(1):
+                assert stripes.for_resource(2).acquire(timeout=1)
+                stripes.for_resource(2).release()
+
+
 class TestConcurrentResourceCreation:
     """Test concurrent resource creation"""
     
@@ -0,0 +1,114 @@
+"""
+Pagination Utility
+Helpers for keyset (cursor) pagination over (timestamp, id) ordered listings.
+A cursor is an opaque URL-safe token naming the last row of the previous page,
+so each page is a bounded index range scan instead of an OFFSET skip.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """
+    Encode a row position as an opaque cursor token.
+
+    Args:
+        sort_value: Value of the row's sort column
+        row_id: Row primary key (tie-breaker)
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Decode a cursor token produced by ``encode_cursor``.
+
+    Args:
+        token: Cursor token
+
+    Returns:
+        Cursor: (sort_value, row_id)
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(row_id, int):
+            raise ValueError
+        return datetime.fromisoformat(sort_value), row_id
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def keyset_filter(sort_column, id_column, cursor: Cursor, descending: bool = True):
+    """
+    Build the predicate selecting rows after a cursor.
+
+    Written as ``a < x OR (a = x AND id < y)`` rather than a row-value
+    comparison so every supported database can use the (sort, id) index.
+
+    Args:
+        sort_column: Sort column
+        id_column: Primary key column
+        cursor: (sort_value, row_id) of the last row already returned
+        descending: Whether the listing is ordered newest first
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    sort_value, row_id = cursor
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+
+
+def build_pagination(rows: List[Any], per_page: int, sort_attr: str,
+                     page: int = 1, cursor: Optional[str] = None,
+                     total: Optional[int] = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Trim a fetched page and describe it.
+
+    Callers fetch ``per_page + 1`` rows; the extra row only signals that a
+    next page exists, so no count query is needed to set ``has_next``.
+
+    Args:
+        rows: Rows fetched with limit ``per_page + 1``
+        per_page: Page size
+        sort_attr: Name of the row attribute used as the sort key
+        page: Page number (offset mode)
+        cursor: Cursor the page was fetched after (cursor mode)
+        total: Total row count, or None if the caller skipped counting
+
+    Returns:
+        Tuple[List, Dict]: (page rows, pagination info)
+    """
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    pagination = {
+        'per_page': per_page,
+        'has_next': has_next,
+        'has_prev': cursor is not None or page > 1,
+        'next_cursor': encode_cursor(getattr(rows[-1], sort_attr), rows[-1].id) if has_next else None
+    }
+
+    if cursor is None:
+        pagination['page'] = page
+
+    if total is not None:
+        pagination['total'] = total
+        pagination['total_pages'] = (total + per_page - 1) // per_page
+
+    return rows, pagination
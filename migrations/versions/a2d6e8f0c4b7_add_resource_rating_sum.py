@@ -0,0 +1,39 @@
+"""Add rating_sum to resources for incremental rating aggregation
+
+Backfills rating_sum, review_count and average_rating from visible reviews.
+
+Revision ID: a2d6e8f0c4b7
+Revises: f1c5b3d8a2e9
+Create Date: 2025-12-01 16:20:33.190447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d6e8f0c4b7'
+down_revision = 'f1c5b3d8a2e9'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL = """
+UPDATE resources SET
+    review_count = (SELECT COUNT(*) FROM reviews
+                    WHERE reviews.resource_id = resources.id AND reviews.is_hidden = :hidden),
+    rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews
+                  WHERE reviews.resource_id = resources.id AND reviews.is_hidden = :hidden),
+    average_rating = (SELECT COALESCE(AVG(rating), 0) FROM reviews
+                      WHERE reviews.resource_id = resources.id AND reviews.is_hidden = :hidden)
+"""
+
+
+def upgrade():
+    # Plain ADD COLUMN: a batch (table copy) on SQLite would drop the full-text triggers
+    op.add_column('resources', sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+    op.get_bind().execute(sa.text(BACKFILL), {'hidden': False})
+
+
+def downgrade():
+    op.drop_column('resources', 'rating_sum')
@@ -0,0 +1,247 @@
+"""Key message threads by participants and context
+
+Threads get a unique (participants, booking_id, resource_id) key, messages a
+thread_pk foreign key, and thread_aliases keeps the string IDs of merged
+threads resolvable.
+
+The summary tables are derived data, so they are recreated and backfilled
+from messages. Messages are grouped by their old thread ID and user pair;
+groups with the same key (the pair plus the first booking and resource any of
+their messages mention) are merged into one thread. The thread keeps the
+oldest group's ID, the others become aliases, and every message is rewritten
+to carry its thread's ID.
+
+Downgrade restores the string-keyed summaries; merged threads stay merged.
+
+Revision ID: a8c4e2f6b1d7
+Revises: f6b3d9e1a7c4
+Create Date: 2025-12-12 14:03:51.772046
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c4e2f6b1d7'
+down_revision = 'f6b3d9e1a7c4'
+branch_labels = None
+depends_on = None
+
+
+messages = sa.table('messages',
+    sa.column('id', sa.Integer),
+    sa.column('thread_pk', sa.Integer),
+    sa.column('thread_id', sa.String),
+    sa.column('sender_id', sa.Integer),
+    sa.column('receiver_id', sa.Integer),
+    sa.column('booking_id', sa.Integer),
+    sa.column('resource_id', sa.Integer),
+    sa.column('is_read', sa.Boolean),
+    sa.column('timestamp', sa.DateTime),
+)
+
+
+def _create_participants_table():
+    table = op.create_table('thread_participants',
+    sa.Column('thread_pk', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.CheckConstraint('unread_count >= 0', name='check_unread_count_non_negative'),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['thread_pk'], ['message_threads.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('thread_pk', 'user_id')
+    )
+    op.create_index('ix_thread_participants_inbox', 'thread_participants',
+                    ['user_id', 'last_timestamp', 'thread_pk'], unique=False)
+    return table
+
+
+def _drop_summary_tables():
+    op.drop_index('ix_thread_participants_inbox', table_name='thread_participants')
+    op.drop_table('thread_participants')
+    op.drop_table('message_threads')
+
+
+def _fold(rows, thread_pks):
+    """Build thread and participant summaries from messages ordered oldest first."""
+    threads = {}
+    participants = {}
+    for message_id, thread_id, sender_id, receiver_id, is_read, timestamp in rows:
+        thread_pk = thread_pks[thread_id]
+        threads[thread_pk] = {'id': thread_pk, 'last_message_id': message_id, 'last_timestamp': timestamp}
+        for user_id in (sender_id, receiver_id):
+            entry = participants.setdefault((thread_pk, user_id), {
+                'thread_pk': thread_pk, 'user_id': user_id, 'unread_count': 0
+            })
+            entry.update(last_message_id=message_id, last_timestamp=timestamp)
+            if user_id == receiver_id and not is_read:
+                entry['unread_count'] += 1
+    return threads, participants
+
+
+def _reset_sequence():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("SELECT setval('message_threads_id_seq', (SELECT COALESCE(MAX(id), 1) FROM message_threads))")
+
+
+def _default_thread_id(low, high, booking_id, resource_id):
+    thread_id = f'thread_{low}_{high}'
+    if booking_id:
+        thread_id += f'_booking_{booking_id}'
+    elif resource_id:
+        thread_id += f'_resource_{resource_id}'
+    return thread_id
+
+
+def upgrade():
+    _drop_summary_tables()
+    message_threads = op.create_table('message_threads',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('thread_id', sa.String(length=100), nullable=False),
+    sa.Column('user_low_id', sa.Integer(), nullable=False),
+    sa.Column('user_high_id', sa.Integer(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=True),
+    sa.Column('resource_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('user_low_id <= user_high_id', name='check_thread_users_ordered'),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+    sa.ForeignKeyConstraint(['user_high_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_low_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('thread_id')
+    )
+    op.create_index('uq_message_threads_key', 'message_threads',
+                    ['user_low_id', 'user_high_id', sa.text('coalesce(booking_id, 0)'),
+                     sa.text('coalesce(resource_id, 0)')], unique=True)
+    thread_aliases = op.create_table('thread_aliases',
+    sa.Column('alias', sa.String(length=100), nullable=False),
+    sa.Column('thread_pk', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['thread_pk'], ['message_threads.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('alias')
+    )
+    op.create_index(op.f('ix_thread_aliases_thread_pk'), 'thread_aliases', ['thread_pk'], unique=False)
+    thread_participants = _create_participants_table()
+
+    op.add_column('messages', sa.Column('thread_pk', sa.Integer(), nullable=True))
+    op.create_index('ix_messages_thread_pk_timestamp', 'messages', ['thread_pk', 'timestamp', 'id'], unique=False)
+    if op.get_bind().dialect.name != 'sqlite':
+        op.create_foreign_key('fk_messages_thread_pk', 'messages', 'message_threads',
+                              ['thread_pk'], ['id'], ondelete='SET NULL')
+
+    rows = op.get_bind().execute(
+        sa.select(messages.c.id, messages.c.thread_id, messages.c.sender_id, messages.c.receiver_id,
+                  messages.c.booking_id, messages.c.resource_id, messages.c.is_read, messages.c.timestamp)
+        .order_by(messages.c.timestamp, messages.c.id)
+    ).all()
+
+    # Group by old thread ID and user pair, oldest group first
+    groups = {}
+    for _, thread_id, sender_id, receiver_id, booking_id, resource_id, _, _ in rows:
+        low, high = sorted([sender_id, receiver_id])
+        group = groups.setdefault((thread_id, low, high), {'booking_id': None, 'resource_id': None})
+        group['booking_id'] = group['booking_id'] or booking_id
+        group['resource_id'] = group['resource_id'] or resource_id
+
+    # Merge groups with the same key into one thread
+    threads = {}
+    aliases = []
+    used_ids = set()
+    group_threads = {}
+    for (thread_id, low, high), group in groups.items():
+        key = (low, high, group['booking_id'], group['resource_id'])
+        thread = threads.get(key)
+        if thread is None:
+            name = thread_id
+            if not name or name in used_ids:
+                name = base = _default_thread_id(*key)
+                suffix = 1
+                while name in used_ids:
+                    suffix += 1
+                    name = f'{base}_{suffix}'
+            thread = threads[key] = {
+                'id': len(threads) + 1, 'thread_id': name, 'user_low_id': low, 'user_high_id': high,
+                'booking_id': key[2], 'resource_id': key[3], 'created_at': datetime.utcnow()
+            }
+            used_ids.add(name)
+        elif thread_id and thread_id not in used_ids:
+            aliases.append({'alias': thread_id, 'thread_pk': thread['id']})
+            used_ids.add(thread_id)
+        group_threads[(thread_id, low, high)] = thread
+
+    updates = []
+    folded = []
+    for message_id, thread_id, sender_id, receiver_id, _, _, is_read, timestamp in rows:
+        thread = group_threads[(thread_id, *sorted([sender_id, receiver_id]))]
+        updates.append({'message_id': message_id, 'new_thread_pk': thread['id'], 'new_thread_id': thread['thread_id']})
+        folded.append((message_id, thread['thread_id'], sender_id, receiver_id, is_read, timestamp))
+    summaries, participants = _fold(folded, {t['thread_id']: t['id'] for t in threads.values()})
+
+    if threads:
+        op.bulk_insert(message_threads, [
+            {**thread, **summaries[thread['id']]} for thread in threads.values()
+        ])
+        _reset_sequence()
+    if aliases:
+        op.bulk_insert(thread_aliases, aliases)
+    if participants:
+        op.bulk_insert(thread_participants, list(participants.values()))
+    if updates:
+        op.get_bind().execute(
+            messages.update()
+            .where(messages.c.id == sa.bindparam('message_id'))
+            .values(thread_pk=sa.bindparam('new_thread_pk'), thread_id=sa.bindparam('new_thread_id')),
+            updates
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_messages_thread_pk', 'messages', type_='foreignkey')
+    op.drop_index('ix_messages_thread_pk_timestamp', table_name='messages')
+    op.drop_column('messages', 'thread_pk')
+
+    op.drop_index(op.f('ix_thread_aliases_thread_pk'), table_name='thread_aliases')
+    op.drop_table('thread_aliases')
+    op.drop_index('uq_message_threads_key', table_name='message_threads')
+    _drop_summary_tables()
+
+    message_threads = op.create_table('message_threads',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('thread_id', sa.String(length=100), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('thread_id')
+    )
+    thread_participants = _create_participants_table()
+
+    rows = op.get_bind().execute(
+        sa.select(messages.c.id, messages.c.thread_id, messages.c.sender_id, messages.c.receiver_id,
+                  messages.c.is_read, messages.c.timestamp)
+        .where(messages.c.thread_id.isnot(None))
+        .order_by(messages.c.timestamp, messages.c.id)
+    ).all()
+    thread_pks = {}
+    for row in rows:
+        thread_pks.setdefault(row.thread_id, len(thread_pks) + 1)
+    summaries, participants = _fold(rows, thread_pks)
+
+    if thread_pks:
+        op.bulk_insert(message_threads, [
+            {'thread_id': thread_id, 'created_at': datetime.utcnow(), **summaries[thread_pk]}
+            for thread_id, thread_pk in thread_pks.items()
+        ])
+        _reset_sequence()
+    if participants:
+        op.bulk_insert(thread_participants, list(participants.values()))
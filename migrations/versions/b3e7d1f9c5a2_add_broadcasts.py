@@ -0,0 +1,46 @@
+"""Add admin broadcasts
+
+A broadcast is stored once; broadcast_receipts records per-user read state
+only when a user reads the announcements thread.
+
+Revision ID: b3e7d1f9c5a2
+Revises: a8c4e2f6b1d7
+Create Date: 2025-12-13 09:41:17.308215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e7d1f9c5a2'
+down_revision = 'a8c4e2f6b1d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('broadcasts',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=False),
+    sa.Column('audience_role', sa.String(length=20), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_broadcasts_timestamp'), 'broadcasts', ['timestamp'], unique=False)
+    op.create_table('broadcast_receipts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('broadcast_id', sa.Integer(), nullable=False),
+    sa.Column('read_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['broadcast_id'], ['broadcasts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'broadcast_id')
+    )
+
+
+def downgrade():
+    op.drop_table('broadcast_receipts')
+    op.drop_index(op.f('ix_broadcasts_timestamp'), table_name='broadcasts')
+    op.drop_table('broadcasts')
@@ -0,0 +1,39 @@
+"""Add per-star rating histogram columns to resources
+
+Backfills the counts from visible reviews.
+
+Revision ID: b7e3f9a1d5c2
+Revises: a2d6e8f0c4b7
+Create Date: 2025-12-03 10:05:48.671902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3f9a1d5c2'
+down_revision = 'a2d6e8f0c4b7'
+branch_labels = None
+depends_on = None
+
+
+STARS = range(1, 6)
+
+BACKFILL = 'UPDATE resources SET ' + ', '.join(
+    f"""rating_count_{stars} = (SELECT COUNT(*) FROM reviews
+        WHERE reviews.resource_id = resources.id AND reviews.is_hidden = :hidden AND reviews.rating = {stars})"""
+    for stars in STARS
+)
+
+
+def upgrade():
+    # Plain ADD COLUMN: a batch (table copy) on SQLite would drop the full-text triggers
+    for stars in STARS:
+        op.add_column('resources', sa.Column(f'rating_count_{stars}', sa.Integer(), nullable=False, server_default='0'))
+    op.get_bind().execute(sa.text(BACKFILL), {'hidden': False})
+
+
+def downgrade():
+    for stars in STARS:
+        op.drop_column('resources', f'rating_count_{stars}')
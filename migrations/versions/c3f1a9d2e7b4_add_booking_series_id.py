@@ -0,0 +1,28 @@
+"""Add series_id to bookings for recurring booking series
+
+Revision ID: c3f1a9d2e7b4
+Revises: b573ae6b2c8f
+Create Date: 2025-11-18 10:12:41.208734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1a9d2e7b4'
+down_revision = 'b573ae6b2c8f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('series_id', sa.String(length=36), nullable=True))
+        batch_op.create_index(batch_op.f('ix_bookings_series_id'), ['series_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bookings_series_id'))
+        batch_op.drop_column('series_id')
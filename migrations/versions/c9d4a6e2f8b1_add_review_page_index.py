@@ -0,0 +1,26 @@
+"""Add composite index for a resource's visible reviews page
+
+Revision ID: c9d4a6e2f8b1
+Revises: b7e3f9a1d5c2
+Create Date: 2025-12-04 09:12:37.204518
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d4a6e2f8b1'
+down_revision = 'b7e3f9a1d5c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_reviews_resource_page', 'reviews',
+        ['resource_id', 'is_hidden', 'timestamp', 'id'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reviews_resource_page', table_name='reviews')
@@ -0,0 +1,90 @@
+"""Add message_threads and thread_participants summary tables
+
+Backfills one summary per thread and per (thread, participant) from messages.
+
+Revision ID: d5f8b2c4e6a9
+Revises: c9d4a6e2f8b1
+Create Date: 2025-12-05 16:40:12.518337
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f8b2c4e6a9'
+down_revision = 'c9d4a6e2f8b1'
+branch_labels = None
+depends_on = None
+
+
+messages = sa.table('messages',
+    sa.column('id', sa.Integer),
+    sa.column('thread_id', sa.String),
+    sa.column('sender_id', sa.Integer),
+    sa.column('receiver_id', sa.Integer),
+    sa.column('is_read', sa.Boolean),
+    sa.column('timestamp', sa.DateTime),
+)
+
+
+def upgrade():
+    message_threads = op.create_table('message_threads',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('thread_id', sa.String(length=100), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('thread_id')
+    )
+    thread_participants = op.create_table('thread_participants',
+    sa.Column('thread_pk', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.CheckConstraint('unread_count >= 0', name='check_unread_count_non_negative'),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['thread_pk'], ['message_threads.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('thread_pk', 'user_id')
+    )
+    op.create_index('ix_thread_participants_inbox', 'thread_participants',
+                    ['user_id', 'last_timestamp', 'thread_pk'], unique=False)
+
+    # Fold messages oldest first; the last write per key is the latest message
+    threads = {}
+    participants = {}
+    rows = op.get_bind().execute(
+        sa.select(messages.c.id, messages.c.thread_id, messages.c.sender_id, messages.c.receiver_id,
+                  messages.c.is_read, messages.c.timestamp)
+        .where(messages.c.thread_id.isnot(None))
+        .order_by(messages.c.timestamp, messages.c.id)
+    )
+    for message_id, thread_id, sender_id, receiver_id, is_read, timestamp in rows:
+        if thread_id not in threads:
+            threads[thread_id] = {'id': len(threads) + 1, 'thread_id': thread_id, 'created_at': datetime.utcnow()}
+        threads[thread_id].update(last_message_id=message_id, last_timestamp=timestamp)
+        for user_id in (sender_id, receiver_id):
+            entry = participants.setdefault((thread_id, user_id), {
+                'thread_pk': threads[thread_id]['id'], 'user_id': user_id, 'unread_count': 0
+            })
+            entry.update(last_message_id=message_id, last_timestamp=timestamp)
+            if user_id == receiver_id and not is_read:
+                entry['unread_count'] += 1
+
+    if threads:
+        op.bulk_insert(message_threads, list(threads.values()))
+        if op.get_bind().dialect.name == 'postgresql':
+            op.execute("SELECT setval('message_threads_id_seq', (SELECT MAX(id) FROM message_threads))")
+    if participants:
+        op.bulk_insert(thread_participants, list(participants.values()))
+
+
+def downgrade():
+    op.drop_index('ix_thread_participants_inbox', table_name='thread_participants')
+    op.drop_table('thread_participants')
+    op.drop_table('message_threads')
@@ -0,0 +1,88 @@
+"""Add full-text search index for resources
+
+SQLite: external-content FTS5 table kept in sync by triggers.
+PostgreSQL: generated weighted tsvector column with a GIN index.
+
+Revision ID: d8b2e4f6a1c3
+Revises: c3f1a9d2e7b4
+Create Date: 2025-11-24 09:31:07.514392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2e4f6a1c3'
+down_revision = 'c3f1a9d2e7b4'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
+        title, description, location,
+        content='resources', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS resources_fts_insert AFTER INSERT ON resources BEGIN
+        INSERT INTO resources_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS resources_fts_delete AFTER DELETE ON resources BEGIN
+        INSERT INTO resources_fts(resources_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS resources_fts_update
+    AFTER UPDATE OF title, description, location ON resources BEGIN
+        INSERT INTO resources_fts(resources_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO resources_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    # Index the rows that already exist
+    "INSERT INTO resources_fts(resources_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS resources_fts_update",
+    "DROP TRIGGER IF EXISTS resources_fts_delete",
+    "DROP TRIGGER IF EXISTS resources_fts_insert",
+    "DROP TABLE IF EXISTS resources_fts",
+]
+
+POSTGRES_UPGRADE = [
+    """ALTER TABLE resources ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_resources_search_vector ON resources USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_resources_search_vector",
+    "ALTER TABLE resources DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements):
+    for statement in statements:
+        op.execute(sa.text(statement))
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_UPGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_UPGRADE)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_DOWNGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_DOWNGRADE)
@@ -0,0 +1,36 @@
+"""Add stream_events outbox for cross-process server-sent events
+
+Revision ID: e2a7c5d9f3b6
+Revises: d5f8b2c4e6a9
+Create Date: 2025-12-08 11:26:03.447190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5d9f3b6'
+down_revision = 'd5f8b2c4e6a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stream_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stream_events_created_at', 'stream_events', ['created_at'], unique=False)
+    op.create_index('ix_stream_events_user_id_id', 'stream_events', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_stream_events_user_id_id', table_name='stream_events')
+    op.drop_index('ix_stream_events_created_at', table_name='stream_events')
+    op.drop_table('stream_events')
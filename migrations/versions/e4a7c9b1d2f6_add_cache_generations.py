@@ -0,0 +1,33 @@
+"""Add cache_generations table for cross-worker cache invalidation
+
+Revision ID: e4a7c9b1d2f6
+Revises: d8b2e4f6a1c3
+Create Date: 2025-11-26 14:02:51.883120
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7c9b1d2f6'
+down_revision = 'd8b2e4f6a1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cache_generations = op.create_table('cache_generations',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(cache_generations, [
+        {'name': 'resource_dictionaries', 'generation': 0, 'updated_at': datetime.utcnow()},
+    ])
+
+
+def downgrade():
+    op.drop_table('cache_generations')
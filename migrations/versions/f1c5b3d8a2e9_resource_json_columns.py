@@ -0,0 +1,75 @@
+"""Store resource images and availability_rules as native JSON
+
+Existing values are re-encoded first: malformed or empty text becomes NULL so
+every remaining value is valid JSON. PostgreSQL then converts the columns to
+JSONB. SQLite keeps its storage as is (JSON is stored as text there), which
+also leaves the full-text search triggers on ``resources`` untouched.
+
+Revision ID: f1c5b3d8a2e9
+Revises: e4a7c9b1d2f6
+Create Date: 2025-11-28 11:47:20.305618
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c5b3d8a2e9'
+down_revision = 'e4a7c9b1d2f6'
+branch_labels = None
+depends_on = None
+
+
+JSON_COLUMNS = ('images', 'availability_rules')
+
+resources = sa.table(
+    'resources',
+    sa.column('id', sa.Integer),
+    sa.column('images', sa.Text),
+    sa.column('availability_rules', sa.Text),
+)
+
+
+def _normalize(raw):
+    """Re-encode a stored value, or None if it is empty or not valid JSON."""
+    if not raw:
+        return None
+    try:
+        value = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return json.dumps(value) if value else None
+
+
+def upgrade():
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(resources.c.id, resources.c.images, resources.c.availability_rules)).all()
+    for row in rows:
+        values = {column: _normalize(getattr(row, column)) for column in JSON_COLUMNS}
+        if any(values[column] != getattr(row, column) for column in JSON_COLUMNS):
+            bind.execute(resources.update().where(resources.c.id == row.id).values(**values))
+
+    dialect = bind.dialect.name
+    if dialect == 'postgresql':
+        for column in JSON_COLUMNS:
+            op.alter_column('resources', column,
+                            type_=postgresql.JSONB(),
+                            postgresql_using=f'{column}::jsonb')
+    elif dialect != 'sqlite':
+        for column in JSON_COLUMNS:
+            op.alter_column('resources', column, type_=sa.JSON(), existing_type=sa.Text())
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for column in JSON_COLUMNS:
+            op.alter_column('resources', column,
+                            type_=sa.Text(),
+                            postgresql_using=f'{column}::text')
+    elif dialect != 'sqlite':
+        for column in JSON_COLUMNS:
+            op.alter_column('resources', column, type_=sa.Text(), existing_type=sa.JSON())
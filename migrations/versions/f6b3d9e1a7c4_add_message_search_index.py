@@ -0,0 +1,93 @@
+"""Add full-text search index for messages
+
+SQLite: FTS5 table over message content and participants, with external
+content from a view and kept in sync by triggers.
+PostgreSQL: generated tsvector column (content weight A, participants
+weight D) with a GIN index.
+
+Revision ID: f6b3d9e1a7c4
+Revises: e2a7c5d9f3b6
+Create Date: 2025-12-10 15:42:18.630914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b3d9e1a7c4'
+down_revision = 'e2a7c5d9f3b6'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIEW IF NOT EXISTS messages_fts_source AS
+    SELECT id, content, 'u' || sender_id || ' u' || receiver_id AS participants FROM messages""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        content, participants,
+        content='messages_fts_source', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, content, participants)
+        VALUES (new.id, new.content, 'u' || new.sender_id || ' u' || new.receiver_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content, participants)
+        VALUES ('delete', old.id, old.content, 'u' || old.sender_id || ' u' || old.receiver_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS messages_fts_update
+    AFTER UPDATE OF content, sender_id, receiver_id ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content, participants)
+        VALUES ('delete', old.id, old.content, 'u' || old.sender_id || ' u' || old.receiver_id);
+        INSERT INTO messages_fts(rowid, content, participants)
+        VALUES (new.id, new.content, 'u' || new.sender_id || ' u' || new.receiver_id);
+    END""",
+    # Index the rows that already exist
+    "INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS messages_fts_update",
+    "DROP TRIGGER IF EXISTS messages_fts_delete",
+    "DROP TRIGGER IF EXISTS messages_fts_insert",
+    "DROP TABLE IF EXISTS messages_fts",
+    "DROP VIEW IF EXISTS messages_fts_source",
+]
+
+POSTGRES_UPGRADE = [
+    """ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(content, '')), 'A') ||
+        setweight(to_tsvector('simple', 'u' || sender_id::text || ' u' || receiver_id::text), 'D')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_messages_search_vector ON messages USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_messages_search_vector",
+    "ALTER TABLE messages DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements):
+    for statement in statements:
+        op.execute(sa.text(statement))
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_UPGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_UPGRADE)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_DOWNGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_DOWNGRADE)